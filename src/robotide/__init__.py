@@ -14,17 +14,25 @@
 
 """RIDE -- Robot Framework test data editor
 
-Usage: ride.py [--noupdatecheck] [inpath]
+Usage: ride.py [--noupdatecheck] [--profilestartup[=file]] [--lazyinit] [inpath]
 
 RIDE can be started either without any arguments or by giving a path to a test
 data file or directory to be opened.
 
 To disable update checker use --noupdatecheck.
 
+To print how long the phases of startup take use --profilestartup. The report
+is written to the given file instead, if a file is given.
+
+To show the main window before plugins are loaded and test data is opened use
+--lazyinit. Default libraries are then imported in the background.
+
 RIDE's API is still evolving while the project is moving towards the 1.0
 release. The most stable, and best documented, module is `robotide.pluginapi`.
 """
 
+from __future__ import with_statement
+
 import sys
 import os
 
@@ -57,15 +65,31 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'spec'))
 
 
 def main(args):
+    args, profile, lazy = _parse_startup_options(args)
     noupdatecheck, inpath = _parse_args(args)
     if len(args) > 2 or '--help' in args:
         print __doc__
         sys.exit()
     try:
-        _run(inpath, not noupdatecheck)
+        _run(inpath, not noupdatecheck, profile, lazy)
     except DataError, err:
         print str(err) + '\n\nUse --help to get usage information.'
 
+def _parse_startup_options(args):
+    profile = None
+    lazy = False
+    rest = []
+    for arg in args:
+        if arg == '--profilestartup':
+            profile = '-'
+        elif arg.startswith('--profilestartup='):
+            profile = arg.split('=', 1)[1] or '-'
+        elif arg == '--lazyinit':
+            lazy = True
+        else:
+            rest.append(arg)
+    return rest, profile, lazy
+
 def _parse_args(args):
     if not args:
         return False, None
@@ -73,11 +97,14 @@ def _parse_args(args):
     inpath = args[-1] if not noupdatecheck or len(args) > 1 else None
     return noupdatecheck, inpath
 
-def _run(inpath=None, updatecheck=True):
-    from robotide.application import RIDE
+def _run(inpath=None, updatecheck=True, profile=None, lazy=False):
+    from robotide.startupprofiler import StartupProfiler
+    profiler = StartupProfiler(profile)
+    with profiler.phase('Imports'):
+        from robotide.application import RIDE
     if inpath:
         inpath = unicode(inpath, sys.getfilesystemencoding())
-    ride = RIDE(inpath, updatecheck)
+    ride = RIDE(inpath, updatecheck, profiler, lazy)
     ride.MainLoop()
 
 
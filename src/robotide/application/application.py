@@ -16,14 +16,17 @@ from __future__ import with_statement
 import os
 import wx
 from contextlib import contextmanager
+from threading import Thread
 from robotide.application.updatenotifier import UpdateNotifierController, UpdateDialog
 from robotide.context import SETTINGS
 
 from robotide.namespace import Namespace
 from robotide.controller import ChiefController
 from robotide.ui import RideFrame, LoadProgressObserver
-from robotide.pluginapi import RideLogMessage
+from robotide.pluginapi import RideLogMessage, RideFileChangedOnDisk
 from robotide import context, contrib
+from robotide.startupprofiler import StartupProfiler
+from robotide.utils.filewatcher import FILE_WATCHER
 
 from pluginloader import PluginLoader
 from editorprovider import EditorProvider
@@ -31,30 +34,67 @@ from editorprovider import EditorProvider
 
 class RIDE(wx.App):
 
-    def __init__(self, path=None, updatecheck=True):
+    def __init__(self, path=None, updatecheck=True, profiler=None, lazy=False):
         self._initial_path = path
         self._updatecheck = updatecheck
+        self._profiler = profiler or StartupProfiler()
+        self._lazy = lazy
         context.APP = self
         wx.App.__init__(self, redirect=False)
 
     def OnInit(self):
-        self.namespace = Namespace()
-        self._controller = ChiefController(self.namespace)
-        self.frame = RideFrame(self, self._controller)
+        with self._profiler.phase('Namespace'):
+            self.namespace = Namespace()
+        with self._profiler.phase('Controller'):
+            self._controller = ChiefController(self.namespace)
+        with self._profiler.phase('Main frame'):
+            self.frame = RideFrame(self, self._controller)
         self._editor_provider = EditorProvider()
-        self._plugin_loader = PluginLoader(self, self._get_plugin_dirs(),
-                                           context.get_core_plugins())
-        self._plugin_loader.enable_plugins()
-        self.editor = self._get_editor()
-        self.editor.show()
-        self._load_data()
-        self.frame.tree.populate(self.model)
-        self.frame.tree.set_editor(self.editor)
+        if self._lazy:
+            self.frame.Update()
+            self._load_default_libraries_in_background()
+            wx.CallAfter(self._initialize)
+        else:
+            self._initialize()
+        return True
+
+    def _load_default_libraries_in_background(self):
+        loader = Thread(target=self.namespace.load_default_libraries)
+        loader.setDaemon(True)
+        loader.start()
+
+    def _initialize(self):
+        with self._profiler.phase('Plugins'):
+            self._plugin_loader = PluginLoader(self, self._get_plugin_dirs(),
+                                               context.get_core_plugins(),
+                                               self._get_plugin_manifest())
+            self._plugin_loader.enable_plugins()
+        with self._profiler.phase('Editor'):
+            self.editor = self._get_editor()
+            self.editor.show()
+        with self._profiler.phase('Data'):
+            self._load_data()
+        with self._profiler.phase('Tree'):
+            self.frame.tree.populate(self.model)
+            self.frame.tree.set_editor(self.editor)
+        FILE_WATCHER.start(self._file_changed_on_disk)
         self._publish_system_info()
         if self._updatecheck:
             UpdateNotifierController(SETTINGS).notify_update_if_needed(UpdateDialog)
         wx.CallLater(200, self._get_release_notes().bring_to_front)
-        return True
+        self._profiler.finish()
+
+    def _file_changed_on_disk(self, path):
+        wx.CallAfter(self._publish_file_changed_on_disk, path)
+
+    def _publish_file_changed_on_disk(self, path):
+        if not FILE_WATCHER.is_changed(path):
+            return
+        datafiles = [df for df in self._controller.datafiles if df.filename
+                     and os.path.normcase(os.path.abspath(df.filename)) == path]
+        RideFileChangedOnDisk(path=path,
+                              datafile=datafiles[0] if datafiles else None
+                              ).publish()
 
     def _publish_system_info(self):
         RideLogMessage(context.SYSTEM_INFO).publish()
@@ -68,6 +108,9 @@ class RIDE(wx.App):
                 os.path.join(context.SETTINGS['install root'], 'site-plugins'),
                 contrib.CONTRIB_PATH]
 
+    def _get_plugin_manifest(self):
+        return context.SETTINGS.get_path('plugin_manifest.json')
+
     def _get_editor(self):
         from robotide.editor import EditorPlugin
         for pl in self._plugin_loader.plugins:
@@ -87,6 +130,7 @@ class RIDE(wx.App):
                 self._controller.load_data(self._initial_path, observer)
 
     def get_plugins(self):
+        self._plugin_loader.load_deferred_plugins()
         return self._plugin_loader.plugins
 
     def register_editor(self, object_class, editor_class, activate):
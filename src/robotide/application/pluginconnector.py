@@ -25,6 +25,12 @@ def PluginFactory(application, plugin_class):
         return PluginConnector(plugin)
 
 
+def enabled_on_startup(name, initially_enabled):
+    """Returns whether plugin `name` is enabled when RIDE starts."""
+    return SETTINGS['Plugins'].add_section(name).get('_enabled',
+                                                     initially_enabled)
+
+
 class _PluginConnector(object):
 
     def __init__(self, name, doc='', error=None):
@@ -32,6 +38,7 @@ class _PluginConnector(object):
         self.doc = doc
         self.error = error
         self.enabled = False
+        self.initially_enabled = False
         self.metadata = {}
         self.config_panel = lambda self: None
 
@@ -41,12 +48,13 @@ class PluginConnector(_PluginConnector):
     def __init__(self, plugin):
         _PluginConnector.__init__(self, plugin.name, plugin.doc)
         self._plugin = plugin
+        self.initially_enabled = plugin.initially_enabled
         self._settings = SETTINGS['Plugins'].add_section(plugin.name)
         self.config_panel = plugin.config_panel
         self.metadata = plugin.metadata
 
     def enable_on_startup(self):
-        if self._settings.get('_enabled', self._plugin.initially_enabled):
+        if enabled_on_startup(self.name, self.initially_enabled):
             self.enable()
 
     def enable(self):
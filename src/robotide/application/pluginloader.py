@@ -12,36 +12,86 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from __future__ import with_statement
+
 import os
 import imp
 import inspect
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        json = None
 
 from robotide.context import LOG
 from robotide.pluginapi import Plugin
 
-from pluginconnector import PluginFactory
+from pluginconnector import PluginFactory, enabled_on_startup
 
 
 class PluginLoader(object):
+    """Loads the standard plugins and plugins found from `load_dirs`.
+
+    Plugins found from files are recorded to a manifest stored in
+    `manifest_path`. Files whose plugins are all disabled and which have not
+    changed since they were recorded are imported only when
+    `load_deferred_plugins` is called.
+    """
 
-    def __init__(self, application, load_dirs, standard_classes):
+    def __init__(self, application, load_dirs, standard_classes,
+                 manifest_path=None):
+        self._application = application
         self._load_errors = []
+        self._manifest = PluginManifest(manifest_path)
+        self._deferred = []
         self.plugins = [ PluginFactory(application, cls) for cls in
-                         standard_classes + self._find_classes(load_dirs) ]
-        if self._load_errors:
-            LOG.error('\n\n'.join(self._load_errors))
+                         standard_classes ]
+        paths = self._find_python_files(load_dirs)
+        self._manifest.retain(paths)
+        for path in paths:
+            recorded = self._manifest.plugins(path)
+            if recorded is None or self._any_enabled(recorded):
+                self._load_plugins(path)
+            elif recorded:
+                self._deferred.append(path)
+        self._finish_loading()
 
     def enable_plugins(self):
         for p in self.plugins:
             p.enable_on_startup()
 
-    def _find_classes(self, load_dirs):
-        classes = []
-        for path in self._find_python_files(load_dirs):
-            for cls in self._import_classes(path):
-                if self._is_plugin_class(path, cls):
-                    classes.append(cls)
-        return classes
+    def load_deferred_plugins(self):
+        """Imports the plugins that were not needed at startup."""
+        deferred, self._deferred = self._deferred, []
+        for path in deferred:
+            self._load_plugins(path)
+        self._finish_loading()
+
+    def _finish_loading(self):
+        self._manifest.save()
+        if self._load_errors:
+            LOG.error('\n\n'.join(self._load_errors))
+            self._load_errors = []
+
+    def _any_enabled(self, recorded):
+        return any(enabled_on_startup(name, initially_enabled)
+                   for name, initially_enabled in recorded)
+
+    def _load_plugins(self, path):
+        errors = len(self._load_errors)
+        plugins = [ PluginFactory(self._application, cls) for cls in
+                    self._find_classes(path) ]
+        self.plugins.extend(plugins)
+        if len(self._load_errors) == errors and \
+                not any(p.error for p in plugins):
+            self._manifest.record(path, [(p.name, p.initially_enabled)
+                                         for p in plugins])
+
+    def _find_classes(self, path):
+        return [ cls for cls in self._import_classes(path)
+                 if self._is_plugin_class(path, cls) ]
 
     def _is_plugin_class(self, path, cls):
         try:
@@ -84,3 +134,76 @@ class PluginLoader(object):
                 file.close()
         return [ cls for _, cls in
                  inspect.getmembers(module, predicate=inspect.isclass) ]
+
+
+class PluginManifest(object):
+    """Plugin names and initial enablement recorded by plugin file.
+
+    A recorded file is identified by its modification time and size, and the
+    manifest is stored as JSON in `path`. Without a `path`, or without the
+    json module, nothing is stored. The manifest is only a cache, so a stored
+    manifest that cannot be read is ignored.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._files = self._read()
+        self._changed = False
+
+    def _read(self):
+        if not (json and self._path and os.path.isfile(self._path)):
+            return {}
+        try:
+            with open(self._path) as manifest:
+                files = json.load(manifest)
+        except (IOError, ValueError):
+            return {}
+        return files if self._is_valid(files) else {}
+
+    def _is_valid(self, files):
+        if not isinstance(files, dict):
+            return False
+        for recorded in files.values():
+            if not isinstance(recorded, dict):
+                return False
+            stat, plugins = recorded.get('stat'), recorded.get('plugins')
+            if not (isinstance(stat, list) and len(stat) == 2 and
+                    isinstance(plugins, list)):
+                return False
+            for plugin in plugins:
+                if not (isinstance(plugin, list) and len(plugin) == 2 and
+                        isinstance(plugin[0], basestring)):
+                    return False
+        return True
+
+    def plugins(self, path):
+        """Returns recorded (name, initially enabled) pairs or None."""
+        recorded = self._files.get(path)
+        if not recorded or recorded['stat'] != self._stat(path):
+            return None
+        return [tuple(plugin) for plugin in recorded['plugins']]
+
+    def record(self, path, plugins):
+        self._files[path] = {'stat': self._stat(path), 'plugins': plugins}
+        self._changed = True
+
+    def retain(self, paths):
+        """Removes files that are not in `paths` from the manifest."""
+        for path in set(self._files) - set(paths):
+            del self._files[path]
+            self._changed = True
+
+    def save(self):
+        if not (json and self._path and self._changed):
+            return
+        try:
+            with open(self._path, 'w') as manifest:
+                json.dump(self._files, manifest)
+            self._changed = False
+        except IOError, err:
+            LOG.error("Writing plugin manifest '%s' failed: %s"
+                      % (self._path, err))
+
+    def _stat(self, path):
+        stat = os.stat(path)
+        return [stat.st_mtime, stat.st_size]
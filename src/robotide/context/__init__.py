@@ -30,7 +30,7 @@ class RideSettings(Settings):
     def __init__(self):
         default_path = os.path.join(os.path.dirname(__file__), 'settings.cfg')
         user_path = initialize_settings('ride', default_path)
-        Settings.__init__(self, user_path)
+        Settings.__init__(self, user_path, write_delay=1.0)
         self._settings_dir = os.path.dirname(user_path)
         self.set('install root', os.path.dirname(os.path.dirname(__file__)))
 
@@ -12,11 +12,18 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from __future__ import with_statement
+
 import os
+import time
 import shutil
+import atexit
+import threading
+from StringIO import StringIO
 from configobj import ConfigObj, Section, UnreprError
 
 from robotide.context.platform import IS_WINDOWS
+from robotide.utils import replace_file
 
 
 if IS_WINDOWS:
@@ -86,6 +93,7 @@ class _Section:
     def __init__(self, section, parent):
         self._config_obj = section
         self._parent = parent
+        self._lock = parent._lock
 
     def save(self):
         self._parent.save()
@@ -131,11 +139,13 @@ class _Section:
             raise SectionError("Cannot override section with value.")
         if isinstance(value, _Section):
             if override:
-                self._config_obj[name] = {}
+                with self._lock:
+                    self._config_obj[name] = {}
             for key, _value in value._config_obj.items():
                 self[name].set(key, _value, autosave, override)
         elif name not in self._config_obj or override:
-            self._config_obj[name] = value
+            with self._lock:
+                self._config_obj[name] = value
             if autosave:
                 self.save()
 
@@ -162,7 +172,8 @@ class _Section:
         if name in self._config_obj and not isinstance(self._config_obj[name], Section):
             raise SectionError("Cannot override value with section.")
         if name not in self._config_obj:
-            self._config_obj[name] = {}
+            with self._lock:
+                self._config_obj[name] = {}
         return self[name].set_defaults(**defaults)
 
     def _is_section(self, name):
@@ -171,12 +182,107 @@ class _Section:
 
 
 class Settings(_Section):
+    """Settings stored in a ConfigObj file.
+
+    With a `write_delay` of zero, every save writes the file immediately.
+    Otherwise saves are coalesced and the file is written in a background
+    thread once no changes have been saved for `write_delay` seconds, and
+    at exit. A background write that fails is retried after another
+    `write_delay`. The file is always replaced atomically and keeps its
+    permissions.
+    """
 
-    def __init__(self, user_path):
+    def __init__(self, user_path, write_delay=0):
         try:
             self._config_obj = ConfigObj(user_path, unrepr=True)
         except UnreprError, error:
             raise ConfigurationError(error)
+        self._lock = threading.RLock()
+        self._writer = _WriteBehind(self._write, write_delay)
+        if write_delay:
+            atexit.register(self.flush)
 
     def save(self):
-        self._config_obj.write()
+        self._writer.changed()
+
+    def flush(self):
+        """Writes pending changes to the file immediately."""
+        self._writer.flush()
+
+    @property
+    def write_stats(self):
+        """Tuple of the number of saves requested and file writes done."""
+        return self._writer.requested, self._writer.written
+
+    def _write(self):
+        content = StringIO()
+        with self._lock:
+            self._config_obj.write(content)
+        replace_file(self._config_obj.filename, content.getvalue())
+
+
+class _WriteBehind(object):
+
+    def __init__(self, write, delay):
+        self._write = write
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = False
+        self._due = None
+        self._timer = None
+        self.requested = 0
+        self.written = 0
+
+    def changed(self):
+        with self._lock:
+            self.requested += 1
+            self._pending = True
+            if self._delay:
+                self._due = time.time() + self._delay
+                if not self._timer:
+                    self._start_timer(self._delay)
+                return
+        self.flush()
+
+    def _start_timer(self, delay):
+        self._timer = threading.Timer(delay, self._timeout)
+        self._timer.setDaemon(True)
+        self._timer.start()
+
+    def _timeout(self):
+        with self._lock:
+            if threading.currentThread() is not self._timer:
+                return
+            remaining = self._due - time.time()
+            if remaining > 0:
+                self._start_timer(remaining)
+                return
+            self._timer = None
+        try:
+            self.flush()
+        except EnvironmentError:
+            self._retry()
+
+    def _retry(self):
+        with self._lock:
+            if self._pending and not self._timer:
+                self._due = time.time() + self._delay
+                self._start_timer(self._delay)
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                timer, self._timer = self._timer, None
+                pending, self._pending = self._pending, False
+            if timer:
+                timer.cancel()
+                timer.join()
+            if not pending:
+                return
+            try:
+                self._write()
+            except:
+                self._pending = True
+                raise
+            self.written += 1
@@ -18,20 +18,27 @@ http://code.google.com/p/robotframework-ride/wiki/SearchPlugin
 '''
 
 import sys
-import thread
 import threading
-import time
 import wx
 from robotide.pluginapi import Plugin, ActionInfo
 from robotide.pluginapi import RideLogMessage
+from robotide.pluginapi import (RideItem, RideTestCaseAdded,
+    RideTestCaseRemoved, RideOpenSuite, RideNewProject, RideDataFileRemoved,
+    RideSuiteAdded, RideInitFileRemoved, RideDataFileSet)
+from robotide.controller.macrocontrollers import TestCaseController
+from robotide.contrib.searchindex import SearchIndex
 
 
 SEARCH_KEYWORDS = 0
 SEARCH_TAGS = 1
 SEARCH_CHOICES = ("Search Test Case Keywords", "Search Tags")
+PAGE_SIZE = 200
 
 class SearchPlugin(Plugin):
     '''Provides a dialog for searching for strings within tests'''
+    _structure_changes = (RideOpenSuite, RideNewProject, RideDataFileRemoved,
+                          RideSuiteAdded, RideInitFileRemoved, RideDataFileSet)
+
     def __init__(self, application, initially_active=True):
         defaults = {'match_case':False, 'exact_match':True}
         Plugin.__init__(self, application, default_settings=defaults,
@@ -44,6 +51,7 @@ class SearchPlugin(Plugin):
         self._request_stop_event = threading.Event()
         self._stopped_event = threading.Event()
         self._stopped_event.set()
+        self._index = SearchIndex()
         self.search_string = ""
 
 
@@ -55,6 +63,8 @@ class SearchPlugin(Plugin):
                             shortcut='F3',
                             doc='Search for strings within tests')
         self.register_action(action)
+        self.subscribe(self.OnDataChanged, RideItem, RideTestCaseAdded,
+                       RideTestCaseRemoved, *self._structure_changes)
 
     def disable(self):
         'disable this plugin'''
@@ -62,6 +72,9 @@ class SearchPlugin(Plugin):
         try:
             self.active = False
             self.unregister_actions()
+            self.unsubscribe_all()
+            # changes made while disabled are not tracked
+            self._index.invalidate()
         except Exception, e:
             message = RideLogMessage("SearchPlugin: error while disabling plugin: %s" % str(e))
             message.publish()
@@ -91,6 +104,16 @@ class SearchPlugin(Plugin):
     def OnSearchItemSelected(self, event):
         self.highlight_cell(event.tcuk, event.child, event.row, event.col)
 
+    def OnDataChanged(self, message):
+        '''Tell the index which tests have changed'''
+        item = getattr(message, 'item', None)
+        if isinstance(message, RideTestCaseRemoved):
+            self._index.test_removed(item)
+        elif isinstance(item, TestCaseController):
+            self._index.test_changed(item)
+        elif isinstance(message, self._structure_changes):
+            self._index.invalidate()
+
     def _create_dialog(self):
         '''Create the dialog window and apply settings'''
         self._dialog = SearchDialog(self.frame, wx.ID_ANY, "Search Test Cases",
@@ -120,44 +143,27 @@ class SearchPlugin(Plugin):
         self.search_string = search_string
         self._request_stop_event.clear()
         self._stopped_event.clear()
-        search_type = self._dialog.get_search_type()
-        if search_type == SEARCH_KEYWORDS:
-            thread.start_new_thread(self._search_keywords_worker_thread, ())
+        if self._dialog.get_search_type() == SEARCH_KEYWORDS:
+            find = self._find_keywords
         else:
-            thread.start_new_thread(self._search_tags_worker_thread, ())
-
-    def _search_keywords_worker_thread(self):
-        '''Perform a search on testcase keywords'''
+            find = self._find_tags
+        worker = threading.Thread(target=self._search_worker_thread,
+                                  args=(find,))
+        worker.setDaemon(True)
+        worker.start()
+
+    def _search_worker_thread(self, find):
+        '''Update the index and post the results in pages'''
         search_string = unicode(self.search_string.strip())
         try:
-            for tcuk in self.all_testcases():
-                ## Search settings
-                for setting in tcuk.settings:
-                    name, value = setting.label, setting.as_list()
-                    if value:
-                        for column, field in enumerate(value):
-                            if self._request_stop_event.isSet(): return
-                            if self._match(search_string, field):
-                                setting = getattr(tcuk, name, None)
-                                # add one to column to account for the
-                                # setting name which isn't part of the data
-                                # we have in hand
-                                result = KeywordResult(tcuk, setting, -1, column+1)
-
-                                # N.B. CallAfter is necessary so that we only
-                                # interact with the GUI in the main thread
-                                wx.CallAfter(self._dialog.add_found_item, result)
-
-                # search steps
-                for row, step in enumerate(tcuk.steps):
-                    for column, field in enumerate(step.as_list()):
-                        if self._request_stop_event.isSet(): return
-                        if self._match(search_string, field):
-                            result = KeywordResult(tcuk, step, row, column)
-                            # N.B. CallAfter is necessary so that we only
-                            # interact with the GUI in the main thread
-                            wx.CallAfter(self._dialog.add_found_item, result)
-                        time.sleep(.0001)
+            if not self._index.refresh(self.all_testcases,
+                                       self._request_stop_event.isSet):
+                return
+            for page in self._pages(find(search_string)):
+                if self._request_stop_event.isSet(): return
+                # N.B. CallAfter is necessary so that we only
+                # interact with the GUI in the main thread
+                wx.CallAfter(self._dialog.add_found_items, page)
         except Exception, e:
             message = RideLogMessage("SearchPlugin: unexpected error in worker thread: %s" % str(e))
             message.publish()
@@ -166,24 +172,37 @@ class SearchPlugin(Plugin):
             self._stopped_event.set()
             wx.CallAfter(self._dialog.searching, False)
 
-    def _search_tags_worker_thread(self):
-        '''Perform a search on testcase tags'''
-        search_string = unicode(self.search_string.strip())
-        try:
-            for test in self.all_testcases():
-                for tag in test.tags.as_list():
-                    if self._match(search_string, tag):
-                        result = TagResult(test, test.tags.as_list()[1:])
-                        # N.B. CallAfter is necessary so that we only
-                        # interact with the GUI in the main thread
-                        wx.CallAfter(self._dialog.add_found_item, result)
-        except Exception, e:
-            message = RideLogMessage("SearchPlugin: unexpected error in worker thread: %s" % str(e))
-            message.publish()
-
-        finally:
-            self._stopped_event.set()
-            wx.CallAfter(self._dialog.searching, False)
+    def _find_keywords(self, search_string):
+        '''Yield results of the test case settings and steps that match'''
+        for tcuk, label, row, column, value in \
+                self._index.find_cells(search_string, self.exact_match):
+            if not self._match(search_string, value):
+                continue
+            if label is None:
+                yield KeywordResult(tcuk, tcuk.steps[row], row, column)
+            else:
+                # add one to column to account for the
+                # setting name which isn't part of the data
+                # we have in hand
+                setting = getattr(tcuk, label, None)
+                yield KeywordResult(tcuk, setting, -1, column+1)
+
+    def _find_tags(self, search_string):
+        '''Yield results of the test cases having a matching tag'''
+        for test, tags in self._index.find_tags(search_string, self.exact_match):
+            if any(self._match(search_string, tag) for tag in tags):
+                yield TagResult(test, tags)
+
+    def _pages(self, results):
+        '''Group the results into lists of at most PAGE_SIZE results'''
+        page = []
+        for result in results:
+            page.append(result)
+            if len(page) == PAGE_SIZE:
+                yield page
+                page = []
+        if page:
+            yield page
 
     def _match(self, search_string, value):
         '''Return True if the search string matches the value'''
@@ -398,18 +417,23 @@ class SearchDialog(wx.Dialog):
         self.match_case = value
         self.match_case_checkbox.SetValue(value)
 
-    def add_found_item(self, result):
-        '''Adds a result to the listbox'''
-        index = self.listbox.InsertStringItem(sys.maxint, result.name)
-        self.listbox.SetStringItem(index, 1, result.value)
-        self.listbox.SetClientData(index, result.data)
-
+    def add_found_items(self, results):
+        '''Adds a page of results to the listbox'''
+        self.listbox.Freeze()
+        try:
+            for result in results:
+                index = self.listbox.InsertStringItem(sys.maxint, result.name)
+                self.listbox.SetStringItem(index, 1, result.value)
+                self.listbox.SetClientData(index, result.data)
+            # the wx.LIST_AUTOSIZE feature doesn't seem to work so I
+            # need to adjust the width manually.
+            width = self._measure_strings(self.listbox,
+                                          [result.value for result in results])
+            if width > self.listbox.GetColumnWidth(1):
+                self.listbox.SetColumnWidth(1, width)
+        finally:
+            self.listbox.Thaw()
         self.SetStatus("searching...%s" % self.listbox.GetItemCount())
-        # the wx.LIST_AUTOSIZE feature doesn't seem to work so I
-        # need to adjust the width manually.
-        width = self._measure_string(self.listbox, result.value)
-        if width > self.listbox.GetColumnWidth(1):
-            self.listbox.SetColumnWidth(1, width)
 
     def get_search_type(self):
         '''Returns the currently selected search type
@@ -425,12 +449,12 @@ class SearchDialog(wx.Dialog):
         else:
             self.statusbar.Stop(self.listbox.GetItemCount())
 
-    def _measure_string(self, control, string):
-        '''Determines the width of a string'''
+    def _measure_strings(self, control, strings):
+        '''Determines the width of the widest string'''
         font = control.GetFont()
         dc = wx.WindowDC(control)
         dc.SetFont(font)
-        width, height = dc.GetTextExtent(string)
+        width = max(dc.GetTextExtent(string)[0] for string in strings)
         # add a little fudge factor; it just works better when I do this
         return width + 10
 
@@ -0,0 +1,199 @@
+# Copyright 2010 Orbitz WorldWide
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Cell content and tag index used by the search plugin
+
+The index is kept up to date by telling it which tests have changed. The
+changed tests are indexed again lazily by `SearchIndex.refresh`, which is
+meant to be called in the search worker thread before searching.
+'''
+
+from __future__ import with_statement
+
+import threading
+
+from robotide.utils.textindex import TextIndex
+
+
+def _normalize(value):
+    return value.strip().lower()
+
+
+class _ValueIndex(object):
+    '''Maps normalized values to the keys having them
+
+    Values are normalized by stripping and lowercasing them. Only distinct
+    values are kept in the text index, because most cells share their
+    values with many other cells.
+    '''
+    def __init__(self):
+        self._keys = {}
+        self._values = TextIndex(_normalize)
+
+    def add(self, key, value):
+        value = _normalize(value)
+        if value not in self._keys:
+            self._keys[value] = set()
+            self._values.add(value, value)
+        self._keys[value].add(key)
+
+    def remove(self, key, value):
+        value = _normalize(value)
+        keys = self._keys.get(value)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self._keys[value]
+            self._values.remove(value)
+
+    def find(self, pattern, exact_match):
+        '''Returns a set of keys whose value matches, ignoring case'''
+        if exact_match:
+            return set(self._keys.get(_normalize(pattern), ()))
+        result = set()
+        for value in self._values.find(pattern.lower()):
+            result.update(self._keys[value])
+        return result
+
+
+class _TestEntry(object):
+    '''Indexed content of one test
+
+    `lines` are (setting label, row, values) tuples, where the label is
+    None for steps and the row is -1 for settings.
+    '''
+    def __init__(self, test, ordinal):
+        self.test = test
+        self.ordinal = ordinal
+        self.lines = [(setting.label, -1, setting.as_list())
+                      for setting in test.settings]
+        self.lines += [(None, row, step.as_list())
+                       for row, step in enumerate(test.steps)]
+        self.tags = test.tags.as_list()[1:]
+
+    def cells(self):
+        for index, (_, _, values) in enumerate(self.lines):
+            for column, value in enumerate(values):
+                yield (index, column), value
+
+
+class SearchIndex(object):
+    '''Index of the cells and tags of all tests'''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pending = {}
+        self._rebuild = True
+        self._ordinals = {}
+        self._next_ordinal = 0
+        self._cells = _ValueIndex()
+        self._tags = _ValueIndex()
+
+    def test_changed(self, test):
+        with self._lock:
+            self._pending[test.data] = test
+
+    def test_removed(self, test):
+        with self._lock:
+            self._pending[test.data] = None
+
+    def invalidate(self):
+        '''Causes all tests to be indexed again on the next refresh'''
+        with self._lock:
+            self._rebuild = True
+
+    def refresh(self, all_testcases, should_stop=lambda: False):
+        '''Indexes changed tests
+
+        Returns False if `should_stop` returned True before all changed
+        tests were indexed. The remaining tests are indexed on the next
+        refresh.
+        '''
+        if self._take_rebuild():
+            self._schedule_all(all_testcases())
+        while True:
+            if should_stop():
+                return False
+            with self._lock:
+                if not self._pending:
+                    return True
+                key, test = self._pending.popitem()
+            self._remove(key, forget=test is None)
+            if test is not None:
+                self._add(key, test)
+
+    def _take_rebuild(self):
+        with self._lock:
+            rebuild, self._rebuild = self._rebuild, False
+            return rebuild
+
+    def _schedule_all(self, tests):
+        tests = list(tests)
+        with self._lock:
+            self._pending = dict((key, None) for key in self._entries)
+            self._pending.update((test.data, test) for test in tests)
+        self._ordinals = dict((test.data, ordinal)
+                              for ordinal, test in enumerate(tests))
+        self._next_ordinal = len(tests)
+
+    def _add(self, key, test):
+        entry = _TestEntry(test, self._ordinal_for(key))
+        self._entries[key] = entry
+        for cell, value in entry.cells():
+            self._cells.add((key,) + cell, value)
+        for tag in entry.tags:
+            self._tags.add(key, tag)
+
+    def _ordinal_for(self, key):
+        if key not in self._ordinals:
+            self._ordinals[key] = self._next_ordinal
+            self._next_ordinal += 1
+        return self._ordinals[key]
+
+    def _remove(self, key, forget=False):
+        if forget:
+            self._ordinals.pop(key, None)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for cell, value in entry.cells():
+            self._cells.remove((key,) + cell, value)
+        for tag in entry.tags:
+            self._tags.remove(key, tag)
+
+    def find_cells(self, pattern, exact_match):
+        '''Returns (test, label, row, column, value) tuples of matching cells
+
+        Matching ignores case. The cells are returned in the order of
+        the tests and in the order of the cells in each test.
+        '''
+        hits = []
+        for key, index, column in self._cells.find(pattern, exact_match):
+            entry = self._entries[key]
+            label, row, values = entry.lines[index]
+            hits.append(((entry.ordinal, index, column),
+                         (entry.test, label, row, column, values[column])))
+        return [hit for _, hit in sorted(hits)]
+
+    def find_tags(self, pattern, exact_match):
+        '''Returns (test, tags) tuples of tests having a matching tag
+
+        Matching ignores case.
+        '''
+        entries = sorted((self._entries[key] for key
+                          in self._tags.find(pattern, exact_match)),
+                         key=lambda entry: entry.ordinal)
+        return [(entry.test, entry.tags) for entry in entries]
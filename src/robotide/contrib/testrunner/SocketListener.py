@@ -15,27 +15,128 @@
 
 '''A Robot Framework listener that sends information to a socket
 
-This uses the "pickle" module of python to send objects to the
-listening server. It should probably be refactored to call an
-XMLRPC server.
+Events are sent in frames consisting of a 4 byte big-endian length and
+a UTF-8 encoded JSON list of [name, args] events. Unlike pickles, frames
+are safe to decode.
+
+In streaming mode, enabled by giving "stream" as the last listener
+argument, keyword level events (keywords and log messages) are not sent
+and the other events are sent in batches. A batch is sent when it grows
+over BATCH_SIZE bytes or after it has waited BATCH_INTERVAL seconds.
+Otherwise every event is sent immediately in a frame of its own.
+
+This module must not depend on RIDE, because it is run by Robot
+Framework in the test execution process. For the same reason it must
+work with Python 2.5 and Jython 2.5, which lack the json module. There
+frames are encoded with a minimal built-in encoder.
 '''
 
+from __future__ import with_statement
+
 import os
+import re
+import time
 import socket
-import sys
+import struct
+import threading
 try:
-    import cPickle as pickle
+    import json
 except ImportError:
-    import pickle
+    try:
+        import simplejson as json
+    except ImportError:
+        json = None
 
 PORT = 5007
 HOST = "localhost"
+STREAM = "stream"
+BATCH_SIZE = 64 * 1024
+BATCH_INTERVAL = 0.1
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+KEYWORD_EVENTS = ("start_keyword", "end_keyword", "message", "log_message")
+
+_HEADER = '>I'
+_HEADER_SIZE = struct.calcsize(_HEADER)
+_ESCAPED = re.compile(r'[\\"]|[^\x20-\x7e]')
+_ESCAPES = {'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+def encode_frame(events):
+    '''Returns a list of (name, args) events encoded as one frame'''
+    payload = _dumps(events)
+    return struct.pack(_HEADER, len(payload)) + payload
+
+
+def _dumps(value):
+    if json:
+        return json.dumps(value, separators=(',', ':'), default=unicode)
+    return _encode(value)
+
+
+def _encode(value):
+    '''Encodes `value` as ASCII JSON like json.dumps(default=unicode)'''
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, (int, long)):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return '[%s]' % ','.join([_encode(item) for item in value])
+    if isinstance(value, dict):
+        return '{%s}' % ','.join(['%s:%s' % (_encode_string(key), _encode(item))
+                                  for key, item in value.items()])
+    return _encode_string(value)
+
+
+def _encode_string(value):
+    if isinstance(value, str):
+        value = value.decode('UTF-8', 'replace')
+    elif not isinstance(value, unicode):
+        value = unicode(value)
+    return '"%s"' % str(_ESCAPED.sub(_escape, value))
+
+
+def _escape(match):
+    char = match.group()
+    if char in _ESCAPES:
+        return _ESCAPES[char]
+    code = ord(char)
+    if code > 0xFFFF:
+        code -= 0x10000
+        return '\\u%04x\\u%04x' % (0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+    return '\\u%04x' % code
+
+
+def read_frames(stream):
+    '''Yields lists of (name, args) events read from a file-like stream
+
+    Stops at the end of the stream. Raises ValueError if the stream does
+    not contain valid frames.
+    '''
+    while True:
+        header = stream.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE:
+            return
+        size = struct.unpack(_HEADER, header)[0]
+        if size > MAX_FRAME_SIZE:
+            raise ValueError('Frame of %d bytes is too large' % size)
+        payload = stream.read(size)
+        if len(payload) < size:
+            return
+        yield [(name, tuple(args)) for name, args in json.loads(payload)]
+
 
 class SocketListener:
     """Pass all listener events to a remote listener
 
     If called with one argument, that argument is a port
     If called with two, the first is a hostname, the second is a port
+    In both cases "stream" can be given as an additional last argument
     """
     ROBOT_LISTENER_API_VERSION = 2
 
@@ -43,13 +144,21 @@ class SocketListener:
         self.port = PORT
         self.host = HOST
         self.sock = None
+        self._streaming = bool(args) and args[-1] == STREAM
+        if self._streaming:
+            args = args[:-1]
         if len(args) == 1:
             self.port = int(args[0])
         elif len(args) >= 2:
             self.host = args[0]
             self.port = int(args[1])
+        self._batch = []
+        self._batch_size = 0
+        self._lock = threading.RLock()
         self._connect()
         self._send_pid()
+        if self._streaming:
+            self._start_flusher()
 
     def _send_pid(self):
         self._send_socket("pid", os.getpid())
@@ -95,24 +204,56 @@ class SocketListener:
 
     def close(self):
         self._send_socket("close")
-        if self.sock:
-            self.filehandler.close()
-            self.sock.close()
+        with self._lock:
+            self._flush()
+            if self.sock:
+                self.sock.close()
+                self.sock = None
 
     def _connect(self):
-        '''Establish a connection for sending pickles'''
+        '''Establish a connection for sending frames'''
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
-            self.filehandler = self.sock.makefile('w')
-            self.pickler = pickle.Pickler(self.filehandler)
         except socket.error, e:
             print 'unable to open socket to "%s:%s" error: %s' % (self.host, self.port, str(e))
             self.sock = None
 
+    def _start_flusher(self):
+        flusher = threading.Thread(target=self._flush_periodically)
+        flusher.setDaemon(True)
+        flusher.start()
+
+    def _flush_periodically(self):
+        while self.sock:
+            time.sleep(BATCH_INTERVAL)
+            with self._lock:
+                self._flush()
+
     def _send_socket(self, name, *args):
-        if self.sock:
-            packet = (name, args)
-            self.pickler.dump(packet)
-            self.filehandler.flush()
+        if not self.sock:
+            return
+        with self._lock:
+            if not self._streaming:
+                self._send([(name, args)])
+            elif name not in KEYWORD_EVENTS:
+                self._add_to_batch((name, args))
+
+    def _add_to_batch(self, event):
+        self._batch.append(event)
+        self._batch_size += len(_dumps(event))
+        if self._batch_size >= BATCH_SIZE:
+            self._flush()
 
+    def _flush(self):
+        if self._batch:
+            self._send(self._batch)
+            self._batch, self._batch_size = [], 0
+
+    def _send(self, events):
+        if not self.sock:
+            return
+        try:
+            self.sock.sendall(encode_frame(events))
+        except socket.error:
+            self.sock = None
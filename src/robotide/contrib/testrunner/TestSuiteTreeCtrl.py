@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import time
 import wx
 import os
 
@@ -25,6 +24,10 @@ Each test in the tree will have a checkbox next to it, as well as
 an icon. The icon can be changed to different colors depending on
 state ("default", "run", "pass", "fail").
 
+The suites and tests are indexed by their long names when the model is
+set, and the run states and checked tests are kept in that index. Tree
+nodes are created only when their parent suite is expanded, and node
+images and checkboxes are updated only for nodes that exist.
 '''
 
 from wx.lib.embeddedimage import PyEmbeddedImage
@@ -75,12 +78,20 @@ class TestSuiteTreeCtrl(customtreectrl.CustomTreeCtrl):
             }
         self.SetImageList(self._image_list)
 
-        # nodes lets us get to the node of a specific test by its
-        # ID without having to traverse the whole tree
+        # entries are TreeNodes of all suites and tests by their long name
+        # keys, nodes are the tree items created for them so far
+        self._entries = {}
+        self._tests = []
         self._nodes = {}
+        self._states = {}
+        self._failed = set()
+        self._checked = set()
+        self._expanded = None
         self._model = None
         self._suite = None
-        self._is_redrawing = False
+        self._root = None
+        self.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.OnTreeItemExpanding)
+        self.Bind(customtreectrl.EVT_TREE_ITEM_CHECKED, self.OnTreeItemChecked)
 
     def CollapseAll(self):
         '''Collapse all test suite files
@@ -90,29 +101,21 @@ class TestSuiteTreeCtrl(customtreectrl.CustomTreeCtrl):
         of suites with no test cases. I *think* that makes more
         sense than collapsing everything, leaving only the root
         '''
-        for item in self._nodes.values():
-            data = self.GetItemPyData(item).data
-            if isinstance(data, TestCaseFile):
+        for key, item in self._nodes.items():
+            if isinstance(self._entries[key].data, TestCaseFile):
                 self.Collapse(item)
 
     def DeselectAll(self):
         '''De-select all items with checkboxes'''
-        for item in self._nodes.values():
-            self.CheckItem(item, False)
+        self._set_checked(set())
 
     def DeselectChildren(self):
         '''De-select all child items with checkboxes'''
-        item = self.GetSelection()
-        self.AutoCheckChild(item, False)
+        self._check_children(self.GetSelection(), False)
 
     def GetFailedTests(self):
-        '''Return a list of all tree nodes of failed tests'''
-        result = []
-        for item in self._nodes.values():
-            image = self.GetItemImage(item)
-            if image == self._images[self.FAILED_IMAGE_KEY]:
-                result.append(item)
-        return result
+        '''Return a list of long names of all failed tests'''
+        return [self._entries[key].longname for key in self._failed]
 
     def _convert_test_longname_key(self, longname):
         if os.name == 'nt':
@@ -126,46 +129,68 @@ class TestSuiteTreeCtrl(customtreectrl.CustomTreeCtrl):
         return longname
 
     def GetUncheckedTests(self):
-        result = []
-        for item in self._nodes.values():
-            pydata = self.GetItemPyData(item)
-            if isinstance(pydata.data, TestCase) and not self.IsItemChecked(item):
-                result.append(pydata.name)
-        return result
+        return [entry.name for entry in self._tests
+                if entry.key not in self._checked]
 
     def GetCheckedTests(self):
-        return [self.GetItemPyData(item).name for item in self._nodes.values() if self.IsItemChecked(item)]
+        return [self._entries[key].name for key in self._checked]
 
     def GetCheckedTestsByName(self):
         '''Return a list of (suite name, test name) tuples for all checked tests'''
-        result = []
-        for item in self._nodes.values():
-            if self.IsItemChecked(item):
-                item_name = self.GetItemPyData(item).name
-                parent_item = self.GetItemParent(item)
-                parent_name = self.GetItemPyData(parent_item).longname
-                result.append((parent_name, item_name))
-        return result
+        return [(entry.parent.longname, entry.name) for entry in
+                (self._entries[key] for key in self._checked)]
 
     def SelectAll(self):
         '''Select all items with checkboxes'''
-        for item in self._nodes.values():
-            self.CheckItem(item, True)
+        self._set_checked(set(entry.key for entry in self._tests))
 
     def SelectAllFailed(self):
         '''Select all tests that have a "fail" icon'''
-        for item in self._nodes.values():
-            image = self.GetItemImage(item)
-            self.CheckItem(item, image == self._images[self.FAILED_IMAGE_KEY])
+        self._set_checked(set(self._failed))
 
     def SelectChildren(self):
-        item = self.GetSelection()
-        self.AutoCheckChild(item, True)
+        self._check_children(self.GetSelection(), True)
+
+    def _check_children(self, item, checked):
+        if not item or not item.IsOk():
+            return
+        keys = set(entry.key for entry in
+                   self._test_entries(self.GetItemPyData(item)))
+        self._set_checked(self._checked | keys if checked
+                          else self._checked - keys)
+
+    def _test_entries(self, entry):
+        if entry.is_test:
+            yield entry
+        for child in entry.children:
+            for test in self._test_entries(child):
+                yield test
+
+    def _set_checked(self, keys):
+        changed = self._checked ^ keys
+        self._checked = keys
+        for key in changed:
+            if key in self._nodes:
+                self.CheckItem(self._nodes[key], key in keys)
+
+    def OnTreeItemChecked(self, event):
+        item = event.GetItem()
+        entry = self.GetItemPyData(item)
+        if entry and entry.is_test:
+            if self.IsItemChecked(item):
+                self._checked.add(entry.key)
+            else:
+                self._checked.discard(entry.key)
+        event.Skip()
 
     def Reset(self):
         '''Reset the running/pass/fail state of all nodes'''
-        for node in self._nodes.values():
-            self.SetItemImage(node, self._images[self.DEFAULT_IMAGE_KEY])
+        for key in self._states:
+            if key in self._nodes:
+                self.SetItemImage(self._nodes[key],
+                                  self._images[self.DEFAULT_IMAGE_KEY])
+        self._states = {}
+        self._failed = set()
 
     def SetDataModel(self, model):
         '''Set the internal data model used by the tree control'''
@@ -173,73 +198,122 @@ class TestSuiteTreeCtrl(customtreectrl.CustomTreeCtrl):
         self._suite = model.data
 
     def Redraw(self):
-        '''Redraw the whole tree'''
-        # before doing this I need to save state (checked/unchecked, open/closed)
-        if self._is_redrawing:
-            return
-        self._is_redrawing = True
-        saved_state = self.SaveState()
-        self._reset_tree_state()
-        def redraw_ready():
-            self._is_redrawing = False
-        self._draw_current_suite(saved_state, redraw_ready)
+        '''Redraw the whole tree
 
-    def _draw_current_suite(self, saved_state, call_when_ready):
+        Checked tests, test states and expanded suites are preserved over
+        the redraw by their long names. Only the nodes of expanded suites
+        are created.
+        '''
+        expanded = self.SaveState()
+        self._reset_tree_state()
         if self._suite is not None:
-            def call_after():
-                self.RestoreState(saved_state, call_when_ready)
-            self._addSuite(self._root, self._suite, call_after)
-        else:
-            call_when_ready()
+            top = self._index_suite(None, self._suite)
+            self._checked &= set(entry.key for entry in self._tests)
+            self._expanded = expanded
+            self._add_node(self._root, top)
+            self.RestoreState(expanded)
+        self._failed &= set(self._entries)
+        self._states = dict((key, state) for key, state
+                            in self._states.items() if key in self._entries)
 
     def _reset_tree_state(self):
         self.DeleteAllItems()
+        self._entries = {}
+        self._tests = []
         self._nodes = {}
+        self._expanded = None
         self._root = self.AddRoot("root")
 
-    def RestoreState(self, state, call_after):
-        '''Restore the checked and expanded state of all known nodes in the tree'''
-        def create_func(node):
-            def func():
-                pydata = self.GetItemPyData(node)
-                data = pydata.data
-                # if we find a node for which there is no state information,
-                # default to unchecked, collapsed for test case files and expanded for others
-                (checked, expanded) = state.get(data, (False, not isinstance(data, TestCaseFile)))
-                self.CheckItem(node, checked)
-                if expanded:
-                    self.Expand(node)
-                else:
-                    self.Collapse(node)
-            return func
-        self._call_in_sequence([create_func(node) for node in self._nodes.values()]+[call_after])
-
-    def _call_in_sequence(self, funcs):
-        if funcs == []:
-            return
-        funcs[0]()
-        time.sleep(0)
-        wx.CallAfter(self._call_in_sequence, funcs[1:])
+    def _index_suite(self, parent, suite):
+        entry = TreeNode(suite.longname, suite, parent,
+                         self._convert_suite_longname_key(suite.longname))
+        self._entries[entry.key] = entry
+        for test in suite.tests:
+            test_entry = TreeNode(test.longname, test, entry,
+                                  self._convert_test_longname_key(test.longname))
+            self._entries[test_entry.key] = test_entry
+            self._tests.append(test_entry)
+            entry.children.append(test_entry)
+        for child in suite.suites:
+            entry.children.append(self._index_suite(entry, child))
+        return entry
+
+    def RestoreState(self, expanded):
+        '''Expand the nodes of the given suites that exist in the tree
+
+        A suite without state information is expanded unless it is a
+        test case file. Nodes of the expanded suites are created first.
+        '''
+        for key, item in self._nodes.items():
+            entry = self._entries[key]
+            if entry.is_test:
+                continue
+            if self._is_expanded(entry, expanded):
+                self._add_child_nodes(item, entry)
+                self.Expand(item)
+            else:
+                self.Collapse(item)
+
+    def _is_expanded(self, entry, expanded):
+        if expanded is None:
+            return not isinstance(entry.data, TestCaseFile)
+        return entry.key in expanded
 
     def SaveState(self):
-        '''Return a dictionary of checked/expanded states for each node in the tree
+        '''Return the long name keys of suites expanded in the tree
 
         This was primarily designed for saving and restoring the state of
-        the tree immediately before and after a refresh
+        the tree immediately before and after a refresh. Checked tests are
+        kept by the tree itself.
         '''
-        state = {}
-        for node in self._nodes.values():
-            data = self.GetItemPyData(node).data
-            checked = self.IsItemChecked(node)
-            expanded = self.IsExpanded(node)
-            state[data] = (checked, expanded)
-        return state
+        if self._expanded is None:
+            return None
+        return set(key for key, item in self._nodes.items()
+                   if not self._entries[key].is_test and self.IsExpanded(item))
+
+    def OnTreeItemExpanding(self, event):
+        item = event.GetItem()
+        entry = item.IsOk() and self.GetItemPyData(item)
+        if entry:
+            self._add_child_nodes(item, entry)
+        event.Skip()
+
+    def _add_child_nodes(self, item, entry):
+        if entry.rendered:
+            return
+        entry.rendered = True
+        for child in entry.children:
+            child_item = self._add_node(item, child)
+            if not child.is_test and self._is_expanded(child, self._expanded):
+                self._add_child_nodes(child_item, child)
+                self.Expand(child_item)
+
+    def _add_node(self, parent_node, entry):
+        image = self._images[self._states.get(entry.key, self.DEFAULT_IMAGE_KEY)]
+        if entry.is_test:
+            item = self.AppendItem(parent_node, entry.name, ct_type=1,
+                                   image=image)
+            if entry.key in self._checked:
+                self.CheckItem(item, True)
+        else:
+            item = self.AppendItem(parent_node, entry.name, image=image)
+            self.SetItemHasChildren(item, bool(entry.children))
+        self.SetItemPyData(item, entry)
+        self._nodes[entry.key] = item
+        return item
 
     def SetState(self, testId, state):
         '''Set the state and associated image for a test'''
-        image = self._images[state]
-        node = self._nodes[self._convert_test_longname_key(testId)]
-        self.SetItemImage(node, image)
+        key = self._convert_test_longname_key(testId)
+        self._states[key] = state
+        entry = self._entries.get(key)
+        if entry and entry.is_test:
+            if state == self.FAILED_IMAGE_KEY:
+                self._failed.add(key)
+            else:
+                self._failed.discard(key)
+        if key in self._nodes:
+            self.SetItemImage(self._nodes[key], self._images[state])
 
     def running_test(self, testId):
         self.SetState(testId, self.RUNNING_IMAGE_KEY)
@@ -262,70 +336,24 @@ class TestSuiteTreeCtrl(customtreectrl.CustomTreeCtrl):
     def test_failed(self, testId):
         self.SetState(testId, self.FAILED_IMAGE_KEY)
 
-    def _addSuite(self, parent_node, suite, call_after):
-        suite_node = self._add_suite_node(parent_node, suite)
-        def expand_and_call_after():
-            self.Expand(suite_node)
-            call_after()
-        def create_add_test(test):
-            def add_test():
-                self._addTest(suite_node, test)
-            return add_test
-        def create_add_subsuites(children):
-            def add_suites():
-                self._add_subsuites(suite_node, children, expand_and_call_after)
-            return add_suites if len(children) > 0 else call_after
-        self._call_in_sequence([create_add_test(test) for test in suite.tests]+
-                               [create_add_subsuites(suite.suites)])
-
-    def _add_suite_node(self, parent_node, suite):
-        suite_node = self._suite_node(parent_node, suite.name)
-        fullname = suite.longname
-        self._nodes[self._convert_suite_longname_key(fullname)] = suite_node
-        self.SetItemPyData(suite_node, TreeNode(fullname, suite))
-        return suite_node
-
-    def _suite_node(self, parent_node, suite_name):
-        return self.AppendItem(parent_node, suite_name, image=self._images["default"])
-
-    def _add_tests(self, suite_node, testcases):
-        for test in testcases:
-            wx.CallAfter(self._addTest, suite_node, test)
-
-    def _add_subsuites(self, suite_node, children, call_after):
-        number_of_children = len(children)
-        if number_of_children > 0:
-            delayed_call_after = self._call_when_called(number_of_children, call_after)
-            for child in children:
-                self._addSuite(suite_node, child, delayed_call_after)
-        else:
-            call_after()
-
-    def _call_when_called(self, times, call_after):
-        counter = range(times-1)
-        def callable():
-            if counter == []:
-                call_after()
-            else:
-                counter.pop()
-        return callable
-
-    def _addTest(self, parent_node, test):
-        item = self.AppendItem(parent_node, test.name, ct_type=1, image=self._images["default"])
-        fullname = test.longname
-        self.SetItemPyData(item, TreeNode(fullname, test))
-        self._nodes[self._convert_test_longname_key(fullname)] = item
-
 
 class TreeNode:
-    def __init__(self, longname, data):
+    def __init__(self, longname, data, parent=None, key=None):
         self.longname= longname
         self.data = data.data
+        self.parent = parent
+        self.key = key
+        self.children = []
+        self.rendered = False
 
     @property
     def name(self):
         return self.data.name
 
+    @property
+    def is_test(self):
+        return isinstance(self.data, TestCase)
+
 GreenBullet = PyEmbeddedImage(
     "iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAAABHNCSVQICAgIfAhkiAAAAM1J"
     "REFUOI3tkr0OAVEQRr8VEQkJ1RLRivAKKg+xhYjWa/AcW1Ao9xGUSiIRCpFIVCob4u/ae3fu"
@@ -0,0 +1,112 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+import tempfile
+from collections import deque
+
+
+class OutputBuffer(object):
+    """Ring buffer of test execution output shown in the Run tab.
+
+    At most `max_lines` complete lines are kept. Older lines are written to
+    a temporary file in `spill_dir`, whose path is available as
+    `spill_path`. Output appended between two calls to `take_pending` is
+    coalesced, so that the console can be updated once per timer tick.
+    Report and log file paths are detected from the lines as they arrive.
+    """
+    _report = re.compile('^Report: {2}(.*\.html)$')
+    _log = re.compile('^Log: {5}(.*\.html)$')
+
+    def __init__(self, max_lines=10000, spill_dir=None):
+        self._max_lines = max_lines
+        self._spill_dir = spill_dir
+        self._spill = None
+        self.clear()
+
+    def clear(self):
+        self.close()
+        self._lines = deque()
+        self._partial = ''
+        self._pending = []
+        self._dropped = 0
+        self.report_file = None
+        self.log_file = None
+        self.spill_path = None
+
+    def append(self, text, source='stdout'):
+        if not text:
+            return
+        if self._pending and self._pending[-1][1] == source:
+            self._pending[-1] = (self._pending[-1][0] + text, source)
+        else:
+            self._pending.append((text, source))
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._add_line(line + '\n')
+
+    def _add_line(self, line):
+        self._lines.append(line)
+        self._detect_outputs(line.rstrip('\r\n'))
+        if len(self._lines) > self._max_lines:
+            self._write_to_spill(self._lines.popleft())
+            self._dropped += 1
+
+    def _detect_outputs(self, line):
+        if not self.report_file:
+            self.report_file = self._match(self._report, line)
+        if not self.log_file:
+            self.log_file = self._match(self._log, line)
+
+    def _match(self, regexp, line):
+        match = regexp.match(line)
+        return match.group(1) if match else None
+
+    def _write_to_spill(self, line):
+        if not self._spill:
+            self._spill = self._open_spill()
+        self._spill.write(line if isinstance(line, str)
+                          else line.encode('UTF-8'))
+
+    def _open_spill(self):
+        if self.spill_path:
+            return open(self.spill_path, 'ab')
+        spill = tempfile.NamedTemporaryFile(prefix='output', suffix='.txt',
+                                            dir=self._spill_dir, delete=False)
+        self.spill_path = spill.name
+        return spill
+
+    def close(self):
+        """Closes the spill file. It is reopened if more lines are spilled."""
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    def take_pending(self):
+        """Returns output appended since the previous call.
+
+        Returns a tuple of the number of lines that should be removed from
+        the beginning of the console and a list of `(text, source)` chunks
+        that should be appended to it.
+        """
+        dropped, pending = self._dropped, self._pending
+        self._dropped, self._pending = 0, []
+        return dropped, pending
+
+    @property
+    def last_char(self):
+        if self._partial:
+            return self._partial[-1]
+        return '\n' if self._lines else ''
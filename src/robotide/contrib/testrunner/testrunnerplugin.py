@@ -41,17 +41,10 @@ import atexit
 import shutil
 import signal
 import posixpath
-import re
 import codecs
 from posixpath import curdir, sep, pardir, join
 from robotide.publish.messages import RideDataFileSet, RideDataFileRemoved, RideFileNameChanged
 
-
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle as pickle
-
 import wx
 import wx.stc
 from wx.lib.embeddedimage import PyEmbeddedImage
@@ -62,6 +55,8 @@ from robotide.publish import (RideTestCaseAdded, RideOpenSuite, RideSuiteAdded,
                               RideItemNameChanged, RideTestCaseRemoved)
 from robotide.contrib.testrunner.TestSuiteTreeCtrl import TestSuiteTreeCtrl
 from robotide.contrib.testrunner import runprofiles
+from robotide.contrib.testrunner.SocketListener import read_frames, STREAM
+from robotide.contrib.testrunner.outputbuffer import OutputBuffer
 from robotide.widgets import Label
 
 
@@ -83,9 +78,8 @@ class TestRunnerPlugin(Plugin):
     defaults = {"auto_save": False,
                 "profile": "pybot",
                 "sash_position": 200,
+                "output_max_lines": 10000,
                 "runprofiles": [('jybot', 'jybot' + ('.bat' if os.name == 'nt' else ''))]}
-    report_regex = re.compile("^Report: {2}(.*\.html)$", re.MULTILINE)
-    log_regex = re.compile("^Log: {5}(.*\.html)$", re.MULTILINE)
 
     def __init__(self, application=None):
         Plugin.__init__(self, application, initially_enabled=True,
@@ -100,6 +94,8 @@ class TestRunnerPlugin(Plugin):
         self._tmpdir = None
         self._report_file = None
         self._log_file = None
+        self._output_buffer = None
+        self._output_flush_scheduled = False
         self.profiles = {}
         self._controls = {}
         self._server = None
@@ -110,12 +106,13 @@ class TestRunnerPlugin(Plugin):
     def enable(self):
         self._read_run_profiles()
         self._register_actions()
+        self._create_temporary_directory()
+        self._output_buffer = OutputBuffer(self.output_max_lines, self._tmpdir)
         self._build_ui()
         self.SetProfile(self.profile)
         self._subscribe_to_events()
         self._start_listener_server()
         self._load_tree_if_data_is_open()
-        self._create_temporary_directory()
         self._set_stopped()
 
     def _register_actions(self):
@@ -157,7 +154,7 @@ class TestRunnerPlugin(Plugin):
 
     def _start_listener_server(self):
         self._server = RideListenerServer(RideListenerHandler,
-                                          self._post_result)
+                                          self._post_results)
         self._server_thread = threading.Thread(target=self._server.serve_forever)
         self._server_thread.setDaemon(True)
         self._server_thread.start()
@@ -289,6 +286,7 @@ class TestRunnerPlugin(Plugin):
         self._report_file = self._log_file = None
 
     def _clear_output_window(self):
+        self._output_buffer.clear()
         self.out.SetReadOnly(False)
         self.out.ClearAll()
         self.out.SetReadOnly(True)
@@ -358,24 +356,23 @@ class TestRunnerPlugin(Plugin):
 
         now = datetime.datetime.now()
         self._output("\ntest finished %s" % now.strftime("%c"))
+        self._output_buffer.close()
         self._set_stopped()
         self._process.Destroy()
         self._process = None
 
     def _read_report_and_log_from_stdout_if_needed(self):
-        output = self.out.GetText()
         if not self._report_file:
-            self._report_file = self._get_report_or_log(output, self.report_regex)
+            self._report_file = self._existing(self._output_buffer.report_file)
             if self._report_file:
                 self.local_toolbar.EnableTool(ID_SHOW_REPORT, True)
         if not self._log_file:
-            self._log_file = self._get_report_or_log(output, self.log_regex)
+            self._log_file = self._existing(self._output_buffer.log_file)
             if self._log_file:
                 self.local_toolbar.EnableTool(ID_SHOW_LOG, True)
 
-    def _get_report_or_log(self, output, regex):
-        res = regex.search(output)
-        return res.group(1) if res and os.path.isfile(res.group(1)) else None
+    def _existing(self, path):
+        return path if path and os.path.isfile(path) else None
 
     def OnTimer(self, evt):
         '''Get process output'''
@@ -403,10 +400,8 @@ class TestRunnerPlugin(Plugin):
                 self._output(text_buffer, source="stderr")
 
     def GetLastOutputChar(self):
-        '''Return the last character in the output window'''
-        pos = self.out.PositionBefore(self.out.GetLength())
-        char = self.out.GetCharAt(pos)
-        return chr(char)
+        '''Return the last character in the output'''
+        return self._output_buffer.last_char
 
     def _reload_model(self):
         '''Redraw the tree when the model changes'''
@@ -442,10 +437,26 @@ class TestRunnerPlugin(Plugin):
             self._reload_model()
         self.show_tab(self.panel)
 
-    def _AppendText(self, string, source="stdout"):
+    def _flush_output(self):
+        '''Apply output appended since the previous flush to the console'''
+        self._output_flush_scheduled = False
+        dropped, chunks = self._output_buffer.take_pending()
         if not self.panel:
             return
+        for string, source in chunks:
+            self._AppendText(string, source)
+        if dropped:
+            self._RemoveLines(dropped)
+
+    def _RemoveLines(self, count):
+        count = min(count, self.out.GetLineCount() - 1)
+        self.out.SetReadOnly(False)
+        self.out.SetTargetStart(0)
+        self.out.SetTargetEnd(self.out.PositionFromLine(count))
+        self.out.ReplaceTarget('')
+        self.out.SetReadOnly(True)
 
+    def _AppendText(self, string, source="stdout"):
         try:
             width, _ = self.out.GetTextExtent(string)
             if self.out.GetScrollWidth() < width+50:
@@ -507,7 +518,7 @@ class TestRunnerPlugin(Plugin):
 
     def _get_listener_to_cmd(self):
         return os.path.join(os.path.dirname(__file__),
-                            "SocketListener.py") + ":%s" % self._port
+                            "SocketListener.py") + ":%s:%s" % (self._port, STREAM)
 
     def _get_monitor_width(self):
         # robot wants to know a fixed size for output, so calculate the
@@ -552,8 +563,15 @@ class TestRunnerPlugin(Plugin):
         return panel
 
     def _output(self, string, source="stdout"):
-        '''Put output to the text control'''
-        self._AppendText(string, source)
+        '''Put output to the text control
+
+        Output is buffered and applied to the text control once per
+        event loop iteration.
+        '''
+        self._output_buffer.append(string, source)
+        if not self._output_flush_scheduled:
+            self._output_flush_scheduled = True
+            wx.CallAfter(self._flush_output)
 
     def _build_local_toolbar(self):
         toolbar = wx.ToolBar(self.panel, wx.ID_ANY, style=wx.TB_HORIZONTAL|wx.TB_HORZ_TEXT)
@@ -779,6 +797,11 @@ class TestRunnerPlugin(Plugin):
     def _set_splitter_size(self, size):
         self.splitter.SetSashPosition(size)
 
+    def _post_results(self, events):
+        '''Endpoint of the listener interface receiving a batch of events'''
+        for event, args in events:
+            self._post_result(event, *args)
+
     def _post_result(self, event, *args):
         '''Endpoint of the listener interface
 
@@ -926,14 +949,12 @@ class RideListenerServer(SocketServer.TCPServer):
 
 class RideListenerHandler(SocketServer.StreamRequestHandler):
     def handle(self):
-        unpickler = pickle.Unpickler(self.request.makefile('r'))
-        while True:
-            try:
-                (name, args) = unpickler.load()
-                wx.CallAfter(self.server.callback, name, *args)
-            except (EOFError, IOError):
-                # I should log this...
-                break
+        try:
+            for events in read_frames(self.rfile):
+                wx.CallAfter(self.server.callback, events)
+        except (ValueError, IOError):
+            # I should log this...
+            pass
 
 # stole this off the internet. Nifty.
 def secondsToString(t):
@@ -72,10 +72,10 @@ class WithNamespace(object):
     def _set_namespace(self, namespace):
         self._namespace = namespace
 
-    def update_namespace(self):
+    def update_namespace(self, datafile=None):
         if not self._namespace:
             return
-        self._namespace.update()
+        self._namespace.update(datafile)
 
     def register_for_namespace_updates(self, listener):
         if not self._namespace:
@@ -14,12 +14,21 @@
 from __future__ import with_statement
 
 import os
-import shutil
-import tempfile
-
+import time
+import threading
+from Queue import Queue, Empty
+from StringIO import StringIO
+try:
+    from multiprocessing import cpu_count
+except ImportError:
+    cpu_count = lambda: 1
+
+from robotide import utils
 from robotide.context import LOG, SETTINGS
+from robotide.utils.filewatcher import FILE_WATCHER
 from robotide.publish.messages import RideOpenResource, RideSaving, RideSaveAll, \
-    RideSaved, RideOpenSuite, RideNewProject, RideFileNameChanged
+    RideSaved, RideOpenSuite, RideNewProject, RideFileNameChanged, \
+    RideLogMessage
 
 from .basecontroller import WithNamespace, _BaseController
 from .dataloader import DataLoader
@@ -78,6 +87,7 @@ class ChiefController(_BaseController, WithNamespace):
         self._new_project(NewTestCaseFile(path))
 
     def _new_project(self, datafile):
+        FILE_WATCHER.clear()
         self.update_default_dir(datafile.directory)
         self._controller = DataController(datafile, self)
         self._resource_file_controller_factory = ResourceFileControllerFactory(self._namespace)
@@ -86,7 +96,9 @@ class ChiefController(_BaseController, WithNamespace):
     def new_resource(self, path, parent=None):
         res = self._namespace.new_resource(path)
         self.update_default_dir(path)
-        return self._create_resource_controller(res, parent)
+        controller = self._create_resource_controller(res, parent)
+        self.update_namespace()
+        return controller
 
     def load_data(self, path, load_observer):
         if self._load_initfile(path, load_observer):
@@ -122,11 +134,20 @@ class ChiefController(_BaseController, WithNamespace):
 
     def _populate_from_datafile(self, path, datafile, load_observer):
         self.__init__(self._namespace)
+        FILE_WATCHER.clear()
         resources = self._loader.resources_for(datafile, load_observer)
+        self._loader.libraries_for(self._iter_datafiles(datafile) + resources,
+                                   load_observer)
         self._create_controllers(datafile, resources)
         RideOpenSuite(path=path, datafile=self._controller).publish()
         load_observer.finish()
 
+    def _iter_datafiles(self, datafile):
+        datafiles = [datafile]
+        for child in datafile.children:
+            datafiles.extend(self._iter_datafiles(child))
+        return datafiles
+
     def _create_controllers(self, datafile, resources):
         self.clear_namespace_update_listeners()
         self._controller = DataController(datafile, self)
@@ -217,6 +238,7 @@ class ChiefController(_BaseController, WithNamespace):
                                 datafile=controller).publish()
 
     def _remove_file(self, path):
+        FILE_WATCHER.unwatch(path)
         if path and os.path.isfile(path):
             os.remove(path)
 
@@ -254,36 +276,59 @@ class ChiefController(_BaseController, WithNamespace):
 
 
 class Serializer(object):
-
-    def __init__(self, settings, logger):
+    """Saves data files.
+
+    Files are rendered to memory and written in worker threads. Each file is
+    replaced atomically by writing a temporary file next to it and renaming
+    it over the original, and files whose content would not change are not
+    written at all. `RideSaved` and a log message with timings are published
+    for every saved file in the calling thread. If saving any file fails,
+    the errors are logged and the first one is raised after all files have
+    been handled.
+    """
+
+    def __init__(self, settings, logger, workers=None):
         self._settings = settings
         self._logger = logger
+        self._workers = workers or cpu_count()
         self._errors = []
+        self.results = []
 
     def serialize_files(self, controllers):
         try:
-            for data in controllers:
-                self._serialize_file(data)
+            self._serialize(controllers)
             RideSaveAll().publish()
         finally:
             self._log_errors()
 
     def serialize_file(self, controller):
         try:
-            self._serialize_file(controller)
+            self._serialize([controller])
         finally:
             self._log_errors()
 
-    def _serialize_file(self, controller):
-        RideSaving(path=controller.filename, datafile=controller).publish()
-        with Backup(controller):
-            try:
-                controller.datafile.save(**self._get_options())
-            except Exception, err:
-                self._cache_error(controller, err)
-                raise
-        controller.unmark_dirty()
-        RideSaved(path=controller.filename).publish()
+    def _serialize(self, controllers):
+        for controller in controllers:
+            RideSaving(path=controller.filename, datafile=controller).publish()
+        options = self._get_options()
+        jobs = [_SaveJob(controller, options) for controller in controllers]
+        self.results = []
+        failed = None
+        for index, job in enumerate(_run_in_threads(jobs, self._workers)):
+            self._finish(job, index + 1, len(jobs))
+            if job.error and not failed:
+                failed = job
+        if failed:
+            raise failed.error
+
+    def _finish(self, job, done, total):
+        if job.error:
+            self._cache_error(job.controller, job.error)
+            return
+        job.controller.unmark_dirty()
+        self.results.append(job)
+        RideSaved(path=job.path).publish()
+        RideLogMessage('%s (%d/%d)' % (job, done, total)).publish()
 
     def _get_options(self):
         return {'line_separator': self._resolve_line_separator(),
@@ -310,49 +355,76 @@ class Serializer(object):
             self._errors = []
 
 
-class Backup(object):
-
-    def __init__(self, file_controller):
-        self._path = file_controller.filename
-        self._file_controller = file_controller
-        self._backup = self._get_backup_name(self._path)
+def _run_in_threads(jobs, workers):
+    """Runs the jobs in at most `workers` threads and yields them when done.
 
-    def _get_backup_name(self, path):
-        if not os.path.isfile(path):
-            return None
-        self._backup_dir = tempfile.mkdtemp(dir=os.path.dirname(path))
-        return os.path.join(self._backup_dir, os.path.basename(path))
-
-    def __enter__(self):
-        self._make_backup()
+    Jobs are yielded in the calling thread in the order they finish.
+    """
+    if len(jobs) < 2 or workers < 2:
+        for job in jobs:
+            job.run()
+            yield job
+        return
+    pending, done = Queue(), Queue()
+    for job in jobs:
+        pending.put(job)
 
-    def _make_backup(self):
-        if self._backup:
+    def work():
+        while True:
             try:
-                self._move(self._path, self._backup)
-            except IOError:
-                self._backup = None
-                self._remove_backup_dir()
-
-    def __exit__(self, *args):
-        if any(args):
-            self._restore_backup()
-        else:
-            self._remove_backup()
-
-    def _remove_backup(self):
-        if self._backup:
-            os.remove(self._backup)
-            self._remove_backup_dir()
-
-    def _restore_backup(self):
-        if self._backup:
-            self._move(self._backup, self._path)
-            self._file_controller.refresh_stat()
-            self._remove_backup_dir()
+                job = pending.get_nowait()
+            except Empty:
+                return
+            job.run()
+            done.put(job)
+
+    for _ in range(min(workers, len(jobs))):
+        thread = threading.Thread(target=work)
+        thread.setDaemon(True)
+        thread.start()
+    for _ in jobs:
+        yield done.get()
+
+
+class _SaveJob(object):
+    """Renders one data file to memory and replaces the file on disk."""
+
+    def __init__(self, controller, options):
+        self.controller = controller
+        self.path = controller.filename
+        self._options = options
+        self.skipped = False
+        self.error = None
+        self.render_time = self.write_time = 0.0
+
+    def run(self):
+        try:
+            start = time.time()
+            content = self._render()
+            self.render_time = time.time() - start
+            start = time.time()
+            self.skipped = content == self._read_current()
+            if not self.skipped:
+                utils.replace_file(self.path, content)
+            self.write_time = time.time() - start
+        except Exception, err:
+            self.error = err
+
+    def _render(self):
+        output = StringIO()
+        self.controller.datafile.save(output=output, **self._options)
+        return output.getvalue()
+
+    def _read_current(self):
+        if not os.path.isfile(self.path):
+            return None
+        with open(self.path, 'rb') as current:
+            return current.read()
 
-    def _move(self, from_path, to_path):
-        shutil.move(from_path, to_path)
+    def __str__(self):
+        if self.skipped:
+            return "Unchanged '%s' not written, rendered in %d ms" \
+                    % (self.path, self.render_time * 1000)
+        return "Saved '%s', rendered in %d ms and written in %d ms" \
+                % (self.path, self.render_time * 1000, self.write_time * 1000)
 
-    def _remove_backup_dir(self):
-        os.rmdir(self._backup_dir)
@@ -229,6 +229,19 @@ class SetDataFile(_Command):
     def execute(self, context):
         context.mark_dirty()
         context.set_datafile(self._datafile)
+        context.update_namespace()
+
+
+class SetDataFileTables(_Command):
+
+    def __init__(self, datafile, tables):
+        self._datafile = datafile
+        self._tables = tables
+
+    def execute(self, context):
+        context.mark_dirty()
+        context.set_tables_from(self._datafile, self._tables)
+        context.update_namespace()
 
 
 class _StepsChangingCommand(_ReversibleCommand):
@@ -256,7 +269,7 @@ class NonExistingStep(object):
 
 
 class NullObserver(object):
-    notify = finish = lambda x:None
+    notify = finish = lambda x, *args: None
 
 
 class RenameKeywordOccurrences(_ReversibleCommand):
@@ -501,6 +514,8 @@ class FindOccurrences(_Command):
             raise ValueError('Keyword name can not be "%s"' % keyword_name)
         self._keyword_name = keyword_name
         self._keyword_info = keyword_info
+        self._is_variable_search = \
+                len(utils.find_variable_basenames(keyword_name)) > 0
 
     def execute(self, context):
         self._keyword_source = self._keyword_info and self._keyword_info.source or \
@@ -510,7 +525,8 @@ class FindOccurrences(_Command):
     def _items_from(self, context):
         for df in context.datafiles:
             self._yield_for_other_threads()
-            if self._items_from_datafile_should_be_checked(df):
+            if self._datafile_may_contain_item(df) and \
+               self._items_from_datafile_should_be_checked(df):
                 for item in self._items_from_datafile(df):
                     yield item
 
@@ -520,15 +536,31 @@ class FindOccurrences(_Command):
             return True
         return self._find_keyword_source(datafile) == self._keyword_source
 
+    def _datafile_may_contain_item(self, df):
+        containers = self._find_containers(df)
+        return containers is None or bool(containers)
+
+    def _find_containers(self, df):
+        """Returns data of the datafile, tests and keywords possibly
+        containing the item, or None if all of them may contain it."""
+        if self._is_variable_search:
+            return df.symbols.find_variable(self._keyword_name)
+        return df.symbols.find_keyword(self._keyword_name)
+
     def _items_from_datafile(self, df):
-        for setting in df.settings:
-            yield setting
-        for items_from_test in (self._items_from_test(test) for test in df.tests):
-            for item in items_from_test:
-                yield item
-        for items_from_keyword in (self._items_from_keyword(kw) for kw in df.keywords):
-            for item in items_from_keyword:
-                yield item
+        containers = self._find_containers(df)
+        may_contain = lambda data: containers is None or data in containers
+        if may_contain(df.data):
+            for setting in df.settings:
+                yield setting
+        for test in df.tests:
+            if may_contain(test.data):
+                for item in self._items_from_test(test):
+                    yield item
+        for kw in df.keywords:
+            if may_contain(kw.data):
+                for item in self._items_from_keyword(kw):
+                    yield item
 
     def _items_from_keyword(self, kw):
         return chain([kw.keyword_name] if kw.source == self._keyword_source else [],
@@ -546,19 +578,10 @@ class FindOccurrences(_Command):
             if self._contains_item(item))
 
     def _contains_item(self, item):
-        if len(utils.find_variable_basenames(self._keyword_name)) > 0:
-            return self._contains_variable(item)
-        else:
-            return self._contains_keyword(item)
-
-    def _contains_keyword(self, item):
-        self._yield_for_other_threads()
+        if self._is_variable_search:
+            return item.contains_variable(self._keyword_name)
         return item.contains_keyword(self._keyword_name)
 
-    def _contains_variable(self, item):
-        self._yield_for_other_threads()
-        return item.contains_variable(self._keyword_name)
-
     def _yield_for_other_threads(self):
         # GIL !?#!!!
         # THIS IS TO ENSURE THAT OTHER THREADS WILL GET SOME SPACE ALSO
@@ -570,7 +593,9 @@ class FindVariableOccurrences(FindOccurrences):
     def _items_from_datafile(self, df):
         for itm in FindOccurrences._items_from_datafile(self, df):
             yield itm
-        yield df.variables
+        containers = self._find_containers(df)
+        if containers is None or df.data in containers:
+            yield df.variables
 
     def _items_from_controller(self, ctrl):
         if isinstance(ctrl, TestCaseController):
@@ -590,7 +615,8 @@ class FindVariableOccurrences(FindOccurrences):
         else:
             for df in context.datafiles:
                 self._yield_for_other_threads()
-                if self._items_from_datafile_should_be_checked(df):
+                if self._datafile_may_contain_item(df) and \
+                   self._items_from_datafile_should_be_checked(df):
                     for item in self._items_from_datafile(df):
                         yield item
 
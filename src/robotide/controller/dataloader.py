@@ -18,6 +18,8 @@ from threading import Thread
 from robot.parsing.model import TestData, TestDataDirectory
 from robot.parsing.populators import FromFilePopulator
 
+from suitereader import SUITE_READER
+
 
 class DataLoader(object):
 
@@ -36,6 +38,10 @@ class DataLoader(object):
         return self._load(_ResourceLoader(datafile, self._namespace.get_resources),
                           load_observer)
 
+    def libraries_for(self, datafiles, load_observer):
+        return self._load(_LibraryLoader(datafiles, self._namespace.load_libraries),
+                          load_observer)
+
     def _load(self, loader, load_observer):
         self._wait_until_loaded(loader, load_observer)
         return loader.result
@@ -45,7 +51,7 @@ class DataLoader(object):
         load_observer.notify()
         while loader.isAlive():
             loader.join(0.1)
-            load_observer.notify()
+            load_observer.notify(loader.progress)
 
 
 class _DataLoaderThread(Thread):
@@ -53,6 +59,7 @@ class _DataLoaderThread(Thread):
     def __init__(self):
         Thread.__init__(self)
         self.result = None
+        self.progress = None
 
     def run(self):
         try:
@@ -68,8 +75,13 @@ class _DataLoader(_DataLoaderThread):
         self._path = path
 
     def _run(self):
+        if os.path.isdir(self._path):
+            return SUITE_READER.read(self._path, self._report_progress)
         return TestData(source=self._path)
 
+    def _report_progress(self, read, total):
+        self.progress = 'Parsed %d of %d files' % (read, total)
+
 
 class _InitFileLoader(_DataLoaderThread):
 
@@ -93,3 +105,14 @@ class _ResourceLoader(_DataLoaderThread):
 
     def _run(self):
         return self._loader(self._datafile)
+
+
+class _LibraryLoader(_DataLoaderThread):
+
+    def __init__(self, datafiles, library_loader):
+        _DataLoaderThread.__init__(self)
+        self._datafiles = datafiles
+        self._loader = library_loader
+
+    def _run(self):
+        return self._loader(self._datafiles)
@@ -21,10 +21,12 @@ from robotide.publish import (RideDataFileRemoved, RideInitFileRemoved,
 from robotide.publish.messages import RideDataFileSet
 from robotide.robotapi import TestDataDirectory, TestCaseFile, ResourceFile
 from robotide import utils
+from robotide.utils.filewatcher import FILE_WATCHER, stat_of
 
 from .basecontroller import WithUndoRedoStacks, _BaseController, WithNamespace
 from .macrocontrollers import UserKeywordController
 from .robotdata import NewTestCaseFile, NewTestDataDirectory
+from .symbols import DatafileSymbols
 from .settingcontrollers import (DocumentationController, FixtureController,
         TimeoutController, TemplateController, DefaultTagsController,
         ForceTagsController)
@@ -44,15 +46,33 @@ class _FileSystemElement(object):
         self.filename = filename
         self.directory = directory
         self._stat = self._get_stat(filename)
+        FILE_WATCHER.watch(filename, self._stat)
+
+    def _get_filename(self):
+        return self._filepath
+
+    def _set_filename(self, filename):
+        old = getattr(self, '_filepath', None)
+        if old and old != filename:
+            FILE_WATCHER.unwatch(old)
+        self._filepath = filename
+
+    filename = property(_get_filename, _set_filename)
 
     def _get_stat(self, path):
-        if path and os.path.isfile(path):
-            stat = os.stat(path)
-            return stat.st_mtime, stat.st_size
-        return 0, 0
+        return stat_of(path)
 
     def refresh_stat(self):
         self._stat = self._get_stat(self.filename)
+        FILE_WATCHER.watch(self.filename, self._stat)
+
+    def may_have_changed_on_disk(self):
+        """Returns True if the file watcher has noticed a change to the file.
+
+        This does not access the file system. Use `has_been_modified_on_disk`
+        and `has_been_removed_from_disk` to check what has changed.
+        """
+        return FILE_WATCHER.is_changed(self.filename)
 
     def has_been_modified_on_disk(self):
         return self._get_stat(self.filename) != self._stat
@@ -98,8 +118,17 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         self._testcase_table_controller = None
         self._keywords_table_controller = None
         self._imports = None
+        self._symbols = None
         RideDataFileSet(item=self).publish()
 
+    def set_tables_from(self, datafile, tables):
+        """Replaces the named tables, like `keyword_table`, with `datafile`'s."""
+        for name in tables:
+            table = getattr(datafile, name)
+            table.parent = self.data
+            setattr(self.data, name, table)
+        self.set_datafile(self.data)
+
     def _children(self, data):
         return []
 
@@ -182,7 +211,17 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
     def keyword_info(self, keyword_name):
         return WithNamespace.keyword_info(self, self.data, keyword_name)
 
+    def update_namespace(self):
+        WithNamespace.update_namespace(self, self.datafile)
+
+    @property
+    def symbols(self):
+        if self._symbols is None:
+            self._symbols = DatafileSymbols(self.data)
+        return self._symbols
+
     def mark_dirty(self):
+        self._symbols = None
         if not self.dirty:
             self.dirty = True
             RideDataChangedToDirty(datafile=self).publish()
@@ -251,7 +290,9 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
             self.remove_from_filesystem(old_file)
 
     def remove_from_filesystem(self, path=None):
-        os.remove(path or self.filename)
+        path = path or self.filename
+        FILE_WATCHER.unwatch(path)
+        os.remove(path)
 
     def save_with_new_format(self, format):
         self._chief_controller.change_format(self, format)
@@ -297,6 +338,7 @@ class DirectoryController(_FileSystemElement, _BaseController):
         _FileSystemElement.__init__(self, path, path)
         self.directory = path
         self.settings = self.tests = self.keywords = ()
+        self.symbols = DatafileSymbols(())
         self._chief_controller = chief_controller
         self.children = []
         self.data = None
@@ -441,6 +483,7 @@ class TestDataDirectoryController(_DataController, DirectoryController):
     def reload(self):
         self.__init__(TestDataDirectory(source=self.directory).populate(),
                       self._chief_controller)
+        self.update_namespace()
 
     def remove(self):
         path = self.filename
@@ -511,11 +554,13 @@ class TestCaseFileController(_FileSystemElement, _DataController):
 
     def remove(self):
         self._chief_controller.remove_datafile(self)
+        FILE_WATCHER.unwatch(self.filename)
         RideDataFileRemoved(path=self.filename, datafile=self).publish()
 
     def reload(self):
         self.__init__(TestCaseFile(source=self.filename).populate(),
                       self._chief_controller)
+        self.update_namespace()
 
     def get_template(self):
         return self.data.setting_table.test_template
@@ -623,9 +668,11 @@ class ResourceFileController(_FileSystemElement, _DataController):
     def reload(self):
         self.__init__(ResourceFile(source=self.filename).populate(),
                       self._chief_controller)
+        self.update_namespace()
 
     def remove(self):
         self._chief_controller.remove_resource(self)
+        FILE_WATCHER.unwatch(self.filename)
         RideDataFileRemoved(path=self.filename, datafile=self).publish()
 
     def get_where_used(self):
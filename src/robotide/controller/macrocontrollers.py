@@ -24,7 +24,7 @@ from robotide.controller.settingcontrollers import (DocumentationController,
         TemplateController, ArgumentsController, ReturnValueController)
 from robotide.controller.arguments import parse_arguments_to_var_dict
 from robotide.controller.basecontroller import WithUndoRedoStacks
-from robotide.namespace.local_namespace import LocalNamespace
+from robotide.namespace.local_namespace import LocalNamespace, LocalAssignments
 from robotide.publish.messages import RideItemStepsChanged, RideItemNameChanged,\
     RideItemSettingsChanged
 from robotide.controller.stepcontrollers import ForLoopStepController,\
@@ -83,6 +83,7 @@ class _WithStepsController(ControllerWithParent, WithUndoRedoStacks):
         self._init(data)
         self._has_steps_changed = True
         self._steps_cached = None
+        self._local_assignments = None
         self.datafile_controller.register_for_namespace_updates(self._clear_cached_steps)
 
     @property
@@ -113,11 +114,20 @@ class _WithStepsController(ControllerWithParent, WithUndoRedoStacks):
             else:
                 flattened_steps.append(StepController(self, step))
         self._steps_cached = flattened_steps
+        self._local_assignments = None
         self._has_steps_changed = False
 
     def _clear_cached_steps(self):
         self._has_steps_changed = True
         self._steps_cached = None
+        self._local_assignments = None
+
+    @property
+    def local_assignments(self):
+        steps = self.steps
+        if self._local_assignments is None:
+            self._local_assignments = LocalAssignments(steps)
+        return self._local_assignments
 
     @property
     def max_columns(self):
@@ -403,6 +403,7 @@ class VariableController(_SettingController):
         self._parent.remove_var(self)
 
     def notify_value_changed(self):
+        self._parent.datafile_controller.update_namespace()
         RideVariableUpdated(item=self).publish()
 
     def validate_name(self, new_name):
@@ -87,24 +87,20 @@ class StepController(_BaseController):
         info = self.get_keyword_info(self._step.keyword)
         if not info:
             return CellPosition(CellType.UNKNOWN, None)
-        args = info.arguments
-        args_amount = len(args)
-        if args_amount == 0:
+        signature = info.signature
+        args = signature.arguments
+        if not args:
             return CellPosition(CellType.MUST_BE_EMPTY, None)
-        if col >= args_amount and self._last_argument_is_varargs(args):
+        if col >= len(args) and signature.varargs:
             return CellPosition(CellType.OPTIONAL, args[-1])
         if self._has_list_var_value_before(col-1):
             return CellPosition(CellType.UNKNOWN, None)
-        if col > args_amount:
+        if col > len(args):
             return CellPosition(CellType.MUST_BE_EMPTY, None)
-        defaults = [arg for arg in args if '=' in arg]
-        if col <= args_amount-len(defaults):
+        if col <= signature.mandatory:
             return CellPosition(CellType.MANDATORY, args[col-1])
         return CellPosition(CellType.OPTIONAL, args[col-1])
 
-    def _last_argument_is_varargs(self, args):
-        return args[-1].startswith('*')
-
     def _has_list_var_value_before(self, arg_index):
         for idx, value in enumerate(self.args):
             if idx > arg_index:
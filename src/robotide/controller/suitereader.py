@@ -0,0 +1,263 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Reads the files of a directory suite in parallel worker processes.
+
+Workers, running this module as a script, read and split the files into
+table rows and send the rows back. The `TestDataDirectory` tree is then
+populated from the rows in the calling process exactly like `TestData` would
+populate it from the files.
+
+This module must not import anything from `robotide`, because it is executed
+as a standalone script by the workers. Workers need the json module, so with
+Python 2.5 all files are read in the calling process.
+"""
+
+import os
+import sys
+import threading
+import subprocess
+from Queue import Queue, Empty
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        json = None
+try:
+    from multiprocessing import cpu_count
+except ImportError:
+    cpu_count = lambda: 1
+
+from robot import utils
+from robot.errors import DataError
+from robot.output import LOGGER
+from robot.model import SuiteNamePatterns
+from robot.parsing.model import TestDataDirectory, TestCaseFile
+from robot.parsing.populators import (FromFilePopulator,
+                                      FromDirectoryPopulator, READERS)
+
+
+def read_rows(path):
+    """Returns the rows of a data file as a list of (is_header, cells)."""
+    extension = os.path.splitext(path.lower())[-1][1:]
+    recorder = _RowRecorder()
+    source = open(path, 'rb')
+    try:
+        READERS[extension]().read(source, recorder)
+    finally:
+        source.close()
+    return recorder.rows
+
+
+class _RowRecorder(object):
+
+    def __init__(self):
+        self.rows = []
+
+    def start_table(self, header):
+        self.rows.append((True, header))
+        return True
+
+    def add(self, row):
+        self.rows.append((False, row))
+
+    def eof(self):
+        pass
+
+
+class _RowPopulator(FromFilePopulator):
+
+    def __init__(self, datafile, rows):
+        FromFilePopulator.__init__(self, datafile)
+        self._rows = rows
+
+    def populate(self, path):
+        LOGGER.info("Parsing file '%s'." % path)
+        try:
+            for is_header, cells in self._rows:
+                if is_header:
+                    self.start_table(cells)
+                else:
+                    self.add(cells)
+            self.eof()
+        except:
+            raise DataError(utils.get_error_message())
+
+
+class SuiteReader(object):
+    """Reads directory suites using a pool of worker processes.
+
+    Directories with fewer than `min_files` data files, and files that the
+    workers fail to read, are read in the calling process. If no worker
+    replies in `timeout` seconds, all workers are stopped and the files not
+    yet read are read in the calling process. `progress` given to `read` is
+    called with the number of files read and the total number of files.
+    """
+
+    def __init__(self, workers=4, min_files=20, timeout=30):
+        self._workers = workers
+        self._min_files = min_files
+        self._timeout = timeout
+
+    def read(self, path, progress=None):
+        paths = list(self._data_files(path))
+        rows = {}
+        if json and len(paths) >= self._min_files:
+            rows = self._read_in_workers(paths, progress or (lambda *a: None))
+        return self._directory(None, path, rows)
+
+    def _data_files(self, path):
+        init_file, children = self._children(path)
+        if init_file:
+            yield init_file
+        for child in children:
+            if os.path.isdir(child):
+                for path in self._data_files(child):
+                    yield path
+            else:
+                yield child
+
+    def _children(self, path):
+        return FromDirectoryPopulator()._get_children(path,
+                                                      SuiteNamePatterns())
+
+    def _read_in_workers(self, paths, progress):
+        replies = Queue()
+        workers = [_Worker(paths[index::self._workers], replies)
+                   for index in range(self._workers)]
+        workers = [w for w in workers if w.start()]
+        rows = {}
+        running = len(workers)
+        while running:
+            try:
+                reply = replies.get(timeout=self._timeout)
+            except Empty:
+                for worker in workers:
+                    worker.stop()
+                break
+            if reply is None:
+                running -= 1
+            elif 'rows' in reply:
+                rows[reply['path']] = reply['rows']
+                progress(len(rows), len(paths))
+        return rows
+
+    def _directory(self, parent, path, rows):
+        LOGGER.info("Parsing test data directory '%s'" % path)
+        datadir = TestDataDirectory(parent, path)
+        init_file, children = self._children(path)
+        if init_file:
+            datadir.initfile = init_file
+            try:
+                self._populate(datadir, init_file, rows)
+            except DataError, err:
+                LOGGER.error(unicode(err))
+        for child in children:
+            try:
+                datadir.children.append(self._child(datadir, child, rows))
+            except DataError, err:
+                LOGGER.info("Parsing data source '%s' failed: %s"
+                            % (child, unicode(err)))
+        datadir.children = [ch for ch in datadir.children if ch.has_tests()]
+        return datadir
+
+    def _child(self, parent, path, rows):
+        if os.path.isdir(path):
+            return self._directory(parent, path, rows)
+        datafile = TestCaseFile(parent, path)
+        self._populate(datafile, path, rows)
+        datafile._validate()
+        return datafile
+
+    def _populate(self, datafile, path, rows):
+        if path in rows:
+            _RowPopulator(datafile, rows[path]).populate(path)
+        else:
+            FromFilePopulator(datafile).populate(path)
+
+
+class _Worker(object):
+    _script = os.path.splitext(os.path.abspath(__file__))[0] + '.py'
+
+    def __init__(self, paths, replies):
+        self._paths = paths
+        self._replies = replies
+
+    def start(self):
+        if getattr(sys, 'frozen', False) or not self._paths:
+            return False
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        self._devnull = open(os.devnull, 'w')
+        try:
+            self._process = subprocess.Popen([sys.executable, self._script],
+                                             stdin=subprocess.PIPE,
+                                             stdout=subprocess.PIPE,
+                                             stderr=self._devnull,
+                                             env=env, **self._hide_console())
+            self._process.stdin.write(json.dumps(self._paths) + '\n')
+            self._process.stdin.close()
+        except (OSError, IOError):
+            self._devnull.close()
+            return False
+        reader = threading.Thread(target=self._read_replies)
+        reader.setDaemon(True)
+        reader.start()
+        return True
+
+    def _hide_console(self):
+        if os.sep != '\\':
+            return {}
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        return {'startupinfo': startupinfo}
+
+    def _read_replies(self):
+        try:
+            for line in iter(self._process.stdout.readline, ''):
+                self._replies.put(json.loads(line))
+        except ValueError:
+            pass
+        finally:
+            self._process.wait()
+            self._devnull.close()
+            self._replies.put(None)
+
+    def stop(self):
+        if self._process.poll() is None:
+            try:
+                self._process.kill()
+            except (AttributeError, OSError):
+                pass
+
+
+def _serve(requests, replies):
+    for path in json.loads(requests.readline() or '[]'):
+        try:
+            reply = {'path': path, 'rows': read_rows(path)}
+        except Exception:
+            reply = {'path': path, 'error': utils.get_error_message()}
+        replies.write(json.dumps(reply) + '\n')
+        replies.flush()
+
+
+SUITE_READER = SuiteReader(workers=cpu_count())
+"""Global `SuiteReader` instance used by `DataLoader`."""
+
+
+if __name__ == '__main__':
+    LOGGER.disable_automatic_console_logger()
+    replies, sys.stdout = sys.stdout, sys.stderr
+    _serve(sys.stdin, replies)
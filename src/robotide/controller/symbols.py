@@ -0,0 +1,83 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+
+from robotide import utils
+
+
+class DatafileSymbols(object):
+    """Inverted index of keyword and variable names used in one datafile.
+
+    Names are mapped to the tests and keywords using them. Names used in the
+    setting or variable table are mapped to the datafile itself. All these
+    are model objects, not controllers.
+
+    The index may return more items than actually match a name, so callers
+    must still check the items with `contains_keyword` or
+    `contains_variable`. It never misses an item that matches.
+    """
+    _given_when_then = re.compile(r'^(given|when|then|and)\s*', re.I)
+    _variable = re.compile(r'[$@]\{[^{}]*\}')
+    _indexable_variable = re.compile(r'^[$@]\{[^{}|*?]*\}$')
+
+    def __init__(self, data):
+        self._keywords = {}
+        self._variables = {}
+        for table in data:
+            if table.type in ('test case', 'keyword'):
+                for macro in table:
+                    self._add(macro, self._cells_of_macro(macro))
+            else:
+                self._add(data, self._cells_of_table(table))
+
+    def _cells_of_macro(self, macro):
+        yield macro.name
+        for element in macro:
+            for cell in element.as_list():
+                yield cell
+            if element.is_for_loop():
+                for step in element:
+                    for cell in step.as_list():
+                        yield cell
+
+    def _cells_of_table(self, table):
+        for item in table:
+            for cell in item.as_list():
+                yield cell
+
+    def _add(self, container, cells):
+        for cell in cells:
+            normalized = utils.normalize(cell or '')
+            self._keywords.setdefault(normalized, set()).add(container)
+            if self._given_when_then.match(cell or ''):
+                stripped = utils.normalize(self._given_when_then.sub('', cell))
+                self._keywords.setdefault(stripped, set()).add(container)
+            for variable in self._variable.findall(normalized):
+                self._variables.setdefault(variable, set()).add(container)
+
+    def find_keyword(self, name):
+        """Returns the tests, keywords and datafile possibly using keyword."""
+        return self._keywords.get(utils.normalize(name), set())
+
+    def find_variable(self, name):
+        """Returns the tests, keywords and datafile possibly using variable.
+
+        Returns None if `name` cannot be searched from the index, in which
+        case all items must be checked.
+        """
+        normalized = utils.normalize(name)
+        if not self._indexable_variable.match(normalized):
+            return None
+        return self._variables.get(normalized, set())
@@ -84,12 +84,14 @@ class VariableTableController(_TableController, _WithListOperations):
         ctrl = self[index]
         _WithListOperations.move_up(self, index)
         self.mark_dirty()
+        self.datafile_controller.update_namespace()
         RideVariableMovedUp(item=ctrl).publish()
 
     def move_down(self, index):
         ctrl = self[index]
         _WithListOperations.move_down(self, index)
         self.mark_dirty()
+        self.datafile_controller.update_namespace()
         RideVariableMovedDown(item=ctrl).publish()
 
     def add_variable(self, name, value, comment=None):
@@ -381,6 +383,7 @@ class ImportSettingsController(_TableController, _WithListOperations):
         self._table.add_variables(path, utils.split_value(argstr), comment)
         self._parent.mark_dirty()
         self._publish_setting_added(path, 'variables')
+        self.notify_imports_modified()
         return self[-1]
 
     def _publish_setting_added(self, name, type):
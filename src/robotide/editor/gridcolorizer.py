@@ -12,6 +12,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import time
+
 from robotide.controller.cellinfo import CellType
 import wx
 # this import fails in HUDSON
@@ -20,6 +22,14 @@ wxFONTWEIGHT_BOLD = 92
 wxFONTWEIGHT_NORMAL = 90
 
 class Colorizer(object):
+    """Colorizes the cells of a grid in time-sliced batches.
+
+    Visible rows are colorized first and the rest of the rows in batches
+    lasting at most `_batch_duration` seconds, so that the event loop stays
+    responsive with large tables. Only cells whose colors or font weight
+    differ from the previous pass are updated to the grid.
+    """
+    _batch_duration = 0.02
 
     def __init__(self, grid, controller, colors):
         self._grid = grid
@@ -27,6 +37,8 @@ class Colorizer(object):
         self._colors=colors
         self._current_task_id = 0
         self._timer = None
+        self._applied = {}
+        self._grid_size = None
 
     def close(self):
         self._grid = None
@@ -38,30 +50,73 @@ class Colorizer(object):
         else:
             self._timer.Restart(50, self._current_task_id, selection_content)
 
-    def _coloring_task(self, task_index, selection_content, row=0, col=0):
+    def _coloring_task(self, task_index, selection_content, rows=None):
         if task_index != self._current_task_id or self._grid is None:
             return
-        if row >= self._grid.NumberRows:
+        if rows is None:
+            self._reset_if_grid_size_changed()
+            rows = self._rows_in_coloring_order()
+        changed = self._colorize_batch(rows, selection_content)
+        if changed:
             self._grid.ForceRefresh()
-            self._grid.AutoSizeRows()
-        elif col < self._grid.NumberCols:
-            self._colorize_cell(row, col, selection_content)
-            wx.CallAfter(self._coloring_task, task_index, selection_content, row, col+1)
-        else:
-            self._coloring_task(task_index, selection_content, row+1, 0)
+            for row in changed:
+                self._grid.AutoSizeRow(row)
+        if rows:
+            wx.CallAfter(self._coloring_task, task_index, selection_content, rows)
+
+    def _reset_if_grid_size_changed(self):
+        size = (self._grid.NumberRows, self._grid.NumberCols)
+        if size != self._grid_size:
+            self._applied.clear()
+            self._grid_size = size
+
+    def _rows_in_coloring_order(self):
+        first, last = self._visible_rows()
+        rows = range(first, last + 1) + range(first) + \
+               range(last + 1, self._grid.NumberRows)
+        rows.reverse()
+        return rows
+
+    def _visible_rows(self):
+        last_row = self._grid.NumberRows - 1
+        _, top = self._grid.CalcUnscrolledPosition(0, 0)
+        height = self._grid.GetGridWindow().GetClientSize().height
+        first = self._grid.YToRow(top)
+        last = self._grid.YToRow(top + height)
+        return (max(first, 0), last if 0 <= last <= last_row else last_row)
+
+    def _colorize_batch(self, rows, selection_content):
+        changed = set()
+        deadline = time.time() + self._batch_duration
+        while rows and time.time() < deadline:
+            row = rows.pop()
+            for col in range(self._grid.NumberCols):
+                if self._colorize_cell(row, col, selection_content):
+                    changed.add(row)
+        return changed
 
     def _colorize_cell(self, row, col, selection_content):
+        attributes = self._get_attributes(row, col, selection_content)
+        if self._applied.get((row, col)) == attributes:
+            return False
+        self._applied[(row, col)] = attributes
+        text_color, background_color, weight = attributes
+        self._grid.SetCellTextColour(row, col, text_color)
+        self._grid.SetCellBackgroundColour(row, col, background_color)
+        if weight is not None:
+            font = self._grid.GetCellFont(row, col)
+            font.SetWeight(weight)
+            self._grid.SetCellFont(row, col, font)
+        return True
+
+    def _get_attributes(self, row, col, selection_content):
         cell_info = self._controller.get_cell_info(row, col)
         if cell_info is None:
-            self._set_default_colors(row, col)
-            return
-        self._grid.SetCellTextColour(row, col, self._get_text_color(cell_info))
-        self._grid.SetCellBackgroundColour(row, col, self._get_background_color(cell_info, selection_content))
-        self._grid.SetCellFont(row, col, self._get_cell_font(row, col, cell_info))
-
-    def _set_default_colors(self, row, col):
-        self._grid.SetCellTextColour(row, col, self._colors.DEFAULT_TEXT)
-        self._grid.SetCellBackgroundColour(row, col, self._colors.DEFAULT_BACKGROUND)
+            return (self._colors.DEFAULT_TEXT,
+                    self._colors.DEFAULT_BACKGROUND, None)
+        return (self._get_text_color(cell_info),
+                self._get_background_color(cell_info, selection_content),
+                self._get_weight(cell_info))
 
     def _get_text_color(self, cell_info):
         return self._colors.get_text_color(cell_info.content_type)
@@ -73,11 +128,6 @@ class Colorizer(object):
             return self._colors.get_error_color()
         return self._colors.get_background_color(cell_info.cell_type)
 
-    def _get_cell_font(self, row, col, cell_info):
-        font = self._grid.GetCellFont(row, col)
-        font.SetWeight(self._get_weight(cell_info))
-        return font
-
     def _get_weight(self, cell_info):
         if cell_info.cell_type == CellType.KEYWORD:
             return wxFONTWEIGHT_BOLD
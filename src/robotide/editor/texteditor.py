@@ -21,7 +21,7 @@ from robot.parsing.populators import FromFilePopulator
 from robot.parsing.txtreader import TxtReader
 from robotide.action.actioninfo import ActionInfo
 
-from robotide.controller.commands import SetDataFile
+from robotide.controller.commands import SetDataFile, SetDataFileTables
 from robotide.publish.messages import RideMessage
 from robotide.widgets import VerticalSizer, HorizontalSizer, ButtonWithHandler
 from robotide.pluginapi import (Plugin, RideSaving, TreeAwarePluginMixin,
@@ -145,18 +145,19 @@ class DataValidationHandler(object):
         self._editor = editor
 
     def validate_and_update(self, data, text):
-        if not self._sanity_check(data, text):
+        changes = data.parse_changes(text)
+        if not self._sanity_check(changes):
             self._handle_sanity_check_failure()
             return False
         else:
             self._editor.reset()
-            data.update_from(text)
+            data.apply(changes)
             return True
 
-    def _sanity_check(self, data, text):
-        formatted_text = data.format_text(text)
+    def _sanity_check(self, changes):
+        formatted_text = changes.formatted_text
         c = self._remove_all(formatted_text, ' ', '\n', '...', '\r', '*')
-        e = self._remove_all(text, ' ', '\n', '...', '\r', '*')
+        e = self._remove_all(changes.text, ' ', '\n', '...', '\r', '*')
         return len(c) == len(e)
 
     def _remove_all(self, original_txt, *to_remove):
@@ -188,14 +189,33 @@ class DataFileWrapper(object): # TODO: bad class name
 
     def __init__(self, data):
         self._data = data
+        self._sections = None
 
     def __eq__(self, other):
         if other is None:
             return False
         return self._data == other._data
 
-    def update_from(self, content):
-        self._data.execute(SetDataFile(self._create_target_from(content)))
+    def parse_changes(self, content):
+        """Parses the tables whose sections differ from the shown content.
+
+        All tables are parsed if the content has not been read from this
+        wrapper before.
+        """
+        sections = _TableSections(content, self._create_target())
+        tables = sections.changed_from(self._sections)
+        if tables is not None:
+            content = sections.text_of(tables)
+        return _ParsedChanges(self._create_target_from(content), content,
+                              tables, sections)
+
+    def apply(self, changes):
+        if changes.tables is None:
+            self._data.execute(SetDataFile(changes.target))
+        elif changes.tables:
+            self._data.execute(SetDataFileTables(changes.target,
+                                                 changes.tables))
+        self._sections = changes.sections
 
     def _create_target_from(self, content):
         src = StringIO(content)
@@ -203,9 +223,6 @@ class DataFileWrapper(object): # TODO: bad class name
         FromStringIOPopulator(target).populate(src)
         return target
 
-    def format_text(self, text):
-        return self._txt_data(self._create_target_from(text)).encode('UTF-8')
-
     def mark_data_dirty(self):
         self._data.mark_dirty()
 
@@ -219,7 +236,9 @@ class DataFileWrapper(object): # TODO: bad class name
 
     @property
     def content(self):
-        return self._txt_data(self._data.data)
+        content = self._txt_data(self._data.data)
+        self._sections = _TableSections(content, self._create_target())
+        return content
 
     def _txt_data(self, data):
         output = StringIO()
@@ -227,6 +246,58 @@ class DataFileWrapper(object): # TODO: bad class name
         return output.getvalue()
 
 
+class _ParsedChanges(object):
+
+    def __init__(self, target, text, tables, sections):
+        self.target = target
+        self.text = text
+        self.tables = tables
+        self.sections = sections
+
+    @property
+    def formatted_text(self):
+        output = StringIO()
+        self.target.save(output=output, format='txt')
+        return output.getvalue()
+
+
+class _TableSections(object):
+    """Splits txt formatted data into texts of the tables it populates.
+
+    Sections with the same kind of table are joined. Text before the first
+    table and in unrecognized tables is not part of any table.
+    """
+
+    def __init__(self, text, datafile):
+        lines = {}
+        table = None
+        for line in StringIO(text):
+            cells = TxtReader.split_row(line)
+            if cells and cells[0].strip().startswith('*'):
+                table = self._table_name(datafile.start_table(
+                                        [c.replace('*', '') for c in cells]))
+            lines.setdefault(table, []).append(line)
+        self._texts = dict((name, ''.join(lines[name])) for name in lines)
+
+    def _table_name(self, table):
+        if table is None:
+            return None
+        return table.type.replace(' ', '') + '_table'
+
+    def changed_from(self, other):
+        if other is None:
+            return None
+        names = (set(self._texts) | set(other._texts)) - set([None])
+        return sorted(name for name in names
+                      if self._text(name) != other._text(name))
+
+    def text_of(self, tables):
+        return ''.join(self._text(name) for name in tables)
+
+    def _text(self, name):
+        return self._texts.get(name, '')
+
+
 class SourceEditor(wx.Panel):
 
     def __init__(self, parent, title, data_validator):
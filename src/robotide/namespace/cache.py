@@ -12,11 +12,14 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from __future__ import with_statement
+
 import os
-import time
+from threading import Thread, Lock
 
 from robotide.context import SETTINGS
 from robotide.spec import LibrarySpec
+from robotide.spec.librarydatabase import LIBRARY_DATABASE
 from robotide.robotapi import normpath
 from robotide.publish.messages import RideLogException
 
@@ -25,17 +28,27 @@ class LibraryCache(object):
     _IMPORT_FAILED = 'Importing library %s failed:'
     _RESOLVE_FAILED = 'Resolving keywords for library %s with args %s failed:'
 
-    def __init__(self):
+    def __init__(self, database=LIBRARY_DATABASE):
+        self._database = database
         self._library_keywords = _LibraryCache()
         self.__default_libraries = None
         self.__default_kws = None
+        self._default_libraries_lock = Lock()
 
     @property
     def _default_libraries(self):
-        if self.__default_libraries is None:
-            self.__default_libraries = self._get_default_libraries()
+        with self._default_libraries_lock:
+            if self.__default_libraries is None:
+                self.__default_libraries = self._get_default_libraries()
         return self.__default_libraries
 
+    def load_default_libraries(self):
+        """Imports the default libraries, which otherwise happens on first use.
+
+        Can be called from a background thread.
+        """
+        self._default_libraries
+
     @property
     def _default_kws(self):
         if self.__default_kws is None:
@@ -44,20 +57,73 @@ class LibraryCache(object):
 
     def add_library(self, name, args=None):
         if not self._library_keywords.has_key(self._key(name, args)):
-            action = lambda: LibrarySpec(name, args).keywords
-            kws = self._with_error_logging(action, [],
-                                           self._IMPORT_FAILED % (name))
-            self._library_keywords[self._key(name, args)] = kws
+            self._library_keywords[self._key(name, args)] = \
+                self._import_library(name, args)
+
+    def _import_library(self, name, args):
+        action = lambda: self._get_keywords(name, args)
+        return self._with_error_logging(action, [],
+                                        self._IMPORT_FAILED % (name))
+
+    def add_libraries(self, libraries):
+        """Imports libraries given as (name, args, alias) tuples in parallel."""
+        imports = {}
+        for name, args, alias in libraries:
+            args = self._alias_to_args(alias, args)
+            key = self._key(name, args)
+            if not self._library_keywords.has_key(key):
+                imports[key] = (name, args)
+        results = {}
+        def import_library(key, name, args):
+            results[key] = self._import_library(name, args)
+        threads = [Thread(target=import_library, args=(key,) + imp)
+                   for key, imp in imports.items()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for key, kws in results.items():
+            self._library_keywords[key] = kws
+
+    def _get_keywords(self, name, args):
+        keywords = self._database.fetch(name, args)
+        if keywords is None:
+            spec = LibrarySpec(name, args)
+            self._database.store(name, args, spec)
+            keywords = spec.keywords
+        return keywords
 
     def _key(self, name, args):
-        return (name, tuple(args or ''))
+        args = list(args or [])
+        alias = None
+        if len(args) >= 2 and isinstance(args[-2], basestring) and \
+                args[-2].upper() == 'WITH NAME':
+            alias = args.pop()
+            args.pop()
+        return (self._normalize_name(name),
+                tuple(self._hashable(arg) for arg in args), alias)
+
+    def _normalize_name(self, name):
+        if '/' in name or os.sep in name:
+            return os.path.normpath(name)
+        return name.replace(' ', '')
+
+    def _hashable(self, arg):
+        try:
+            hash(arg)
+        except TypeError:
+            return repr(arg)
+        return arg
 
     def get_library_keywords(self, name, args=None, alias=None):
         args = self._alias_to_args(alias, args)
         def _get_library_keywords():
-            if not self._library_keywords.has_key(self._key(name, args)):
-                self.add_library(name, args)
-            return self._library_keywords[self._key(name, args)]
+            key = self._key(name, args)
+            kws = self._library_keywords.get(key)
+            if kws is None:
+                kws = self._library_keywords[key] = \
+                    self._import_library(name, args)
+            return kws
         return self._with_error_logging(_get_library_keywords, [],
                                         self._RESOLVE_FAILED % (name, args))
 
@@ -82,15 +148,15 @@ class LibraryCache(object):
 
     def _build_default_kws(self):
         kws = []
-        for spec in self._default_libraries.values():
-            kws.extend(spec.keywords)
+        for keywords in self._default_libraries.values():
+            kws.extend(keywords)
         return kws
 
     def _get_default_libraries(self):
         default_libs = {}
         for libsetting in SETTINGS['auto imports'] + ['BuiltIn']:
             name, args = self._get_name_and_args(libsetting)
-            default_libs[name] = LibrarySpec(name, args)
+            default_libs[name] = self._get_keywords(name, args)
         return default_libs
 
     def _get_name_and_args(self, libsetting):
@@ -100,24 +166,37 @@ class LibraryCache(object):
         return parts[0], parts[1:]
 
 
-class ExpiringCache(object):
+class GenerationCache(object):
+    """Cache whose entries stay valid until the model changes.
 
-    def __init__(self, timeout=0.5):
+    Entries are stamped with the generation they were stored in. `expire`
+    drops one entry and `expire_all` starts a new generation, which makes all
+    older entries invalid. `hits` and `misses` count the lookups, so the
+    number of recomputations can be followed.
+    """
+
+    def __init__(self):
         self._cache = {}
-        self._timeout = timeout
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
 
     def get(self, key):
-        if key in self._cache:
-            key_time, values = self._cache[key]
-            if self._is_valid(key_time):
-                return values
-        return None
-
-    def _is_valid(self, key_time):
-        return (time.time() - key_time) < self._timeout
+        generation, values = self._cache.get(key, (None, None))
+        if generation != self.generation:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return values
 
     def put(self, key, values):
-        self._cache[key] = (time.time(), values)
+        self._cache[key] = (self.generation, values)
+
+    def expire(self, key):
+        self._cache.pop(key, None)
+
+    def expire_all(self):
+        self.generation += 1
 
 
     def _get_from_cache(self, source, name):
@@ -128,22 +207,71 @@ class ExpiringCache(object):
             return self._resource_files[path]
 
 
-class _LibraryCache:
-    """Cache for libs/resources that doesn't require mutable keys like dicts"""
+class _LibraryCache(object):
+    """LRU cache of library keywords with a budget for their estimated size.
 
-    def __init__(self):
-        self._keys = []
-        self._libs = []
+    Keys must be hashable. The most recently added or used libraries are
+    kept, and older ones are dropped when the total size of the cached
+    keywords exceeds `max_size` characters.
+    """
+
+    def __init__(self, max_size=20 * 1024 * 1024):
+        self._libs = {}
+        self._sizes = {}
+        self._used = {}
+        self._uses = 0
+        self._max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def __setitem__(self, key, library):
-        self._keys.append(key)
-        self._libs.append(library)
+        self._remove(key)
+        self._libs[key] = library
+        self._mark_used(key)
+        self._sizes[key] = self._estimate_size(library)
+        self.size += self._sizes[key]
+        self._evict()
 
     def __getitem__(self, key):
-        try:
-            return self._libs[self._keys.index(key)]
-        except ValueError:
-            raise KeyError
+        library = self.get(key)
+        if library is None:
+            raise KeyError(key)
+        return library
+
+    def get(self, key):
+        library = self._libs.get(key)
+        if library is None:
+            self.misses += 1
+            return None
+        self._mark_used(key)
+        self.hits += 1
+        return library
+
+    def _mark_used(self, key):
+        self._uses += 1
+        self._used[key] = self._uses
 
     def has_key(self, key):
-        return key in self._keys
+        return key in self._libs
+
+    __contains__ = has_key
+
+    def __len__(self):
+        return len(self._libs)
+
+    def _estimate_size(self, library):
+        return sum(len(kw.name) + len(kw.doc or '') + len(kw.source or '')
+                   for kw in library)
+
+    def _evict(self):
+        while self.size > self._max_size and len(self._libs) > 1:
+            self._remove(min(self._libs, key=self._used.get))
+            self.evictions += 1
+
+    def _remove(self, key):
+        if key in self._libs:
+            del self._libs[key]
+            del self._used[key]
+            self.size -= self._sizes.pop(key)
@@ -11,6 +11,10 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+from bisect import bisect_left
+
+from robot.utils import normalize
+
 from robotide.spec.iteminfo import LocalVariableInfo
 
 def LocalNamespace(controller, namespace, row=None):
@@ -28,10 +32,7 @@ class LocalMacroNamespace(object):
         return self._namespace.get_suggestions_for(self._controller, start)
 
     def has_name(self, value):
-        for sug in self._namespace.get_suggestions_for(self._controller, value):
-            if sug.name == value:
-                return True
-        return False
+        return self._namespace.has_variable(self._controller, value)
 
 class LocalRowNamespace(LocalMacroNamespace):
 
@@ -46,13 +47,8 @@ class LocalRowNamespace(LocalMacroNamespace):
         return suggestions
 
     def _harvest_local_variables(self, start, suggestions):
-        matching_assignments = set()
-        for row, step in enumerate(self._controller.steps):
-            if self._row == row:
-                break
-            matching_assignments = matching_assignments.union(
-                val.replace('=','').strip() for val in step.assignments if
-                val.startswith(start))
+        matching_assignments = self._controller.local_assignments.\
+                get_names_assigned_before(self._row, start)
         if matching_assignments:
             suggestions = sorted(
                 suggestions + [LocalVariableInfo(name) for name in
@@ -63,10 +59,42 @@ class LocalRowNamespace(LocalMacroNamespace):
         return len(start) == 0 or start.startswith('$') or start.startswith('@')
 
     def has_name(self, value):
-        if self._row is not None:
-            for row, step in enumerate(self._controller.steps):
-                if self._row == row:
-                    break
-                if step.is_assigning(value):
-                    return True
+        if self._controller.local_assignments.is_assigned_before(value,
+                                                                 self._row):
+            return True
         return LocalMacroNamespace.has_name(self, value)
+
+
+class LocalAssignments(object):
+    """Variables assigned by the steps of a test or keyword, by row."""
+
+    def __init__(self, steps):
+        self._first_rows = {}
+        first_rows_by_name = {}
+        for row, step in enumerate(steps):
+            for assignment in step.assignments:
+                name = self._strip(assignment)
+                self._first_rows.setdefault(self._normalize(name), row)
+                first_rows_by_name.setdefault(name, row)
+        self._names = sorted(first_rows_by_name.items())
+        self._sorted_names = [name for name, _ in self._names]
+
+    def _strip(self, assignment):
+        return assignment.replace('=', '').strip()
+
+    def _normalize(self, name):
+        return normalize(name, ignore=['_'])
+
+    def is_assigned_before(self, value, row):
+        first_row = self._first_rows.get(self._normalize(self._strip(value)))
+        return first_row is not None and first_row < row
+
+    def get_names_assigned_before(self, row, start=''):
+        names = set()
+        for name, first_row in self._names[bisect_left(self._sorted_names,
+                                                       start):]:
+            if not name.startswith(start):
+                break
+            if first_row < row:
+                names.add(name)
+        return names
@@ -24,7 +24,7 @@ from robot.parsing.settings import Library, Resource, Variables
 from robot.utils.normalizing import normalize
 from robot.variables import Variables as RobotVariables
 
-from robotide.namespace.cache import LibraryCache, ExpiringCache
+from robotide.namespace.cache import LibraryCache, GenerationCache
 from robotide.namespace.resourcefactory import ResourceFactory
 from robotide.spec.iteminfo import (TestCaseUserKeywordInfo,
                                     ResourceUserKeywordInfo,
@@ -47,18 +47,32 @@ class Namespace(object):
         self._retriever = DatafileRetriever(self._lib_cache, self._resource_factory)
         self._context_factory = _RetrieverContextFactory()
 
-    def update(self):
-        self._retriever.expire_cache()
-        self._context_factory = _RetrieverContextFactory()
+    def update(self, datafile=None):
+        """Expires cached keywords and variables after a model change.
+
+        If `datafile` is given, only caches of it and of the datafiles that
+        import it directly or through other resources are expired.
+        """
+        if datafile is None:
+            self._retriever.expire_cache()
+            self._context_factory = _RetrieverContextFactory()
+        else:
+            sources = self._retriever.get_dependents_of(datafile.source)
+            self._retriever.expire_cache(sources)
+            self._context_factory.expire(sources)
         for listener in self._update_listeners:
             listener()
 
     def resource_filename_changed(self, old_name, new_name):
         self._resource_factory.resource_filename_changed(old_name, new_name)
+        self.update()
 
     def reset_resource_and_library_cache(self):
         self._init_caches()
 
+    def load_default_libraries(self):
+        self._lib_cache.load_default_libraries()
+
     def register_update_listener(self, listener):
         self._update_listeners.append(listener)
 
@@ -107,13 +121,31 @@ class Namespace(object):
             or (len(start) >= 2 and start.startswith('${') or start.startswith('@{'))
 
     def _variable_suggestions(self, controller, start, ctx):
-        datafile = controller.datafile
         start_normalized = normalize(start)
-        self._add_kw_arg_vars(controller, ctx.vars)
-        vars = self._retriever.get_variables_from(datafile, ctx)
+        vars = self._get_variables(controller, ctx)
         return (v for v in vars
                 if normalize(v.name).startswith(start_normalized))
 
+    def _get_variables(self, controller, ctx):
+        self._add_kw_arg_vars(controller, ctx.vars)
+        ctx.variables_collected = True
+        return self._retriever.get_variables_from(controller.datafile, ctx)
+
+    def has_variable(self, controller, name):
+        """Returns True if variable `name` is known in `controller`.
+
+        Unlike `get_suggestions_for`, this does not create suggestions. The
+        variables of the context are collected only once, until the next
+        `update`.
+        """
+        ctx = self._context_factory.ctx_for_controller(controller)
+        if not ctx.variables_collected:
+            self._get_variables(controller, ctx)
+        if ctx.vars.has_variable(name):
+            return True
+        return any(sug.name == name for sug in
+                   self._get_suggestions_from_hooks(controller.datafile, name))
+
     def _add_kw_arg_vars(self, controller, vars):
         for name, value in controller.get_local_variables().iteritems():
             vars.set_argument(name, value)
@@ -128,6 +160,11 @@ class Namespace(object):
     def get_resources(self, datafile):
         return self._retriever.get_resources_from(datafile)
 
+    def load_libraries(self, datafiles):
+        """Imports libraries used by given datafiles in parallel."""
+        self._lib_cache.add_libraries(
+            self._retriever.get_library_imports_from(datafiles))
+
     def get_resource(self, path, directory=''):
         return self._resource_factory.get_resource(directory, path)
 
@@ -168,26 +205,38 @@ class _RetrieverContextFactory(object):
 
     def __init__(self):
         self._context_cache = {}
+        self._keys_by_source = {}
 
     def ctx_for_controller(self, controller):
         if controller not in self._context_cache:
-            self._context_cache[controller] = RetrieverContext()
-            self._context_cache[controller.datafile] = self._context_cache[controller]
+            self._cache(controller, controller.datafile, RetrieverContext())
+            self._cache(controller.datafile, controller.datafile,
+                        self._context_cache[controller])
         return self._context_cache[controller]
 
     def ctx_for_datafile(self, datafile):
         if datafile not in self._context_cache:
             ctx = RetrieverContext()
             ctx.set_variables_from_datafile_variable_table(datafile)
-            self._context_cache[datafile] = ctx
+            self._cache(datafile, datafile, ctx)
         return self._context_cache[datafile]
 
+    def _cache(self, key, datafile, ctx):
+        self._context_cache[key] = ctx
+        self._keys_by_source.setdefault(datafile.source, set()).add(key)
+
+    def expire(self, sources):
+        for source in sources:
+            for key in self._keys_by_source.pop(source, ()):
+                self._context_cache.pop(key, None)
+
 
 class RetrieverContext(object):
 
     def __init__(self):
         self.vars = _VariableStash()
         self.parsed = set()
+        self.variables_collected = False
 
     def set_variables_from_datafile_variable_table(self, datafile):
         self.vars.set_from_variable_table(datafile.variable_table)
@@ -251,6 +300,9 @@ class _VariableStash(object):
     def set_argument(self, name, value):
         self.set(name, value, self.ARGUMENT_SOURCE)
 
+    def has_variable(self, name):
+        return self._vars.has_key(name)
+
     def replace_variables(self, value):
         try:
             return self._vars.replace_scalar(value)
@@ -289,7 +341,9 @@ class DatafileRetriever(object):
     def __init__(self, lib_cache, resource_factory):
         self._lib_cache = lib_cache
         self._resource_factory = resource_factory
-        self.keyword_cache = ExpiringCache()
+        self.keyword_cache = GenerationCache()
+        self._dependencies = _ImportDependencies()
+        self._user_keywords = {}
         self._default_kws = None
 
     @property
@@ -298,8 +352,18 @@ class DatafileRetriever(object):
             self._default_kws = self._lib_cache.get_default_keywords()
         return self._default_kws
 
-    def expire_cache(self):
-        self.keyword_cache = ExpiringCache()
+    def expire_cache(self, sources=None):
+        if sources is None:
+            self.keyword_cache.expire_all()
+            self._dependencies = _ImportDependencies()
+            self._user_keywords.clear()
+        else:
+            for source in sources:
+                self.keyword_cache.expire(source)
+                self._user_keywords.pop(source, None)
+
+    def get_dependents_of(self, source):
+        return self._dependencies.get_dependents_of(source)
 
     def get_keywords_from_several(self, datafiles):
         kws = set()
@@ -316,6 +380,13 @@ class DatafileRetriever(object):
               self._get_imported_library_keywords(datafile, ctx)))
 
     def _get_datafile_keywords(self, datafile):
+        cached = self._user_keywords.get(datafile.source)
+        if not cached or cached[0] is not datafile:
+            cached = (datafile, self._create_user_keyword_infos(datafile))
+            self._user_keywords[datafile.source] = cached
+        return cached[1]
+
+    def _create_user_keyword_infos(self, datafile):
         if isinstance(datafile, ResourceFile):
             return [ResourceUserKeywordInfo(kw) for kw in datafile.keywords]
         return [TestCaseUserKeywordInfo(kw) for kw in datafile.keywords]
@@ -331,11 +402,23 @@ class DatafileRetriever(object):
         return kws
 
     def _lib_kw_getter(self, imp, ctx):
+        return self._lib_cache.get_library_keywords(
+            *self._resolve_library_import(imp, ctx))
+
+    def _resolve_library_import(self, imp, ctx):
         name = ctx.replace_variables(imp.name)
         name = self._convert_to_absolute_path(name, imp)
         args = [ctx.replace_variables(a) for a in imp.args]
         alias = ctx.replace_variables(imp.alias) if imp.alias else None
-        return self._lib_cache.get_library_keywords(name, args, alias)
+        return name, args, alias
+
+    def get_library_imports_from(self, datafiles):
+        imports = []
+        for datafile in datafiles:
+            ctx = self._get_vars_recursive(datafile, RetrieverContext())
+            imports.extend(self._resolve_library_import(imp, ctx) for imp
+                           in self._collect_import_of_type(datafile, Library))
+        return imports
 
     def _convert_to_absolute_path(self, name, import_):
         full_name = os.path.join(os.path.dirname(import_.source), name)
@@ -361,7 +444,7 @@ class DatafileRetriever(object):
         for child in self._collect_import_of_type(res, Resource):
             kws.extend(self._res_kw_recursive_getter(child, ctx))
         kws.extend(self._get_imported_library_keywords(res, ctx))
-        return [ResourceUserKeywordInfo(kw) for kw in res.keywords] + kws
+        return self._get_datafile_keywords(res) + kws
 
     def get_variables_from(self, datafile, ctx=None):
         return self._get_vars_recursive(datafile, ctx or RetrieverContext()).vars
@@ -388,10 +471,13 @@ class DatafileRetriever(object):
     def get_keywords_cached(self, datafile, context_factory):
         values = self.keyword_cache.get(datafile.source)
         if not values:
-            words = self.get_keywords_from(datafile, context_factory.ctx_for_datafile(datafile))
+            ctx = context_factory.ctx_for_datafile(datafile)
+            words = self.get_keywords_from(datafile, ctx)
             words.extend(self.default_kws)
             values = _Keywords(words)
             self.keyword_cache.put(datafile.source, values)
+            self._dependencies.set_imports(datafile.source,
+                                           [res.source for res in ctx.parsed])
         return values
 
     def _get_user_keywords_from(self, datafile):
@@ -433,13 +519,73 @@ class DatafileRetriever(object):
         items.update(self._get_resources_recursive(res, ctx))
 
 
+class _ImportDependencies(object):
+    """Graph of which datafiles import which resource files."""
+
+    def __init__(self):
+        self._imports = {}
+        self._importers = {}
+
+    def set_imports(self, source, imported_sources):
+        for imported in self._imports.pop(source, ()):
+            self._importers[imported].discard(source)
+        self._imports[source] = set(imported_sources)
+        for imported in self._imports[source]:
+            self._importers.setdefault(imported, set()).add(source)
+
+    def get_dependents_of(self, source):
+        """Returns `source` and all sources importing it transitively."""
+        dependents = set([source])
+        unvisited = [source]
+        while unvisited:
+            for importer in self._importers.get(unvisited.pop(), ()):
+                if importer not in dependents:
+                    dependents.add(importer)
+                    unvisited.append(importer)
+        return dependents
+
+
+class _EmbeddedKeywords(object):
+    """Keywords with embedded arguments indexed by their literal prefix.
+
+    A name is matched only against keywords whose text before the first
+    embedded argument is also the beginning of the name, which usually
+    leaves at most a few regexps to try. Keywords added first win.
+    """
+    _literal_prefix = re.compile(r'[^$\\]*')
+
+    def __init__(self):
+        self._prefixes = {}
+        self._count = 0
+
+    def add(self, regexp, kw):
+        prefix = self._literal_prefix.match(kw.name).group().lower()
+        bucket = self._prefixes.setdefault(len(prefix), {})
+        bucket.setdefault(prefix, []).append((self._count, regexp, kw))
+        self._count += 1
+
+    def get(self, name):
+        lower = name.lower()
+        candidates = []
+        for length, bucket in self._prefixes.iteritems():
+            candidates.extend(bucket.get(lower[:length], ()))
+        for _, regexp, kw in sorted(candidates):
+            if regexp.match(name):
+                return kw
+        return None
+
+    def __len__(self):
+        return self._count
+
+
 class _Keywords(object):
 
     regexp = re.compile("\s*(given|when|then|and)\s*(.*)", re.IGNORECASE)
 
     def __init__(self, keywords):
         self.keywords = NormalizedDict(ignore=['_'])
-        self.embedded_keywords = {}
+        self.embedded_keywords = _EmbeddedKeywords()
+        self._found = {}
         self._add_keywords(keywords)
 
     def _add_keywords(self, keywords):
@@ -459,20 +605,23 @@ class _Keywords(object):
             return
         try:
             handler = EmbeddedArgsHandler(kw)
-            self.embedded_keywords[handler.name_regexp] = kw
+            self.embedded_keywords.add(handler.name_regexp, kw)
         except Exception:
             pass
 
     def get(self, kw_name):
+        if kw_name not in self._found:
+            self._found[kw_name] = self._find(kw_name)
+        return self._found[kw_name]
+
+    def _find(self, kw_name):
         if kw_name in self.keywords:
             return self.keywords[kw_name]
         bdd_name = self._get_bdd_name(kw_name)
         if bdd_name and bdd_name in self.keywords:
             return self.keywords[bdd_name]
-        for regexp in self.embedded_keywords:
-            if regexp.match(kw_name) or (bdd_name and regexp.match(bdd_name)):
-                return self.embedded_keywords[regexp]
-        return None
+        return self.embedded_keywords.get(kw_name) or \
+               (bdd_name and self.embedded_keywords.get(bdd_name)) or None
 
     def _get_bdd_name(self, kw_name):
         match = self.regexp.match(kw_name)
@@ -179,6 +179,15 @@ class RideSaveAll(RideMessage):
     """Sent when user selects ``Save All`` from ``File`` menu or via shortcut."""
 
 
+class RideFileChangedOnDisk(RideMessage):
+    """Sent when a loaded file has been modified or removed outside RIDE.
+
+    ``datafile`` is the controller of the file, or None if the changed file
+    is not a loaded data file.
+    """
+    data = ['path', 'datafile']
+
+
 class RideDataDirtyCleared(RideMessage):
     """Sent when datafiles dirty marking is cleared
 
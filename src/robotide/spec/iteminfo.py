@@ -13,6 +13,7 @@
 #  limitations under the License.
 
 import os
+import weakref
 
 from robot.utils.normalizing import normalize
 from robotide.utils import html_escape, unescape
@@ -20,6 +21,7 @@ from robotide.utils import html_escape, unescape
 
 class ItemInfo(object):
     """Represents an object that can be displayed by content assistant."""
+    __slots__ = ('name', 'source', 'details', '_priority')
 
     def __init__(self, name, source, details):
         """Creates an item info.
@@ -107,18 +109,41 @@ class LocalVariableInfo(VariableInfo):
     def __init__(self, name):
         VariableInfo.__init__(self, name, '', self.SOURCE)
 
-class _KeywordInfo(ItemInfo):
+class ArgumentSignature(object):
+    """Immutable summary of keyword arguments used when typing step cells.
 
-    def __init__(self, item):
-        self.doc = self._doc(item).strip()
-        ItemInfo.__init__(self, self._name(item), self._source(item),
-                          None)
-        self.shortdoc = self.doc.splitlines()[0] if self.doc else ''
-        self.item = item
+    `arguments` is a tuple of formatted arguments like `name`, `name=default`
+    and `*varargs`, `mandatory` the number of arguments without a default
+    value, `optional` a tuple of the names of arguments with a default value
+    and `varargs` tells whether the last argument accepts any number of
+    values.
+    """
+    __slots__ = ('arguments', 'mandatory', 'optional', 'varargs')
+
+    def __init__(self, arguments):
+        arguments = tuple(arguments)
+        varargs = bool(arguments) and arguments[-1].startswith('*')
+        positional = arguments[:-1] if varargs else arguments
+        optional = tuple(arg.split('=', 1)[0] for arg in positional
+                         if '=' in arg)
+        object.__setattr__(self, 'arguments', arguments)
+        object.__setattr__(self, 'mandatory', len(positional) - len(optional))
+        object.__setattr__(self, 'optional', optional)
+        object.__setattr__(self, 'varargs', varargs)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'ArgumentSignature' object is immutable")
+
+    def __len__(self):
+        return len(self.arguments)
+
+
+class _KeywordInfo(ItemInfo):
+    __slots__ = ()
 
     @property
     def arguments(self):
-        return self._parse_args(self.item)
+        return list(self.signature.arguments)
 
     @property
     def details(self):
@@ -130,87 +155,126 @@ class _KeywordInfo(ItemInfo):
                 '<table>'
                 '<tr><td>%s</td></tr>'
                 '</table>') % \
-                (self._name(self.item), self._source(self.item), self._type,
-                 self._format_args(self._parse_args(self.item)),
+                (self.name, self.source, self._type,
+                 self._format_args(self.signature.arguments),
                  html_escape(self.doc, formatting=True))
 
     def _format_args(self, args):
         return '[ %s ]' % ' | '.join(args)
 
+    def _shortdoc(self, doc):
+        return doc.splitlines()[0] if doc else ''
+
     def __str__(self):
         return 'KeywordInfo[name: %s, source: %s, doc: %s]' %(self.name,
                                                               self.source,
                                                               self.doc)
 
-    def _name(self, item):
-        return item.name
-
-
-class _XMLKeywordContent(_KeywordInfo):
 
-    def __init__(self, item, source, source_type):
-        self._type = source_type
-        self._source = lambda x: source
-        _KeywordInfo.__init__(self, item)
-        self.args = self._format_args(self._parse_args(item))
-
-    def _name(self, node):
-        return node.get('name')
+class LibraryKeywordInfo(_KeywordInfo):
+    """Compact and immutable info of a library keyword.
+
+    Only strings describing the keyword are stored, not the library handler
+    or the XML spec the info was created from. Instances should be created
+    with `from_xml` or `from_handler`, which return the same instance for
+    equal keywords as long as the instance is in use.
+    """
+    __slots__ = ('doc', 'shortdoc', 'signature', '_type', '__weakref__')
+    _instances = weakref.WeakValueDictionary()
+
+    def __init__(self, name, source, arguments, doc, source_type):
+        doc = (doc or '').strip()
+        for attr, value in [('name', _intern(name)),
+                            ('source', _intern(source)),
+                            ('doc', doc),
+                            ('shortdoc', _intern(self._shortdoc(doc))),
+                            ('signature', ArgumentSignature(
+                                _intern(arg) for arg in arguments)),
+                            ('_type', _intern(source_type)),
+                            ('_priority', PRIORITIES[LibraryKeywordInfo])]:
+            object.__setattr__(self, attr, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'LibraryKeywordInfo' object is immutable")
 
-    def _doc(self, node):
-        return node.find('doc').text or ''
+    @property
+    def args(self):
+        return self._format_args(self.signature.arguments)
+
+    @classmethod
+    def from_xml(cls, node, source, source_type='test library'):
+        args = [arg.text for arg in node.find('arguments').findall('arg')]
+        return cls._interned(node.get('name'), source, args,
+                             node.find('doc').text, source_type)
+
+    @classmethod
+    def from_handler(cls, handler, source_type='test library'):
+        return cls._interned(handler.name, handler.library.name,
+                             cls._format_handler_args(handler.arguments),
+                             handler.doc, source_type)
+
+    @classmethod
+    def _format_handler_args(cls, handler_args):
+        args = list(handler_args.names)
+        for i, value in enumerate(handler_args.defaults):
+            index = len(handler_args.names) - len(handler_args.defaults) + i
+            args[index] = args[index] + '=' + unicode(value)
+        if handler_args.varargs:
+            args.append('*%s' % handler_args.varargs)
+        return args
 
-    def _parse_args(self, node):
-        args_node = node.find('arguments')
-        return [arg_node.text for arg_node in args_node.findall('arg')]
+    @classmethod
+    def _interned(cls, name, source, arguments, doc, source_type):
+        key = (name, source, tuple(arguments), doc, source_type)
+        info = cls._instances.get(key)
+        if info is None:
+            info = cls._instances[key] = cls(*key)
+        return info
 
     def is_library_keyword(self):
         return True
 
 
-class LibraryKeywordInfo(_KeywordInfo):
-    _type = 'test library'
-    _library_alias = None
+def _intern(string):
+    """Shares equal strings using the builtin `intern`.
 
-    def with_alias(self, alias):
-        self._library_alias = alias
-        self.source = self._source(self.item)
-        return self
+    Interned strings are freed when no longer used, so strings of unloaded
+    libraries are not kept alive. Only ASCII strings can be interned, other
+    strings are returned as is.
+    """
+    if isinstance(string, unicode):
+        try:
+            string = string.encode('ASCII')
+        except UnicodeError:
+            return string
+    return intern(string) if isinstance(string, str) else string
 
-    def _source(self, item):
-        if self._library_alias:
-            return self._library_alias
-        return item.library.name
-
-    def _doc(self, item):
-        return item.doc
-
-    def _parse_args(self, handler):
-        args = []
-        handler_args = handler.arguments
-        if handler_args.names:
-            args.extend(list(handler_args.names))
-        if handler_args.defaults:
-            for i, value in enumerate(handler_args.defaults):
-                index = len(handler_args.names) - len(handler_args.defaults) + i
-                args[index] = args[index] + '=' + unicode(value)
-        if handler_args.varargs:
-            args.append('*%s' % handler_args.varargs)
-        return args
 
-    def is_library_keyword(self):
-        return True
+class _UserKeywordInfo(_KeywordInfo):
+    _signature_args = None
 
+    def __init__(self, item):
+        self.doc = unescape(item.doc.value).strip()
+        ItemInfo.__init__(self, item.name, self._source(item), None)
+        self.shortdoc = self._shortdoc(self.doc)
+        self.item = item
+        self._signature = None
 
+    @property
+    def signature(self):
+        """`ArgumentSignature` of the keyword.
 
-class _UserKeywordInfo(_KeywordInfo):
+        Parsed again only when the `[Arguments]` setting has been given a new
+        value after the previous parsing.
+        """
+        if self._signature_args is not self.item.args.value:
+            self._signature_args = self.item.args.value
+            self._signature = ArgumentSignature(self._parse_args(self.item))
+        return self._signature
 
     def _source(self, item):
         return unicode(os.path.basename(item.source)) if item.source else ''
 
-    def _doc(self, item):
-        return unescape(item.doc.value)
-
     def _parse_args(self, uk):
         parsed = []
         for arg in uk.args.value:
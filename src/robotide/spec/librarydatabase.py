@@ -0,0 +1,157 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import sys
+from hashlib import md5
+
+from robotide import utils
+from robotide.context import SETTINGS
+from robotide.version import VERSION
+
+from iteminfo import LibraryKeywordInfo
+
+
+class LibraryDatabase(object):
+    """Persistent cache of test library keyword specs.
+
+    Specs are stored in libdoc's XML format, one file per library name,
+    arguments and module search path combination. The search path is part
+    of the key so that a name resolving to a different module, for example
+    after the pythonpath setting has changed, is not served a spec of the
+    module it resolved to earlier. An entry is valid as long as the library source
+    file has not been modified after the entry was written and the entry was
+    written by the same RIDE version. At most `max_entries` specs are kept;
+    the least recently used ones are removed first.
+    """
+    _SOURCE_TYPE = 'test library'
+
+    def __init__(self, directory, max_entries=200):
+        self._directory = directory
+        self._max_entries = max_entries
+
+    def fetch(self, name, args=None):
+        """Returns cached keywords of the library or None if not cached."""
+        path = self._path(name, args)
+        if not os.path.isfile(path):
+            return None
+        root = self._read(path)
+        if root is None or not self._is_valid(root):
+            self._remove(path)
+            return None
+        self._touch(path)
+        return [LibraryKeywordInfo.from_xml(node, node.get('source'),
+                                           self._SOURCE_TYPE)
+                for node in root.findall('kw')]
+
+    def store(self, name, args, spec):
+        """Stores keywords of `spec` unless its source file is unknown."""
+        if not spec.source or not os.path.isfile(spec.source):
+            return
+        try:
+            if not os.path.isdir(self._directory):
+                os.makedirs(self._directory)
+            self._write(self._path(name, args), self._create_root(spec))
+        except EnvironmentError:
+            return
+        self._remove_least_recently_used()
+
+    def invalidate(self, name, args=None):
+        self._remove(self._path(name, args))
+
+    def clear(self):
+        for path in self._entries():
+            self._remove(path)
+
+    def _path(self, name, args):
+        key = u'\x1f'.join([unicode(name)] + [unicode(a) for a in args or []] +
+                           [self._pythonpath()])
+        return os.path.join(self._directory,
+                            md5(key.encode('UTF-8')).hexdigest() + '.xml')
+
+    def _read(self, path):
+        try:
+            return utils.ET.parse(path).getroot()
+        except Exception:
+            return None
+
+    def _is_valid(self, root):
+        if root.tag != 'keywordspec' or root.get('generator') != self._generator:
+            return False
+        source = root.get('source')
+        return bool(source) and os.path.isfile(source) and \
+               root.get('mtime') == self._mtime(source)
+
+    def _create_root(self, spec):
+        root = utils.ET.Element('keywordspec', type='library',
+                                generator=self._generator, source=spec.source,
+                                mtime=self._mtime(spec.source))
+        utils.ET.SubElement(root, 'doc').text = spec.doc or ''
+        for kw in spec.keywords:
+            node = utils.ET.SubElement(root, 'kw', name=kw.name, source=kw.source)
+            args = utils.ET.SubElement(node, 'arguments')
+            for arg in kw.arguments:
+                utils.ET.SubElement(args, 'arg').text = arg
+            utils.ET.SubElement(node, 'doc').text = kw.doc
+        return root
+
+    def _pythonpath(self):
+        return os.pathsep.join(os.path.abspath(path) for path in sys.path)
+
+    @property
+    def _generator(self):
+        return 'RIDE %s' % VERSION
+
+    def _mtime(self, path):
+        return '%.3f' % os.path.getmtime(path)
+
+    def _write(self, path, root):
+        temp_path = path + '.tmp'
+        utils.ET.ElementTree(root).write(temp_path, encoding='UTF-8')
+        self._remove(path)
+        os.rename(temp_path, path)
+
+    def _touch(self, path):
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _remove_least_recently_used(self):
+        entries = sorted(self._entries(), key=self._last_used)
+        for path in entries[:max(len(entries) - self._max_entries, 0)]:
+            self._remove(path)
+
+    def _last_used(self, path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0
+
+    def _entries(self):
+        if not os.path.isdir(self._directory):
+            return []
+        return [os.path.join(self._directory, name)
+                for name in os.listdir(self._directory)
+                if name.endswith('.xml')]
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+LIBRARY_DATABASE = LibraryDatabase(SETTINGS.get_path('library specs'))
+"""Global `LibraryDatabase` instance stored under RIDE's settings directory."""
@@ -0,0 +1,235 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Imports test libraries in separate worker processes.
+
+Importing a library may be slow, may have side effects and pulls all of its
+dependencies into the importing process. `LibraryFetcher` therefore imports
+libraries in a pool of worker processes running this module as a script. The
+workers reply with the keyword spec of the library in libdoc's XML format.
+
+This module must not import anything from `robotide`, because it is executed
+as a standalone script by the workers. Workers need the json module and
+`Popen.kill`, which are available only in Python 2.6 or newer. With older
+Pythons libraries are imported in the calling process.
+"""
+
+import os
+import sys
+import inspect
+import atexit
+import threading
+import subprocess
+from Queue import Queue, Empty
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        json = None
+try:
+    from multiprocessing import cpu_count
+except ImportError:
+    cpu_count = lambda: 1
+
+from robot.errors import DataError
+from robot.running import TestLibrary
+from robot.utils import ET, get_error_message
+
+
+_WORKERS_SUPPORTED = json is not None and hasattr(subprocess.Popen, 'kill')
+
+
+def get_import_result(path, args):
+    """Imports the library and returns its keyword spec as an XML element."""
+    lib = TestLibrary(path, args)
+    root = ET.Element('keywordspec', name=lib.name, type='library',
+                      source=_get_source(lib) or '')
+    ET.SubElement(root, 'doc').text = lib.doc or ''
+    for handler in lib.handlers.values():
+        node = ET.SubElement(root, 'kw', name=handler.name, source=lib.name)
+        args_node = ET.SubElement(node, 'arguments')
+        for arg in _format_arguments(handler.arguments):
+            ET.SubElement(args_node, 'arg').text = arg
+        ET.SubElement(node, 'doc').text = handler.doc or ''
+    return root
+
+
+def _get_source(lib):
+    module = inspect.getmodule(getattr(lib, '_libcode', None))
+    source = getattr(module, '__file__', None)
+    if not source:
+        return None
+    if source.endswith(('.pyc', '.pyo')):
+        source = source[:-1]
+    elif source.endswith('$py.class'):
+        source = source[:-len('$py.class')] + '.py'
+    return os.path.abspath(source)
+
+
+def _format_arguments(handler_args):
+    args = list(handler_args.names)
+    for i, value in enumerate(handler_args.defaults):
+        index = len(handler_args.names) - len(handler_args.defaults) + i
+        args[index] = args[index] + '=' + unicode(value)
+    if handler_args.varargs:
+        args.append('*%s' % handler_args.varargs)
+    return args
+
+
+class LibraryFetcher(object):
+    """Pool of worker processes importing test libraries.
+
+    `fetch` can be called from several threads at the same time, in which
+    case the libraries are imported in parallel by separate workers. Every
+    worker imports only one library, so modified libraries are always
+    re-imported, and a fresh worker is started in advance for the next
+    import. A worker that does not reply in `timeout` seconds is killed.
+    Libraries are imported in the calling process if their arguments cannot
+    be sent to a worker or if workers cannot be started or are not supported
+    by the Python version.
+    """
+
+    def __init__(self, workers=4, timeout=30):
+        self._timeout = timeout
+        self._idle = Queue()
+        for _ in range(workers):
+            self._idle.put(None)
+        self._workers = set()
+        atexit.register(self.close)
+
+    def fetch(self, path, args=None):
+        """Returns keyword spec of the library as an XML element.
+
+        Raises `DataError` if importing the library fails or times out.
+        """
+        args = list(args or [])
+        if not _WORKERS_SUPPORTED:
+            return get_import_result(path, args)
+        try:
+            request = json.dumps({'path': path, 'args': args,
+                                  'pythonpath': sys.path})
+        except (TypeError, ValueError):
+            return get_import_result(path, args)
+        worker = self._idle.get() or self._start_worker()
+        try:
+            if not worker:
+                return get_import_result(path, args)
+            return ET.fromstring(worker.request(request, self._timeout))
+        except _WorkerDied, err:
+            raise DataError("Importing library '%s' failed: %s" % (path, err))
+        finally:
+            if worker:
+                self._stop(worker)
+            self._idle.put(self._start_worker())
+
+    def _start_worker(self):
+        if getattr(sys, 'frozen', False):
+            return None
+        try:
+            worker = _Worker()
+        except OSError:
+            return None
+        self._workers.add(worker)
+        return worker
+
+    def _stop(self, worker):
+        self._workers.discard(worker)
+        worker.stop()
+
+    def close(self):
+        for worker in list(self._workers):
+            self._stop(worker)
+
+
+class _WorkerDied(Exception):
+    pass
+
+
+class _Worker(object):
+    _script = os.path.splitext(os.path.abspath(__file__))[0] + '.py'
+
+    def __init__(self):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        self._devnull = open(os.devnull, 'w')
+        self._process = subprocess.Popen([sys.executable, self._script],
+                                         stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE,
+                                         stderr=self._devnull, env=env,
+                                         **self._hide_console())
+
+    def _hide_console(self):
+        if os.sep != '\\':
+            return {}
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        return {'startupinfo': startupinfo}
+
+    def request(self, request, timeout):
+        replies = Queue()
+        reader = threading.Thread(target=lambda: replies.put(
+                                        self._process.stdout.readline()))
+        reader.setDaemon(True)
+        reader.start()
+        try:
+            self._process.stdin.write(request + '\n')
+            self._process.stdin.close()
+        except IOError, err:
+            raise _WorkerDied(err)
+        try:
+            reply = replies.get(timeout=timeout)
+        except Empty:
+            raise _WorkerDied('No reply in %d seconds.' % timeout)
+        if not reply:
+            raise _WorkerDied('Worker process exited unexpectedly.')
+        reply = json.loads(reply)
+        if 'error' in reply:
+            raise DataError(reply['error'])
+        return reply['spec'].encode('UTF-8')
+
+    def stop(self):
+        if self._process.poll() is None:
+            try:
+                self._process.kill()
+            except OSError:
+                pass
+        self._process.wait()
+        self._devnull.close()
+
+
+def _serve(requests, replies):
+    request = json.loads(requests.readline() or 'null')
+    if not request:
+        return
+    sys.path[:] = request['pythonpath']
+    try:
+        spec = ET.tostring(get_import_result(request['path'], request['args']),
+                           encoding='UTF-8')
+        reply = {'spec': spec.decode('UTF-8')}
+    except Exception:
+        reply = {'error': get_error_message()}
+    replies.write(json.dumps(reply) + '\n')
+    replies.flush()
+
+
+LIBRARY_FETCHER = LibraryFetcher(workers=min(cpu_count(), 4))
+"""Global `LibraryFetcher` instance used by `LibrarySpec`."""
+
+
+if __name__ == '__main__':
+    from robot.output import LOGGER
+    LOGGER.disable_automatic_console_logger()
+    replies, sys.stdout = sys.stdout, sys.stderr
+    _serve(sys.stdin, replies)
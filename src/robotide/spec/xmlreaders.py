@@ -17,11 +17,11 @@ import sys
 from robot.errors import DataError
 from robot.running.namespace import Namespace
 
-from robotide.robotapi import TestLibrary as RobotTestLibrary
 from robotide.publish import RideLogException
 from robotide import utils
 
-from iteminfo import LibraryKeywordInfo, _XMLKeywordContent
+from iteminfo import LibraryKeywordInfo
+from libraryfetcher import LIBRARY_FETCHER
 
 
 class Spec(object):
@@ -42,7 +42,7 @@ class Spec(object):
         source_type = root.get('type')
         if source_type == 'resource':
             source_type += ' file'
-        keywords = [_XMLKeywordContent(node, self.name, source_type)
+        keywords = [LibraryKeywordInfo.from_xml(node, self.name, source_type)
                      for node in kw_nodes]
         return keywords, root.find('doc').text or ''
 
@@ -51,6 +51,7 @@ class LibrarySpec(Spec):
 
     _alias = None
     keywords = tuple()
+    source = None
     _library_import_by_path_endings = ('.py', '.java', '.class', '/', os.sep)
 
     def __init__(self, name, args=None):
@@ -69,9 +70,12 @@ class LibrarySpec(Spec):
 
     def _init_from_library(self, name, args):
         path = self._get_path(name.replace('/', os.sep), os.path.abspath('.'))
-        lib = RobotTestLibrary(path, args)
-        keywords = [LibraryKeywordInfo(kw).with_alias(self._alias) for kw in lib.handlers.values()]
-        return keywords, lib.doc
+        root = LIBRARY_FETCHER.fetch(path, args)
+        self.source = root.get('source') or None
+        source = self._alias or root.get('name')
+        keywords = [LibraryKeywordInfo.from_xml(node, source)
+                    for node in root.findall('kw')]
+        return keywords, root.find('doc').text or ''
 
     def _get_path(self, name, basedir):
         if not self._is_library_by_path(name):
@@ -0,0 +1,61 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import with_statement
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler(object):
+    """Measures how long the phases of RIDE startup take.
+
+    The report is written when `finish` is called, either to standard
+    output when `output` is '-' or to the file `output`. Without `output`
+    phases are measured but no report is written.
+    """
+
+    def __init__(self, output=None, clock=time.time):
+        self._output = output
+        self._clock = clock
+        self._started = clock()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.phases.append((name, self._clock() - started))
+
+    def report(self):
+        total = ('Total', self._clock() - self._started)
+        width = max(len(name) for name, _ in self.phases + [total])
+        return '\n'.join(['RIDE startup phases:'] +
+                         ['  %-*s %8.3f s' % (width, name, elapsed)
+                          for name, elapsed in self.phases + [total]]) + '\n'
+
+    def finish(self):
+        if not self._output:
+            return
+        if self._output == '-':
+            sys.stdout.write(self.report())
+            return
+        try:
+            with open(self._output, 'w') as output:
+                output.write(self.report())
+        except IOError, err:
+            sys.stderr.write("Writing startup profile to '%s' failed: %s\n"
+                             % (self._output, err))
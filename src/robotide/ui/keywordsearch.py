@@ -22,6 +22,7 @@ from robotide.pluginapi import (Plugin, ActionInfo, RideOpenSuite,
         RideOpenResource, RideImportSetting, RideUserKeyword, RideNewProject)
 from robotide.usages.UsageRunner import Usages
 from robotide import utils
+from robotide.utils.textindex import TextIndex
 from robotide.widgets import (PopupMenuItem, ButtonWithHandler, Label, Font,
         HtmlWindow)
 
@@ -35,7 +36,7 @@ class KeywordSearch(Plugin):
 
     def __init__(self, app):
         Plugin.__init__(self, app)
-        self.all_keywords = []
+        self._index = _KeywordIndex()
         self._criteria = _SearchCriteria()
         self.dirty = False
 
@@ -63,14 +64,18 @@ class KeywordSearch(Plugin):
 
     def _update(self):
         self.dirty = False
-        self.all_keywords = self.model.get_all_keywords()
+        self._index.update(self.model.get_all_keywords())
+
+    @property
+    def sources(self):
+        return self._index.sources
 
     def search(self, pattern, search_docs, source_filter):
         self._criteria = _SearchCriteria(pattern, search_docs, source_filter)
         return self._search()
 
     def _search(self):
-        return [ kw for kw in self.all_keywords if self._criteria.matches(kw) ]
+        return self._index.search(self._criteria)
 
     def _search_resource(self, item):
         if isinstance(item, (TestCaseFileController, ResourceFileController)):
@@ -85,30 +90,111 @@ class KeywordSearch(Plugin):
 class _SearchCriteria(object):
 
     def __init__(self, pattern='', search_docs=True, source_filter=ALL_KEYWORDS):
-        self._pattern = pattern
-        self._search_docs = search_docs
-        self._source_filter = source_filter
+        self.pattern = pattern
+        self.search_docs = search_docs
+        self.source_filter = source_filter
 
     def matches(self, kw):
         if not self._matches_source_filter(kw):
             return False
-        if self._contains(kw.name, self._pattern):
+        if self._contains(kw.name, self.pattern):
             return True
-        return self._search_docs and self._contains(kw.doc, self._pattern)
+        return self.search_docs and self._contains(kw.doc, self.pattern)
 
     def _matches_source_filter(self, kw):
-        if self._source_filter == ALL_KEYWORDS:
+        if self.source_filter == ALL_KEYWORDS:
             return True
-        if self._source_filter == ALL_USER_KEYWORDS and kw.is_user_keyword():
+        if self.source_filter == ALL_USER_KEYWORDS and kw.is_user_keyword():
             return True
-        if self._source_filter == ALL_LIBRARY_KEYWORDS and kw.is_library_keyword():
+        if self.source_filter == ALL_LIBRARY_KEYWORDS and kw.is_library_keyword():
             return True
-        return self._source_filter == kw.source
+        return self.source_filter == kw.source
 
     def _contains(self, string, pattern):
         return utils.normalize(pattern) in utils.normalize(string)
 
 
+class _KeywordIndex(object):
+    """Index of keywords matching `_SearchCriteria` without scanning them all.
+
+    Names and documentation are kept in `TextIndex` instances and keywords
+    are grouped by their source. `update` indexes only the keywords that
+    have been added or changed since the previous update.
+    """
+
+    def __init__(self):
+        self._names = TextIndex(utils.normalize)
+        self._docs = TextIndex(utils.normalize)
+        self._keywords = {}
+        self._signatures = {}
+        self._by_source = {}
+        self._user_keywords = set()
+        self._library_keywords = set()
+
+    def __len__(self):
+        return len(self._keywords)
+
+    @property
+    def sources(self):
+        return sorted(self._by_source)
+
+    def update(self, keywords):
+        current = set()
+        for kw in keywords:
+            key = (kw.name, kw.source)
+            current.add(key)
+            if self._signatures.get(key) == self._signature(kw):
+                self._keywords[key] = kw
+            else:
+                self._add(key, kw)
+        for key in set(self._keywords) - current:
+            self._remove(key)
+
+    def _signature(self, kw):
+        return kw.doc, kw.is_user_keyword(), kw.is_library_keyword()
+
+    def _add(self, key, kw):
+        self._remove(key)
+        self._keywords[key] = kw
+        self._signatures[key] = self._signature(kw)
+        self._names.add(key, kw.name)
+        self._docs.add(key, kw.doc)
+        self._by_source.setdefault(kw.source, set()).add(key)
+        if kw.is_user_keyword():
+            self._user_keywords.add(key)
+        if kw.is_library_keyword():
+            self._library_keywords.add(key)
+
+    def _remove(self, key):
+        kw = self._keywords.pop(key, None)
+        if kw is None:
+            return
+        del self._signatures[key]
+        self._names.remove(key)
+        self._docs.remove(key)
+        keys = self._by_source[kw.source]
+        keys.discard(key)
+        if not keys:
+            del self._by_source[kw.source]
+        self._user_keywords.discard(key)
+        self._library_keywords.discard(key)
+
+    def search(self, criteria):
+        keys = self._names.find(criteria.pattern)
+        if criteria.search_docs:
+            keys |= self._docs.find(criteria.pattern)
+        if criteria.source_filter != ALL_KEYWORDS:
+            keys &= self._keys_from_source(criteria.source_filter)
+        return [self._keywords[key] for key in keys]
+
+    def _keys_from_source(self, source_filter):
+        if source_filter == ALL_USER_KEYWORDS:
+            return self._user_keywords
+        if source_filter == ALL_LIBRARY_KEYWORDS:
+            return self._library_keywords
+        return self._by_source.get(source_filter, set())
+
+
 class KeywordSearchDialog(wx.Frame):
 
     def __init__(self, parent, searcher):
@@ -158,11 +244,7 @@ class KeywordSearchDialog(wx.Frame):
         sizer.Add(self._source_filter)
 
     def _get_sources(self):
-        sources = []
-        for kw in self._plugin.all_keywords:
-            if kw.source not in sources:
-                sources.append(kw.source)
-        return [ALL_KEYWORDS, ALL_USER_KEYWORDS, ALL_LIBRARY_KEYWORDS] + sorted(sources)
+        return [ALL_KEYWORDS, ALL_USER_KEYWORDS, ALL_LIBRARY_KEYWORDS] + self._plugin.sources
 
     def _add_keyword_list(self):
         self._list = _KeywordList(self, self._plugin)
@@ -186,6 +268,7 @@ class KeywordSearchDialog(wx.Frame):
         self.Bind(wx.EVT_SEARCHCTRL_SEARCH_BTN, self.OnSearch,
                   self._search_control)
         self.Bind(wx.EVT_TEXT_ENTER, self.OnSearch, self._search_control)
+        self.Bind(wx.EVT_TEXT, self.OnSearch, self._search_control)
         self.Bind(wx.EVT_ACTIVATE, self.OnActivate)
         self.Bind(wx.EVT_CLOSE, self.OnClose)
         self.Bind(wx.EVT_CHECKBOX, self.OnUseDocChange, self._use_doc)
@@ -319,12 +402,15 @@ class _KeywordData(list):
 
     def _sort_by_search(self, keywords, sort_order, search_criteria):
         search_criteria = search_criteria.lower()
-        starts_with = [kw for kw in keywords if kw.name.lower().startswith(search_criteria)]
-        name_contains = [kw for kw in keywords if (search_criteria in kw.name.lower()
-                                                   and kw not in starts_with)]
-        doc_contains = [kw for kw in keywords if (search_criteria in kw.details.lower()
-                                                  and kw not in starts_with
-                                                  and kw not in name_contains)]
+        starts_with, name_contains, doc_contains = [], [], []
+        for kw in keywords:
+            name = kw.name.lower()
+            if name.startswith(search_criteria):
+                starts_with.append(kw)
+            elif search_criteria in name:
+                name_contains.append(kw)
+            elif search_criteria in kw.details.lower():
+                doc_contains.append(kw)
         result = []
         for to_sort in (starts_with, name_contains, doc_contains):
             result.extend(self._sort_by_attr(to_sort, sort_order))
@@ -15,7 +15,8 @@
 import wx
 
 from robotide.action import ActionInfoCollection, ActionFactory
-from robotide.publish import RideSaveAll, RideClosing, RideSaved, PUBLISHER, RideInputValidationError
+from robotide.publish import RideSaveAll, RideClosing, RideSaved, PUBLISHER, RideInputValidationError,\
+    RideFileChangedOnDisk
 from robotide.utils import RideEventHandler
 from robotide.context import SETTINGS, ABOUT_RIDE
 from robotide.widgets import Dialog, ImageProvider, HtmlWindow
@@ -74,6 +75,7 @@ class RideFrame(wx.Frame, RideEventHandler):
     def _subscribe_messages(self):
         for listener, topic in [(lambda msg: self.SetStatusText('Saved %s' % msg.path), RideSaved),
                                 (lambda msg: self.SetStatusText('Saved all files'), RideSaveAll),
+                                (lambda msg: self.SetStatusText('Changed on disk %s' % msg.path), RideFileChangedOnDisk),
                                 (self._set_label, RideTreeSelection),
                                 (self._show_validation_error, RideInputValidationError),
                                 (self._show_modification_prevented_error, RideModificationPrevented)]:
@@ -25,8 +25,8 @@ class ProgressObserver(object):
                                               maximum=100, parent=frame,
                                               style=wx.PD_ELAPSED_TIME)
 
-    def notify(self):
-        self._progressbar.Pulse()
+    def notify(self, message=None):
+        self._progressbar.Pulse(message or '')
 
     def finish(self):
         self._progressbar.Destroy()
@@ -49,7 +49,7 @@ class RenameProgressObserver(ProgressObserver):
         ProgressObserver.__init__(self, frame, 'RIDE', 'Renaming')
         self._notification_occured = 0
 
-    def notify(self):
+    def notify(self, message=None):
         if time.time() - self._notification_occured > 0.1:
             self._progressbar.Pulse()
             self._notification_occured = time.time()
@@ -15,13 +15,12 @@
 import os
 import wx
 import wx.lib.mixins.listctrl as listmix
-import time
 import re
 from robotide.context.platform import IS_MAC
 from robotide.ui.searchdots import DottedSearch
 from robotide.widgets import ButtonWithHandler, Label
 from robotide.spec.iteminfo import LibraryKeywordInfo
-from robotide.usages.commands import FindUsages
+from robotide.usages.references import ReferenceCounter
 from robotide.controller.filecontrollers import DirectoryController, TestCaseFileController, ResourceFileController
 from threading import Thread
 
@@ -351,30 +350,20 @@ class ReviewRunner(object):
         Thread(target=self._run).start()
 
     def _run(self):
-        self._stop_requested = False
         self._model.status = 'listing datafiles'
-        for df in self._get_datafile_list():
-            libname = os.path.basename(df.source).rsplit('.', 1)[0]
-            self._model.status = 'searching from '+libname
-            for keyword in df.keywords:
-                time.sleep(0) # GIVE SPACE TO OTHER THREADS -- Thread.yield in Java
-                self._model.status = "%s.%s" % (libname, keyword.name)
-                if not self._model.searching:
-                    break
-                # Check if it is unused
-                if not isinstance(keyword, LibraryKeywordInfo) and keyword.name:
-                    if self._is_unused(keyword):
-                        self._model.add_unused_keyword(keyword)
-            if not self._model.searching:
-                break
+        keywords = [keyword for df in self._get_datafile_list()
+                    for keyword in df.keywords
+                    if not isinstance(keyword, LibraryKeywordInfo) and keyword.name]
+        table = ReferenceCounter(self._controller).count(
+            keywords, progress=self._set_status,
+            should_stop=lambda: not self._model.searching)
+        if table.complete:
+            for keyword in table.unused_keywords():
+                self._model.add_unused_keyword(keyword)
         self._model.end_search()
 
-    def _is_unused(self, keyword):
-        try:
-            self._controller.execute(FindUsages(keyword.name, keyword_info=keyword.info)).next()
-            return False
-        except StopIteration:
-            return True
+    def _set_status(self, status):
+        self._model.status = status
 
 
 class ResultFilter(object):
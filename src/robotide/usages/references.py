@@ -0,0 +1,143 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+
+from robotide import utils
+from robotide.controller.stepcontrollers import StepController, \
+    ForLoopStepController
+
+
+class ReferenceCounter(object):
+    """Counts references to user keywords in one pass over all data files.
+
+    A step or setting refers to a keyword when one of its cells has the name
+    of the keyword and, in the data file of the step, the name resolves to
+    the keyword's source or the data file is the source itself. This matches
+    what `FindUsages` finds, but the names used in each data file are
+    resolved only once and the steps are walked only once for all keywords.
+    """
+
+    def __init__(self, controller):
+        self._controller = controller
+
+    def count(self, keywords, progress=None, should_stop=None):
+        """Returns a `ReferenceTable` of the given user keyword controllers.
+
+        `progress` is called with a status message before each data file,
+        and the counting is stopped if `should_stop` returns True. In that
+        case the table is not `complete`.
+        """
+        table = ReferenceTable(keywords)
+        datafiles = list(self._controller.datafiles)
+        for index, df in enumerate(datafiles):
+            if should_stop and should_stop():
+                return table
+            if progress:
+                progress('counting references in %s (%d/%d)'
+                         % (df.display_name, index + 1, len(datafiles)))
+            self._count_datafile(df, table)
+        table.complete = True
+        return table
+
+    def _count_datafile(self, df, table):
+        own_source = os.path.basename(df.filename) if df.filename else None
+        sources = {}
+        for item in self._items_from(df):
+            references = set()
+            for name, value in self._names_used_by(item):
+                if name not in table.names:
+                    continue
+                if name not in sources:
+                    sources[name] = self._resolve(df, value)
+                references.add((name, sources[name]))
+                references.add((name, own_source))
+            for name, source in references:
+                table.add_reference(name, source)
+
+    def _items_from(self, df):
+        for setting in df.settings:
+            yield setting
+        for test in df.tests:
+            for item in test.settings:
+                yield item
+            for step in test.steps:
+                yield step
+        for kw in df.keywords:
+            for step in kw.steps:
+                yield step
+
+    def _names_used_by(self, item):
+        if isinstance(item, ForLoopStepController):
+            return
+        if not isinstance(item, StepController):
+            value = item.keyword_name or ''
+            yield utils.normalize(value), value
+            return
+        matcher = StepController._GIVEN_WHEN_THEN_MATCHER
+        for value in [item.keyword or ''] + item.args:
+            yield utils.normalize(value), value
+            if matcher.match(value):
+                value = matcher.sub('', value)
+                yield utils.normalize(value), value
+
+    def _resolve(self, df, name):
+        info = df.keyword_info(name)
+        return info.source if info else None
+
+
+class ReferenceTable(object):
+    """Reference counts of user keywords, created by `ReferenceCounter`."""
+
+    def __init__(self, keywords):
+        self._keywords = [(kw, self._key(kw)) for kw in keywords]
+        self._counts = dict((key, 0) for _, key in self._keywords)
+        self.names = set(name for name, _ in self._counts)
+        self.complete = False
+
+    def _key(self, keyword):
+        return utils.normalize(keyword.name), keyword.info.source
+
+    def add_reference(self, name, source):
+        key = (name, source)
+        if key in self._counts:
+            self._counts[key] += 1
+
+    def count_of(self, keyword):
+        """Returns the number of steps and settings referring to `keyword`."""
+        return self._counts[self._key(keyword)]
+
+    def unused_keywords(self):
+        return [kw for kw, key in self._keywords if not self._counts[key]]
+
+    def most_used_keywords(self, limit=None):
+        """Returns (keyword, count) pairs sorted by the count, largest first."""
+        counts = [(kw, self._counts[key]) for kw, key in self._keywords]
+        counts.sort(key=lambda pair: pair[1], reverse=True)
+        return counts[:limit] if limit else counts
+
+    def dead_datafiles(self):
+        """Returns the data files none of whose counted keywords is used.
+
+        Counting only the keywords of resource files gives the resource
+        files that could be removed.
+        """
+        used = set(kw.datafile_controller for kw, key in self._keywords
+                   if self._counts[key])
+        dead = []
+        for kw, _ in self._keywords:
+            df = kw.datafile_controller
+            if df not in used and df not in dead:
+                dead.append(df)
+        return dead
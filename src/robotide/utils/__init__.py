@@ -27,6 +27,7 @@ from variablematcher import is_variable, is_scalar_variable, is_list_variable, \
 from highlightmatcher import highlight_matcher
 from printing import Printing
 from htmlutils import html_escape
+from fileutils import replace_file
 
 def name_from_class(item, drop=None):
     cls = inspect.isclass(item) and item or item.__class__
@@ -37,10 +37,13 @@ class RideEventHandler(object):
 
     def _can_be_edited(self, event):
         ctrl = self.get_selected_datafile_controller()
-        if ctrl and ctrl.has_been_removed_from_disk():
+        if not (ctrl and ctrl.may_have_changed_on_disk()):
+            return True
+        if ctrl.has_been_removed_from_disk():
             return self._show_removed_from_disk_warning(ctrl, event)
-        if ctrl and ctrl.has_been_modified_on_disk():
+        if ctrl.has_been_modified_on_disk():
             return self._show_modified_on_disk_warning(ctrl, event)
+        ctrl.refresh_stat()
         return True
 
     def _show_removed_from_disk_warning(self, ctrl, event):
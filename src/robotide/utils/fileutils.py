@@ -0,0 +1,65 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import stat
+import tempfile
+
+
+def replace_file(path, content):
+    """Writes `content` to a temporary file and renames it over `path`.
+
+    The original file stays intact if writing fails. The permissions of the
+    original file are preserved.
+    """
+    handle, temp_path = tempfile.mkstemp(prefix='.%s' % os.path.basename(path),
+                                         dir=os.path.dirname(path) or '.')
+    try:
+        os.write(handle, content)
+        os.close(handle)
+        handle = None
+        os.chmod(temp_path, _mode_for(path))
+        try:
+            os.rename(temp_path, path)
+        except OSError:
+            # Renaming over an existing file is not possible on Windows
+            os.remove(path)
+            os.rename(temp_path, path)
+    except:
+        if handle is not None:
+            os.close(handle)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _mode_for(path):
+    if os.path.exists(path):
+        return stat.S_IMODE(os.stat(path).st_mode)
+    return _default_mode(os.path.dirname(path) or '.')
+
+
+def _default_mode(directory):
+    """Returns the mode new files get in `directory`.
+
+    The mode is found out by creating a file, because reading the umask
+    would require changing it for the whole process.
+    """
+    probe = tempfile.mktemp(prefix='.mode', dir=directory)
+    handle = os.open(probe, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0666)
+    try:
+        return stat.S_IMODE(os.fstat(handle).st_mode)
+    finally:
+        os.close(handle)
+        os.remove(probe)
@@ -0,0 +1,264 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Notices changes to files on disk in a background thread.
+
+On Linux, changes are noticed with inotify by watching the directories of
+the watched files. Elsewhere, and if inotify is not available, all watched
+files are polled in one batch at a fixed interval.
+"""
+
+from __future__ import with_statement
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import threading
+
+
+def stat_of(path):
+    """Returns (modification time, size) of a file or (0, 0) if not a file."""
+    if path and os.path.isfile(path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+    return 0, 0
+
+
+class FileWatcher(object):
+    """Tracks whether watched files have changed since they were refreshed.
+
+    `watch` records the current state of a file, and `is_changed` tells
+    whether a change has been noticed after that. Changes are noticed only
+    after `start` has been called. The listener given to `start` is called
+    with the path of every file noticed to change. It is called in the
+    watcher thread.
+    """
+
+    def __init__(self, poll_interval=2.0):
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._changed = set()
+        self._listener = None
+        self._backend = None
+        self._thread = None
+
+    def watch(self, path, stat=None):
+        """Starts watching `path` or refreshes its state if already watched.
+
+        `stat` is the current state of the file as returned by `stat_of`.
+        """
+        if not path:
+            return
+        key = self._key(path)
+        with self._lock:
+            self._stats[key] = stat if stat is not None else stat_of(path)
+            self._changed.discard(key)
+            backend = self._backend
+        if backend:
+            backend.add(key)
+
+    def unwatch(self, path):
+        if not path:
+            return
+        key = self._key(path)
+        with self._lock:
+            self._stats.pop(key, None)
+            self._changed.discard(key)
+
+    def clear(self):
+        """Stops watching all files."""
+        with self._lock:
+            self._stats.clear()
+            self._changed.clear()
+
+    def is_watched(self, path):
+        return bool(path) and self._key(path) in self._stats
+
+    def is_changed(self, path):
+        return bool(path) and self._key(path) in self._changed
+
+    def start(self, listener=None, backend=None):
+        """Starts noticing changes in a daemon thread."""
+        if self._thread:
+            return
+        self._listener = listener
+        self._backend = backend or _create_backend(self._poll_interval)
+        with self._lock:
+            paths = list(self._stats)
+        for path in paths:
+            self._backend.add(path)
+        self._thread = threading.Thread(target=self._run,
+                                        args=(self._backend,))
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def stop(self):
+        backend, self._backend = self._backend, None
+        if backend:
+            backend.interrupt()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if backend:
+            backend.close()
+
+    def _run(self, backend):
+        while self._backend is backend:
+            candidates = backend.wait_for_changes()
+            if candidates is None:
+                with self._lock:
+                    candidates = list(self._stats)
+            self._check(candidates)
+
+    def _check(self, paths):
+        for path in paths:
+            with self._lock:
+                if path not in self._stats or path in self._changed:
+                    continue
+                known = self._stats[path]
+            if stat_of(path) == known:
+                continue
+            with self._lock:
+                if self._stats.get(path) != known:
+                    continue
+                self._changed.add(path)
+            if self._listener:
+                self._listener(path)
+
+    def _key(self, path):
+        return os.path.normcase(os.path.abspath(path))
+
+
+def _create_backend(poll_interval):
+    if sys.platform.startswith('linux'):
+        try:
+            return _InotifyBackend()
+        except (OSError, AttributeError):
+            pass
+    return _PollingBackend(poll_interval)
+
+
+class _PollingBackend(object):
+    """Reports all watched files as candidates every `interval` seconds."""
+
+    def __init__(self, interval):
+        self._interval = interval
+        self._interrupted = threading.Event()
+
+    def add(self, path):
+        pass
+
+    def wait_for_changes(self):
+        self._interrupted.wait(self._interval)
+        return None
+
+    def interrupt(self):
+        self._interrupted.set()
+
+    def close(self):
+        pass
+
+
+class _InotifyBackend(object):
+    """Reports files in watched directories that inotify says have changed."""
+    _MASK = (0x2 |     # IN_MODIFY
+             0x4 |     # IN_ATTRIB
+             0x8 |     # IN_CLOSE_WRITE
+             0x40 |    # IN_MOVED_FROM
+             0x80 |    # IN_MOVED_TO
+             0x100 |   # IN_CREATE
+             0x200)    # IN_DELETE
+    _EVENT = struct.Struct('iIII')
+    _BATCH_DELAY = 0.05
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'),
+                                 use_errno=True)
+        self._fd = self._libc.inotify_init()
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init failed')
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        self._directories = {}
+        self._descriptors = {}
+        self._lock = threading.Lock()
+
+    def add(self, path):
+        directory = os.path.dirname(path)
+        with self._lock:
+            if directory in self._descriptors:
+                return
+            name = directory
+            if isinstance(name, unicode):
+                name = name.encode(sys.getfilesystemencoding())
+            descriptor = self._libc.inotify_add_watch(self._fd, name,
+                                                      self._MASK)
+            if descriptor >= 0:
+                self._directories[descriptor] = directory
+                self._descriptors[directory] = descriptor
+
+    def wait_for_changes(self):
+        ready = self._select()
+        if self._wakeup_read in ready:
+            return []
+        # Changes often come in bursts, e.g. when a file is saved
+        time.sleep(self._BATCH_DELAY)
+        return self._read_events()
+
+    def _select(self):
+        while True:
+            try:
+                return select.select([self._fd, self._wakeup_read], [], [])[0]
+            except select.error, err:
+                if err.args[0] != errno.EINTR:
+                    raise
+
+    def _read_events(self):
+        data = os.read(self._fd, 64 * 1024)
+        paths = set()
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            descriptor, _, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip('\0')
+            offset += length
+            with self._lock:
+                directory = self._directories.get(descriptor)
+            if directory is not None and name:
+                paths.add(os.path.join(directory, self._decode(directory, name)))
+        return paths
+
+    def _decode(self, directory, name):
+        if not isinstance(directory, unicode):
+            return name
+        try:
+            return name.decode(sys.getfilesystemencoding())
+        except UnicodeDecodeError:
+            return name
+
+    def interrupt(self):
+        os.write(self._wakeup_write, 'x')
+
+    def close(self):
+        for fd in self._fd, self._wakeup_read, self._wakeup_write:
+            os.close(fd)
+
+
+FILE_WATCHER = FileWatcher()
+"""Global `FileWatcher` instance tracking the loaded data files."""
@@ -0,0 +1,88 @@
+#  Copyright 2008-2012 Nokia Siemens Networks Oyj
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+
+def _lower(text):
+    return text.lower()
+
+
+class TextIndex(object):
+    """Inverted index for finding texts that contain a given pattern.
+
+    Every text is stored under a key after normalizing it with `normalize`,
+    and the trigrams of the normalized text are indexed. A query looks up
+    the keys that have all the trigrams of the normalized pattern and then
+    checks the stored texts of only those keys. Patterns shorter than a
+    trigram are checked against all stored texts.
+    """
+    _size = 3
+
+    def __init__(self, normalize=_lower):
+        self._normalize = normalize
+        self._texts = {}
+        self._grams = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, key):
+        return key in self._texts
+
+    def keys(self):
+        return self._texts.keys()
+
+    def add(self, key, text):
+        """Stores `text` under `key`, replacing the earlier text of the key."""
+        self.remove(key)
+        text = self._normalize(text or '')
+        self._texts[key] = text
+        for gram in self._grams_of(text):
+            self._grams.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for gram in self._grams_of(text):
+            keys = self._grams[gram]
+            keys.discard(key)
+            if not keys:
+                del self._grams[gram]
+
+    def find(self, pattern):
+        """Returns a set of the keys whose text contains `pattern`."""
+        pattern = self._normalize(pattern)
+        return set(key for key in self._candidates(pattern)
+                   if pattern in self._texts[key])
+
+    def find_prefix(self, pattern):
+        """Returns a set of the keys whose text starts with `pattern`."""
+        pattern = self._normalize(pattern)
+        return set(key for key in self._candidates(pattern)
+                   if self._texts[key].startswith(pattern))
+
+    def _candidates(self, pattern):
+        if len(pattern) < self._size:
+            return self._texts.keys()
+        postings = []
+        for gram in self._grams_of(pattern):
+            if gram not in self._grams:
+                return []
+            postings.append(self._grams[gram])
+        postings.sort(key=len)
+        return set.intersection(*postings)
+
+    def _grams_of(self, text):
+        return set(text[i:i+self._size]
+                   for i in range(len(text) - self._size + 1))
@@ -13,8 +13,10 @@
 #  limitations under the License.
 
 import os
+import shutil
+import tempfile
 import unittest
-from robot.utils.asserts import assert_true, assert_false
+from robot.utils.asserts import assert_true, assert_false, assert_equals
 
 import robotide.context
 from robotide import utils
@@ -29,6 +31,7 @@ robotide.context.LOG = LOGGER
 
 
 from robotide.application.pluginloader import PluginLoader
+from robotide.application import pluginconnector
 from robotide.log import LogPlugin
 
 from resources import FakeApplication, FakeSettings
@@ -83,5 +86,66 @@ class TestPluginLoader(unittest.TestCase):
         return None
 
 
+class _DisabledSettings(object):
+    def __getitem__(self, name):
+        return self
+    add_section = lambda self, name: self
+    get = lambda self, name, default: False
+    set = lambda self, name, value: None
+
+
+class TestPluginManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.plugins_dir = [os.path.join(os.path.dirname(__file__),
+                                         'plugins_for_loader')]
+        self.tmpdir = tempfile.mkdtemp()
+        self.manifest = os.path.join(self.tmpdir, 'manifest.json')
+        self.app = FakeApplication()
+        self._load()
+        self._orig_settings = pluginconnector.SETTINGS
+        pluginconnector.SETTINGS = _DisabledSettings()
+
+    def tearDown(self):
+        pluginconnector.SETTINGS = self._orig_settings
+        shutil.rmtree(self.tmpdir)
+
+    def _load(self):
+        loader = PluginLoader(self.app, self.plugins_dir, [LogPlugin],
+                              self.manifest)
+        self.app.get_plugins = lambda: loader.plugins
+        return loader
+
+    def test_disabled_plugins_are_loaded_only_when_requested(self):
+        loader = self._load()
+        assert_equals([p.name for p in loader.plugins], ['Log'])
+        loader.load_deferred_plugins()
+        assert_equals(sorted(p.name for p in loader.plugins),
+                      ['Example Plugin 1', 'Example Plugin 2',
+                       'Example Plugin 3', 'Log'])
+        assert_false(any(p.enabled for p in loader.plugins))
+
+    def test_changed_files_are_loaded(self):
+        path = os.path.join(self.plugins_dir[0], 'also_plugins.py')
+        os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 1))
+        try:
+            loader = self._load()
+        finally:
+            os.utime(path, (os.path.getatime(path), os.path.getmtime(path) - 1))
+        assert_equals([p.name for p in loader.plugins],
+                      ['Log', 'Example Plugin 3'])
+
+    def test_unexpected_manifest_content_is_ignored(self):
+        for content in ['[]', '{"path": []}', '{"path": {"stat": 1}}',
+                        '{"path": {"stat": [1, 2], "plugins": [1]}}']:
+            open(self.manifest, 'w').write(content)
+            loader = self._load()
+            assert_equals(len(loader.plugins), 4, content)
+
+    def test_manifest_without_path_loads_all_plugins(self):
+        loader = PluginLoader(self.app, self.plugins_dir, [LogPlugin])
+        assert_equals(len(loader.plugins), 4)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from robot.utils.asserts import assert_equals, assert_false, assert_true
+
+from robotide.contrib.searchindex import SearchIndex
+from robotide.controller.commands import ChangeCellValue
+
+from datafilereader import construct_chief_controller, OCCURRENCES_PATH
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.chief = construct_chief_controller(OCCURRENCES_PATH)
+        self.index = SearchIndex()
+        self.index.refresh(self.chief.all_testcases)
+
+    def _tests(self):
+        return list(self.chief.all_testcases())
+
+    def _scan(self, pattern, exact_match):
+        hits = []
+        for test in self._tests():
+            for setting in test.settings:
+                for column, value in enumerate(setting.as_list()):
+                    hits.append((test, setting.label, -1, column, value))
+            for row, step in enumerate(test.steps):
+                for column, value in enumerate(step.as_list()):
+                    hits.append((test, None, row, column, value))
+        pattern = pattern.lower()
+        if exact_match:
+            return [hit for hit in hits if hit[-1].strip().lower() == pattern]
+        return [hit for hit in hits if pattern in hit[-1].strip().lower()]
+
+    def _find(self, pattern, exact_match):
+        return [(test.data, label, row, column, value) for
+                test, label, row, column, value in
+                self.index.find_cells(pattern, exact_match)]
+
+    def _assert_same_as_scan(self, pattern, exact_match):
+        expected = [(hit[0].data,) + hit[1:]
+                    for hit in self._scan(pattern, exact_match)]
+        assert_equals(self._find(pattern, exact_match), expected)
+
+    def test_find_cells(self):
+        for pattern in ['None Keyword', 'my keyword', 'keyword', 'o', 'LOG',
+                        '[Documentation]', 'no match', '']:
+            for exact_match in True, False:
+                self._assert_same_as_scan(pattern, exact_match)
+
+    def test_changed_test_is_indexed_again(self):
+        test = self._tests()[0]
+        test.execute(ChangeCellValue(0, 0, 'New Keyword'))
+        self.index.test_changed(test)
+        self.index.refresh(self.chief.all_testcases)
+        assert_equals([hit[2:] for hit in self._find('new keyword', True)],
+                      [(0, 0, 'New Keyword')])
+        self._assert_same_as_scan('my keyword', True)
+        self._assert_same_as_scan('keyword', False)
+
+    def test_removed_test_is_not_found(self):
+        test = self._tests()[0]
+        self.index.test_removed(test)
+        self.index.refresh(self.chief.all_testcases)
+        assert_false(any(hit[0] is test.data
+                         for hit in self._find('keyword', False)))
+
+    def test_invalidate_indexes_all_tests_again(self):
+        test = self._tests()[1]
+        test.execute(ChangeCellValue(0, 0, 'New Keyword'))
+        self.index.invalidate()
+        self.index.refresh(self.chief.all_testcases)
+        self._assert_same_as_scan('new keyword', True)
+        self._assert_same_as_scan('keyword', False)
+
+    def test_refresh_can_be_stopped_and_continued(self):
+        index = SearchIndex()
+        assert_false(index.refresh(self.chief.all_testcases, lambda: True))
+        assert_equals(index.find_cells('my keyword', True), [])
+        assert_true(index.refresh(self.chief.all_testcases))
+        assert_equals(len(index.find_cells('my keyword', True)), 3)
+
+    def test_find_tags(self):
+        first, second, third = self._tests()
+        third.tags.set_value('Smoke | regression')
+        first.tags.set_value('smoke')
+        for test in first, third:
+            self.index.test_changed(test)
+        self.index.refresh(self.chief.all_testcases)
+        assert_equals(self.index.find_tags('SMOKE', True),
+                      [(first, ['smoke']), (third, ['Smoke', 'regression'])])
+        assert_equals(self.index.find_tags('gress', False),
+                      [(third, ['Smoke', 'regression'])])
+        assert_equals(self.index.find_tags('gress', True), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
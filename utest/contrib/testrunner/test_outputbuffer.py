@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from robot.utils.asserts import assert_equals, assert_none
+
+from robotide.contrib.testrunner.outputbuffer import OutputBuffer
+
+
+class TestOutputBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self.buffer = OutputBuffer(max_lines=3, spill_dir=self._tmpdir)
+
+    def tearDown(self):
+        self.buffer.clear()
+        shutil.rmtree(self._tmpdir)
+
+    def test_output_is_coalesced_by_source(self):
+        self.buffer.append('foo', 'stdout')
+        self.buffer.append('bar\n', 'stdout')
+        self.buffer.append('error\n', 'stderr')
+        self.buffer.append('zap', 'stdout')
+        assert_equals(self.buffer.take_pending(),
+                      (0, [('foobar\n', 'stdout'), ('error\n', 'stderr'),
+                           ('zap', 'stdout')]))
+        assert_equals(self.buffer.take_pending(), (0, []))
+
+    def test_lines_over_limit_are_dropped_and_spilled(self):
+        self.buffer.append('1\n2\n3\n4\n')
+        self.buffer.append('5\n6')
+        assert_equals(self.buffer.take_pending()[0], 2)
+        self.buffer.clear()
+        assert_equals(open(self._spill_path()).read(), '1\n2\n')
+
+    def _spill_path(self):
+        files = os.listdir(self._tmpdir)
+        assert_equals(len(files), 1)
+        return os.path.join(self._tmpdir, files[0])
+
+    def test_spill_is_reopened_after_close(self):
+        self.buffer.append('1\n2\n3\n4\n')
+        self.buffer.close()
+        assert_equals(open(self._spill_path()).read(), '1\n')
+        self.buffer.append('5\n')
+        self.buffer.close()
+        assert_equals(open(self._spill_path()).read(), '1\n2\n')
+
+    def test_nothing_is_spilled_under_limit(self):
+        self.buffer.append('1\n2\n3\n')
+        assert_equals(self.buffer.take_pending()[0], 0)
+        assert_none(self.buffer.spill_path)
+
+    def test_report_and_log_are_detected_from_complete_lines(self):
+        self.buffer.append('Output:  /tmp/output.xml\nLog:     /tmp/lo')
+        assert_none(self.buffer.log_file)
+        self.buffer.append('g.html\nReport:  /tmp/report.html\n')
+        assert_equals(self.buffer.log_file, '/tmp/log.html')
+        assert_equals(self.buffer.report_file, '/tmp/report.html')
+        self.buffer.clear()
+        assert_none(self.buffer.report_file)
+
+    def test_last_char(self):
+        assert_equals(self.buffer.last_char, '')
+        self.buffer.append('foo\n')
+        assert_equals(self.buffer.last_char, '\n')
+        self.buffer.append('bar')
+        assert_equals(self.buffer.last_char, 'r')
+
+
+if __name__ == '__main__':
+    unittest.main()
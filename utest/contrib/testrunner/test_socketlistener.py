@@ -0,0 +1,84 @@
+import json
+import socket
+import unittest
+from StringIO import StringIO
+from robot.utils.asserts import assert_equals, assert_raises
+
+from robotide.contrib.testrunner import SocketListener as listener_module
+from robotide.contrib.testrunner.SocketListener import SocketListener,\
+    encode_frame, read_frames, STREAM, _encode
+
+
+class TestFrames(unittest.TestCase):
+
+    def test_encode_and_read_frames(self):
+        events = [('start_test', (u'T\xe4st', {'longname': 'Suite.Test'})),
+                  ('pid', (42,))]
+        stream = StringIO(encode_frame(events) + encode_frame(events[:1]))
+        assert_equals(list(read_frames(stream)),
+                      [[('start_test', (u'T\xe4st', {u'longname': u'Suite.Test'})),
+                        ('pid', (42,))],
+                       [('start_test', (u'T\xe4st', {u'longname': u'Suite.Test'}))]])
+
+    def test_truncated_frame_ends_reading(self):
+        frame = encode_frame([('close', ())])
+        assert_equals(list(read_frames(StringIO(frame[:-1]))), [])
+
+    def test_invalid_frame(self):
+        assert_raises(ValueError, list, read_frames(StringIO('\xff' * 8)))
+
+
+class TestBuiltinEncoder(unittest.TestCase):
+
+    def test_encoding_matches_json_module(self):
+        value = [None, True, False, 42, 10L ** 20, 1.5, -0.25,
+                 'tab\tand "quotes" \\ ', u'T\xe4st \u20ac \U0001d11e',
+                 '\xc3\xa4\x00\x1f\x7f', ('tuple', [1, {}]),
+                 {'key': {u'\xe4': ['value']}}, ValueError('error')]
+        assert_equals(json.loads(_encode(value)),
+                      json.loads(json.dumps(value, default=unicode)))
+
+    def test_output_is_ascii(self):
+        assert_equals(_encode(u'\xe4\n'), '"\\u00e4\\n"')
+        assert_equals(type(_encode(u'\xe4')), str)
+
+
+class TestSocketListener(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('localhost', 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self._interval = listener_module.BATCH_INTERVAL
+        listener_module.BATCH_INTERVAL = 60
+
+    def tearDown(self):
+        listener_module.BATCH_INTERVAL = self._interval
+        self.server.close()
+
+    def test_every_event_is_sent_by_default(self):
+        events = self._run(SocketListener(self.port))
+        assert_equals([len(batch) for batch in events], [1] * 5)
+        assert_equals([batch[0][0] for batch in events],
+                      ['pid', 'start_test', 'start_keyword', 'end_test', 'close'])
+
+    def test_streaming_batches_events_and_skips_keywords(self):
+        events = self._run(SocketListener('localhost', self.port, STREAM))
+        assert_equals([[name for name, _ in batch] for batch in events],
+                      [['pid', 'start_test', 'end_test', 'close']])
+
+    def _run(self, listener):
+        connection, _ = self.server.accept()
+        listener.start_test('Test', {'longname': 'Suite.Test'})
+        listener.start_keyword('Log', {'args': ['message']})
+        listener.end_test('Test', {'longname': 'Suite.Test', 'status': 'PASS'})
+        listener.close()
+        try:
+            return list(read_frames(connection.makefile('rb')))
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
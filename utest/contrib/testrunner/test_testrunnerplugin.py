@@ -0,0 +1,73 @@
+import unittest
+from robot.utils.asserts import assert_equals, assert_true
+
+from robotide.pluginapi import plugin
+from robotide.ui.notebook import NoteBook
+from robotide.contrib.testrunner.testrunnerplugin import TestRunnerPlugin
+
+from resources import PYAPP_REFERENCE, FakeApplication, TestSettingsHelper
+
+# wx needs to imported last so that robotide can select correct wx version.
+import wx
+
+
+class _FakeAction(object):
+    enable = disable = unregister = lambda self: None
+
+
+class _FakeActions(object):
+
+    def register_action(self, action_info):
+        return _FakeAction()
+
+
+class _FakeFrame(object):
+
+    def __init__(self, application):
+        self.window = wx.Frame(None)
+        self.notebook = NoteBook(self.window, application)
+        self.actions = _FakeActions()
+
+
+class TestTestRunnerPlugin(TestSettingsHelper):
+
+    def setUp(self):
+        TestSettingsHelper.setUp(self)
+        self._orig_plugin_settings = plugin.SETTINGS
+        self.settings.add_section('Plugins')
+        plugin.SETTINGS = self.settings
+        self.app = FakeApplication()
+        self.app.frame = _FakeFrame(self.app)
+        self.plugin = TestRunnerPlugin(self.app)
+
+    def tearDown(self):
+        self.plugin.disable()
+        self.app.frame.window.Destroy()
+        plugin.SETTINGS = self._orig_plugin_settings
+        TestSettingsHelper.tearDown(self)
+
+    def test_enable_adds_run_tab(self):
+        self.plugin.enable()
+        notebook = self.app.frame.notebook
+        assert_true(notebook.GetPageIndex(self.plugin.panel) >= 0)
+        assert_equals(self.plugin.out.GetText(), '')
+
+    def test_output_is_shown_in_console(self):
+        self.plugin.enable()
+        self.plugin._output('first\nsecond\n')
+        self.plugin._flush_output()
+        assert_equals(self.plugin.out.GetText(), 'first\nsecond\n')
+
+    def test_burst_over_limit_keeps_console_in_sync(self):
+        self.plugin.save_setting('output_max_lines', 3)
+        self.plugin.enable()
+        self.plugin._output(''.join('line %d\n' % i for i in range(10)))
+        self.plugin._flush_output()
+        assert_equals(self.plugin.out.GetText(), 'line 7\nline 8\nline 9\n')
+        self.plugin._output('line 10\n')
+        self.plugin._flush_output()
+        assert_equals(self.plugin.out.GetText(), 'line 8\nline 9\nline 10\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
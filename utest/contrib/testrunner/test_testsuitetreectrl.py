@@ -0,0 +1,75 @@
+import unittest
+from robot.utils.asserts import assert_equals, assert_false, assert_true
+
+from robotide.contrib.testrunner.TestSuiteTreeCtrl import TestSuiteTreeCtrl
+
+from resources import PYAPP_REFERENCE
+from datafilereader import construct_chief_controller, OCCURRENCES_PATH
+
+# wx needs to imported last so that robotide can select correct wx version.
+import wx
+
+
+SUITE = 'Simple Testsuite With Different Namespaces'
+TEST1 = SUITE + '.TestSuite1.My Test'
+TEST2 = SUITE + '.TestSuite2.My Other Test'
+
+
+class TestTestSuiteTreeCtrl(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = wx.Frame(None)
+        self.tree = TestSuiteTreeCtrl(self.frame)
+        self.model = construct_chief_controller(OCCURRENCES_PATH)
+        self.tree.SetDataModel(self.model)
+        self.tree.Redraw()
+
+    def tearDown(self):
+        self.frame.Destroy()
+
+    def test_test_nodes_are_not_created_until_file_suite_is_expanded(self):
+        assert_equals(sorted(self.tree._nodes),
+                      [SUITE, SUITE + '.TestSuite1', SUITE + '.TestSuite2'])
+        assert_equals(len(self.tree.GetUncheckedTests()), 3)
+
+    def test_failed_tests(self):
+        self.tree.running_test(TEST1)
+        self.tree.test_failed(TEST1)
+        self.tree.test_passed(TEST2)
+        assert_equals(self.tree.GetFailedTests(), [TEST1])
+        self.tree.SelectAllFailed()
+        assert_equals(self.tree.GetCheckedTestsByName(),
+                      [(SUITE + '.TestSuite1', 'My Test')])
+        self.tree.Reset()
+        assert_equals(self.tree.GetFailedTests(), [])
+
+    def test_checked_tests_are_kept_over_redraw(self):
+        self.tree.SelectAll()
+        assert_equals(sorted(self.tree.GetCheckedTests()), ['My Other Test', 'My Test', 'My Test'])
+        self.tree.Redraw()
+        assert_equals(len(self.tree.GetCheckedTests()), 3)
+        self.tree.DeselectAll()
+        assert_equals(self.tree.GetCheckedTests(), [])
+        assert_equals(len(self.tree.GetUncheckedTests()), 3)
+
+    def test_failed_test_renamed_before_redraw(self):
+        self.tree.test_failed(TEST1)
+        self.tree.test_failed(TEST2)
+        self.model.datafiles[1].tests[0].rename('Renamed Test')
+        self.tree.Redraw()
+        assert_equals(self.tree.GetFailedTests(), [TEST2])
+        self.tree.SelectAllFailed()
+        assert_equals(self.tree.GetCheckedTestsByName(),
+                      [(SUITE + '.TestSuite2', 'My Other Test')])
+        assert_false(TEST1 in self.tree._states)
+
+    def test_states_of_tests_without_nodes(self):
+        self.tree.suite_failed(SUITE + '.TestSuite1')
+        self.tree.test_failed(SUITE + '.Unknown.Test')
+        assert_equals(self.tree.GetFailedTests(), [])
+        assert_true(SUITE + '.TestSuite1' in self.tree._states)
+        assert_false(TEST1 in self.tree._nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,8 @@ from robotide.controller.filecontrollers import (TestCaseFileController,
                                                  TestDataDirectoryController,
                                                  ResourceFileController)
 from robotide.controller import ChiefController
+from robotide.controller.commands import RenameFile
+from robotide.utils.filewatcher import FILE_WATCHER
 from robotide.publish.messages import RideDataFileRemoved
 from robotide.publish import PUBLISHER
 import shutil
@@ -141,5 +143,42 @@ class TestDataFileRemoval(_DataDependentTest):
         assert_true(chief.data.has_format() is False, chief.data.data.initfile)
 
 
+class TestWatchedFiles(_DataDependentTest):
+
+    def setUp(self):
+        _DataDependentTest.setUp(self)
+        self.chief = ChiefController(Namespace())
+
+    def _create_controller(self):
+        return TestCaseFileController(TestCaseFile(source=self._filepath).populate(),
+                                      self.chief)
+
+    def test_loaded_file_is_watched(self):
+        self._create_controller()
+        assert_true(FILE_WATCHER.is_watched(self._filepath))
+
+    def test_old_path_is_not_watched_after_rename(self):
+        ctrl = self._create_controller()
+        RenameFile('renamed').execute(ctrl)
+        assert_false(FILE_WATCHER.is_watched(self._filepath))
+        assert_true(FILE_WATCHER.is_watched(ctrl.filename))
+
+    def test_old_path_is_not_watched_after_format_change(self):
+        ctrl = self._create_controller()
+        ctrl.save_with_new_format('tsv')
+        assert_false(FILE_WATCHER.is_watched(self._filepath))
+        assert_true(FILE_WATCHER.is_watched(ctrl.filename))
+
+    def test_removed_file_is_not_watched(self):
+        ctrl = self._create_controller()
+        ctrl.remove_from_filesystem()
+        assert_false(FILE_WATCHER.is_watched(self._filepath))
+
+    def test_files_of_previous_project_are_not_watched(self):
+        self._create_controller()
+        self.chief.new_file_project(os.path.join(self._dirpath, 'new.txt'))
+        assert_false(FILE_WATCHER.is_watched(self._filepath))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -141,6 +141,16 @@ class FindOccurrencesWithFiles(unittest.TestCase):
         assert_equals(sum(1 for _ in ctrl.execute(FindOccurrences(kw_name))), count)
 
 
+class FindOccurrencesAfterModificationsTest(unittest.TestCase):
+
+    def test_modified_steps_are_found(self):
+        test_ctrl, _ = TestCaseControllerWithSteps()
+        assert_equals(len(list(test_ctrl.execute(FindOccurrences('New Kw')))), 0)
+        test_ctrl.execute(ChangeCellValue(0, 0, 'New Kw'))
+        assert_occurrence(test_ctrl, 'New Kw', TEST1_NAME, 'Steps')
+        assert_equals(len(list(test_ctrl.execute(FindOccurrences(STEP1_KEYWORD)))), 1)
+
+
 class FindOccurrencesTest(unittest.TestCase):
 
     @classmethod
@@ -0,0 +1,145 @@
+import os
+import stat
+import shutil
+import tempfile
+import unittest
+from robot.parsing.model import TestCaseFile
+from robot.utils.asserts import assert_equals, assert_true, assert_false, \
+    assert_raises_with_msg
+
+from robotide.controller.chiefcontroller import ChiefController, Serializer
+from robotide.controller.commands import RenameFile
+from robotide.controller.filecontrollers import TestCaseFileController
+from robotide.namespace import Namespace
+
+
+class _RecordingLogger(object):
+
+    def __init__(self):
+        self.errors = []
+
+    def error(self, msg=''):
+        self.errors.append(msg)
+
+
+class TestSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self._dirpath = tempfile.mkdtemp()
+        self._logger = _RecordingLogger()
+        self._serializer = Serializer({'line separator': 'lf'}, self._logger,
+                                      workers=2)
+
+    def tearDown(self):
+        shutil.rmtree(self._dirpath)
+
+    def _create_controller(self, name, chief=None):
+        path = os.path.join(self._dirpath, name)
+        open(path, 'w').write('*** Test Cases ***\nTest\n    No Operation\n')
+        return TestCaseFileController(TestCaseFile(source=path).populate(),
+                                      chief)
+
+    def _add_test(self, controller, name):
+        controller.tests.new(name)
+        controller.mark_dirty()
+
+    def _read(self, controller):
+        return open(controller.filename).read()
+
+    def test_all_files_are_saved(self):
+        controllers = [self._create_controller('test%d.txt' % i)
+                       for i in range(5)]
+        for ctrl in controllers:
+            self._add_test(ctrl, 'New in %s' % ctrl.name)
+        self._serializer.serialize_files(controllers)
+        for ctrl in controllers:
+            assert_true('New in %s' % ctrl.name in self._read(ctrl))
+            assert_false(ctrl.dirty)
+        assert_equals(len(self._serializer.results), 5)
+        assert_equals(sorted(os.listdir(self._dirpath)),
+                      ['test%d.txt' % i for i in range(5)])
+
+    def test_file_with_unchanged_content_is_not_written(self):
+        ctrl = self._create_controller('test.txt')
+        self._serializer.serialize_file(ctrl)
+        inode = os.stat(ctrl.filename).st_ino
+        ctrl.mark_dirty()
+        self._serializer.serialize_file(ctrl)
+        assert_true(self._serializer.results[0].skipped)
+        assert_equals(os.stat(ctrl.filename).st_ino, inode)
+        assert_false(ctrl.dirty)
+
+    def test_original_file_is_kept_when_rendering_fails(self):
+        ctrl = self._create_controller('test.txt')
+        original = self._read(ctrl)
+        def fail(**options):
+            raise IOError('Rendering failed')
+        ctrl.datafile.save = fail
+        ctrl.mark_dirty()
+        assert_raises_with_msg(IOError, 'Rendering failed',
+                               self._serializer.serialize_file, ctrl)
+        assert_equals(self._read(ctrl), original)
+        assert_true(ctrl.dirty)
+        assert_true('Rendering failed' in self._logger.errors[0])
+        assert_equals(os.listdir(self._dirpath), ['test.txt'])
+
+    def test_other_files_are_saved_when_one_fails(self):
+        controllers = [self._create_controller('test%d.txt' % i)
+                       for i in range(3)]
+        for ctrl in controllers:
+            self._add_test(ctrl, 'New')
+        def fail(**options):
+            raise IOError('Rendering failed')
+        controllers[1].datafile.save = fail
+        assert_raises_with_msg(IOError, 'Rendering failed',
+                               self._serializer.serialize_files, controllers)
+        assert_equals([ctrl.dirty for ctrl in controllers],
+                      [False, True, False])
+        assert_equals(len(self._logger.errors), 1)
+
+    def test_old_file_is_kept_when_saving_renamed_file_fails(self):
+        chief = ChiefController(Namespace())
+        chief._serializer = self._serializer
+        ctrl = self._create_controller('test.txt', chief)
+        original = self._read(ctrl)
+        def fail(**options):
+            raise IOError('Rendering failed')
+        ctrl.datafile.save = fail
+        assert_raises_with_msg(IOError, 'Rendering failed',
+                               RenameFile('renamed').execute, ctrl)
+        assert_equals(os.listdir(self._dirpath), ['test.txt'])
+        assert_equals(open(os.path.join(self._dirpath, 'test.txt')).read(),
+                      original)
+
+    def test_file_permissions_are_preserved(self):
+        ctrl = self._create_controller('test.txt')
+        os.chmod(ctrl.filename, 0640)
+        self._add_test(ctrl, 'New')
+        self._serializer.serialize_file(ctrl)
+        assert_equals(stat.S_IMODE(os.stat(ctrl.filename).st_mode), 0640)
+
+    def test_new_file_gets_default_permissions(self):
+        ctrl = self._create_controller('test.txt')
+        os.remove(ctrl.filename)
+        ctrl.mark_dirty()
+        umask = os.umask(0022)
+        try:
+            self._serializer.serialize_file(ctrl)
+        finally:
+            os.umask(umask)
+        assert_equals(stat.S_IMODE(os.stat(ctrl.filename).st_mode), 0644)
+        assert_equals(os.listdir(self._dirpath), ['test.txt'])
+
+    def test_saving_in_calling_thread(self):
+        serializer = Serializer({}, self._logger, workers=1)
+        controllers = [self._create_controller('test%d.txt' % i)
+                       for i in range(2)]
+        for ctrl in controllers:
+            self._add_test(ctrl, 'New')
+        serializer.serialize_files(controllers)
+        assert_equals([job.path for job in serializer.results],
+                      [ctrl.filename for ctrl in controllers])
+
+
+if __name__ == '__main__':
+    unittest.main()
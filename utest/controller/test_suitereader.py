@@ -0,0 +1,52 @@
+import os
+import unittest
+from robot.parsing.model import TestData
+from robot.utils.asserts import assert_equals, assert_true
+
+from robotide.controller.suitereader import SuiteReader, read_rows
+
+from resources import SUITEPATH
+
+
+def _dump(datafile):
+    tables = []
+    for table in datafile:
+        if table.type in ('test case', 'keyword'):
+            tables.append([(item.name, [step.as_list() for step in item.steps])
+                           for item in table])
+        else:
+            tables.append([item.as_list() for item in table])
+    initfile = getattr(datafile, 'initfile', None)
+    return (datafile.name, datafile.source, initfile, tables,
+            [_dump(child) for child in datafile.children])
+
+
+class TestSuiteReader(unittest.TestCase):
+
+    def test_reading_in_workers_equals_reading_in_process(self):
+        progress = []
+        suite = SuiteReader(workers=2, min_files=1).read(
+            SUITEPATH, lambda read, total: progress.append((read, total)))
+        assert_equals(_dump(suite), _dump(TestData(source=SUITEPATH)))
+        assert_true(progress)
+        assert_equals(progress[-1][0], progress[-1][1])
+
+    def test_files_are_read_in_process_when_workers_do_not_reply(self):
+        suite = SuiteReader(workers=2, min_files=1, timeout=0).read(SUITEPATH)
+        assert_equals(_dump(suite), _dump(TestData(source=SUITEPATH)))
+
+    def test_small_directories_are_read_in_process(self):
+        progress = []
+        suite = SuiteReader(workers=2, min_files=1000).read(
+            SUITEPATH, lambda read, total: progress.append((read, total)))
+        assert_equals(_dump(suite), _dump(TestData(source=SUITEPATH)))
+        assert_equals(progress, [])
+
+    def test_read_rows(self):
+        rows = read_rows(os.path.join(SUITEPATH, 'subsuite', '__init__.tsv'))
+        assert_true(rows[0][0])
+        assert_true(all(isinstance(cells, list) for _, cells in rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from robot.parsing.model import TestCaseFile
+from robot.utils.asserts import assert_equals, assert_none
+
+from robotide.controller.symbols import DatafileSymbols
+
+
+class TestDatafileSymbols(unittest.TestCase):
+
+    def setUp(self):
+        self.tcf = TestCaseFile()
+        self.tcf.setting_table.suite_setup.name = 'Suite Setup Kw'
+        self.tcf.variable_table.add('${table var}', 'value ${other var}')
+        self.test = self.tcf.testcase_table.add('Test')
+        self.test.add_step(['${result}=', 'Given My Keyword', '@{list var}[0]'])
+        for_loop = self.test.add_for_loop([': FOR', '${i}', 'IN', '${X}'])
+        for_loop.add_step(['Loop Keyword', '${i.attr}'])
+        self.kw = self.tcf.keyword_table.add('My Keyword')
+        self.kw.args.value = ['${arg}']
+        self.kw.add_step(['Log', 'Prefix ${ARG} suffix'])
+        self.symbols = DatafileSymbols(self.tcf)
+
+    def test_keywords(self):
+        assert_equals(self.symbols.find_keyword('Suite setup KW'),
+                      set([self.tcf]))
+        assert_equals(self.symbols.find_keyword('mykeyword'),
+                      set([self.test, self.kw]))
+        assert_equals(self.symbols.find_keyword('Loop Keyword'),
+                      set([self.test]))
+        assert_equals(self.symbols.find_keyword('Unknown'), set())
+
+    def test_variables(self):
+        assert_equals(self.symbols.find_variable('${Table Var}'),
+                      set([self.tcf]))
+        assert_equals(self.symbols.find_variable('${other var}'),
+                      set([self.tcf]))
+        assert_equals(self.symbols.find_variable('@{list var}'),
+                      set([self.test]))
+        assert_equals(self.symbols.find_variable('${x}'), set([self.test]))
+        assert_equals(self.symbols.find_variable('${arg}'), set([self.kw]))
+        assert_equals(self.symbols.find_variable('${i}'), set([self.test]))
+        assert_equals(self.symbols.find_variable('${i.attr}'),
+                      set([self.test]))
+        assert_equals(self.symbols.find_variable('${unknown}'), set())
+
+    def test_names_not_in_index(self):
+        assert_none(self.symbols.find_variable('Keyword with ${embedded} arg'))
+        assert_none(self.symbols.find_variable('${glob*}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
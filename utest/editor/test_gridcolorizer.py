@@ -2,6 +2,7 @@ import unittest
 import random
 
 from robot.libraries.String import String
+from robot.utils.asserts import assert_equals
 
 
 from robotide.controller.cellinfo import CellInfo, ContentType, CellType,\
@@ -25,6 +26,42 @@ class Font(object):
     SetWeight = lambda s, x: True
 
 
+class RecordingGrid(MockGrid):
+    NumberRows = 100
+    NumberCols = 3
+
+    def __init__(self):
+        self.colored = []
+
+    def SetCellTextColour(self, row, col, color):
+        self.colored.append((row, col))
+
+    def CalcUnscrolledPosition(self, x, y):
+        return x, y + 400
+
+    def GetGridWindow(self):
+        return self
+
+    def GetClientSize(self):
+        return wx.Size(200, 100)
+
+    def YToRow(self, y):
+        return y // 20
+
+
+class ControllerWithValues(object):
+
+    def __init__(self):
+        self.values = {}
+
+    def get_cell_info(self, row, column):
+        value = self.values.get((row, column))
+        if value is None:
+            return None
+        return CellInfo(CellContent(ContentType.STRING, value, None),
+                        CellPosition(CellType.MANDATORY, None))
+
+
 class ControllerWithCellInfo(object):
     content_types = [getattr(ContentType, i) for i in dir(ContentType) if not i.startswith('__') ]
     cell_types = [getattr(CellType, i) for i in dir(CellType) if not i.startswith('__') ]
@@ -45,6 +82,37 @@ class ControllerWithCellInfo(object):
         return self._string.generate_random_string(50)
 
 
+class TestBatchedColorizing(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = RecordingGrid()
+        self.controller = ControllerWithValues()
+        self.colorizer = Colorizer(self.grid, self.controller,
+                                   ColorizationSettings())
+
+    def test_visible_rows_are_colorized_first(self):
+        rows = self.colorizer._rows_in_coloring_order()
+        assert_equals(rows[::-1][:6], [20, 21, 22, 23, 24, 25])
+        assert_equals(sorted(rows), range(100))
+
+    def test_only_changed_cells_are_colorized_again(self):
+        self._colorize_all()
+        assert_equals(len(self.grid.colored), 300)
+        self.grid.colored = []
+        self._colorize_all()
+        assert_equals(self.grid.colored, [])
+        self.controller.values[(5, 1)] = 'value'
+        assert_equals(self._colorize_all(), set([5]))
+        assert_equals(self.grid.colored, [(5, 1)])
+
+    def _colorize_all(self):
+        changed = set()
+        rows = self.colorizer._rows_in_coloring_order()
+        while rows:
+            changed.update(self.colorizer._colorize_batch(rows, None))
+        return changed
+
+
 class TestPerformance(unittest.TestCase):
     _data = ['Keyword', 'Some longer data in cell', '${variable}', 
              '#asdjaskdkjasdkjaskdjkasjd', 'asdasd,asdasd,as asd jasdj asjd asjdj asd']
@@ -0,0 +1,91 @@
+import unittest
+from robot.parsing.model import TestCaseFile
+from robot.utils.asserts import assert_equals, assert_none, assert_true,\
+    assert_false
+
+from robotide.editor.texteditor import DataFileWrapper, _TableSections
+
+from datafilereader import construct_chief_controller, get_ctrl_by_name,\
+    OCCURRENCES_PATH
+
+# wx needs to imported last so that robotide can select correct wx version.
+import wx
+
+
+DATA = '''\
+Text before tables
+*** Settings ***
+Documentation    Doc
+
+*** Test Cases ***
+Test
+    Log    Hello
+
+| *** Keywords *** |
+Keyword
+    No Operation
+*** Invalid ***
+Ignored
+*** Keywords ***
+Other Keyword
+    No Operation
+'''
+
+
+class TestTableSections(unittest.TestCase):
+
+    def setUp(self):
+        self.sections = _TableSections(DATA, TestCaseFile())
+
+    def test_text_of_tables(self):
+        assert_equals(self.sections.text_of(['testcase_table']),
+                      '*** Test Cases ***\nTest\n    Log    Hello\n\n')
+        assert_equals(self.sections.text_of(['keyword_table']),
+                      '| *** Keywords *** |\nKeyword\n    No Operation\n'
+                      '*** Keywords ***\nOther Keyword\n    No Operation\n')
+        assert_equals(self.sections.text_of(['variable_table']), '')
+
+    def test_changed_tables(self):
+        changed = DATA.replace('Hello', 'World') + '*** Variables ***\n'
+        assert_equals(_TableSections(changed, TestCaseFile()).changed_from(
+                            self.sections), ['testcase_table', 'variable_table'])
+        assert_equals(self.sections.changed_from(self.sections), [])
+        assert_none(self.sections.changed_from(None))
+
+
+class TestDataFileWrapper(unittest.TestCase):
+
+    def setUp(self):
+        chief = construct_chief_controller(OCCURRENCES_PATH)
+        self.ctrl = get_ctrl_by_name('TestSuite1', chief.datafiles)
+        self.wrapper = DataFileWrapper(self.ctrl)
+        self.content = self.wrapper.content
+
+    def test_only_changed_tables_are_parsed_and_replaced(self):
+        settings = self.ctrl.data.setting_table
+        content = self.content + 'New Keyword\n    No Operation\n'
+        changes = self.wrapper.parse_changes(content)
+        assert_equals(changes.tables, ['keyword_table'])
+        assert_equals(len(changes.target.testcase_table.tests), 0)
+        self.wrapper.apply(changes)
+        assert_equals([kw.name for kw in self.ctrl.keywords],
+                      ['My Keyword', 'None Keyword', 'New Keyword'])
+        assert_true(self.ctrl.data.setting_table is settings)
+        assert_true(self.ctrl.data.keyword_table.parent is self.ctrl.data)
+        assert_true(self.ctrl.dirty)
+
+    def test_unchanged_content_changes_nothing(self):
+        changes = self.wrapper.parse_changes(self.content)
+        assert_equals(changes.tables, [])
+        self.wrapper.apply(changes)
+        assert_false(self.ctrl.dirty)
+
+    def test_all_tables_are_parsed_without_shown_content(self):
+        wrapper = DataFileWrapper(self.ctrl)
+        changes = wrapper.parse_changes(self.content)
+        assert_none(changes.tables)
+        assert_equals(len(changes.target.testcase_table.tests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
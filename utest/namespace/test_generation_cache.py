@@ -0,0 +1,38 @@
+import unittest
+from robot.utils.asserts import assert_none, assert_equals
+
+from robotide.namespace.cache import GenerationCache
+
+
+class TestGenerationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = GenerationCache()
+        self.cache.put('a', 'b')
+
+    def test_cache_hit(self):
+        assert_equals('b', self.cache.get('a'))
+        assert_equals('b', self.cache.get('a'))
+        assert_equals(self.cache.hits, 2)
+        assert_equals(self.cache.misses, 0)
+
+    def test_cache_miss(self):
+        assert_none(self.cache.get('x'))
+        assert_equals(self.cache.misses, 1)
+
+    def test_expiring_one_entry(self):
+        self.cache.put('c', 'd')
+        self.cache.expire('a')
+        assert_none(self.cache.get('a'))
+        assert_equals('d', self.cache.get('c'))
+
+    def test_expiring_all_entries(self):
+        self.cache.expire_all()
+        assert_none(self.cache.get('a'))
+        self.cache.put('a', 'c')
+        assert_equals('c', self.cache.get('a'))
+        assert_equals(self.cache.generation, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -50,6 +50,20 @@ class TestKeywords(unittest.TestCase):
         assert_false(self.kws.get('john shouldembed arguments and something'))
         assert_false(self.kws.get('given johnshould embed arguments and something'))
 
+    def test_embedded_args_with_argument_first(self):
+        kws = _Keywords([ItemMock('${x} is ${y}', [], 'first'),
+                         ItemMock('User ${x} is ${y}', [], 'second')])
+        assert_equals(kws.get('foo is bar').longname, 'first')
+        assert_equals(kws.get('user foo is bar').longname, 'first')
+
+    def test_embedded_args_are_looked_up_by_prefix(self):
+        kws = _Keywords([ItemMock('Add ${x} to ${y}', [], 'add'),
+                         ItemMock('Remove ${x}', [], 'remove')])
+        assert_equals(kws.get('add 1 to list').longname, 'add')
+        assert_equals(kws.get('Given REMOVE item').longname, 'remove')
+        assert_equals(kws.get('Addition'), None)
+        assert_equals(len(kws.embedded_keywords), 2)
+
     def test_first_come_prioritized_when_same_short_name(self):
         kws = _Keywords([ItemMock('My kw', ['${arg}'], 'source.My kw'),
                        ItemMock('My kw', [], 'Collision!')])
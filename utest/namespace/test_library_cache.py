@@ -2,6 +2,7 @@ import unittest
 import sys
 import os
 
+from robot.utils.asserts import assert_equals
 from robotide.namespace import cache
 
 from resources import DATAPATH
@@ -23,6 +24,26 @@ class TestLibraryCache(unittest.TestCase):
     def test_importing_library_with_dictionary_arg(self):
         cache.LibraryCache().add_library('ArgLib', [{'moi':'hoi'}, []])
 
+    def test_adding_libraries_in_parallel(self):
+        lib_cache = cache.LibraryCache()
+        lib_cache.add_libraries([('TestLib', None, None),
+                                 ('ArgLib', ['foo'], 'MyLib'),
+                                 ('ArgLib', ['foo'], 'MyLib')])
+        self._assert_keyword_in_keywords(
+            lib_cache.get_library_keywords('TestLib'), 'Testlib Keyword')
+        kws = lib_cache.get_library_keywords('ArgLib', ['foo'], 'MyLib')
+        self._assert_keyword_in_keywords(kws, 'Get Mandatory')
+        assert_equals(kws[0].source, 'MyLib')
+
+    def test_library_key_normalization(self):
+        lib_cache = cache.LibraryCache()
+        assert_equals(lib_cache._key('Operating System', None),
+                      lib_cache._key('OperatingSystem', []))
+        assert_equals(lib_cache._key('ArgLib', ['a', 'WITH NAME', 'Alias']),
+                      ('ArgLib', ('a',), 'Alias'))
+        assert_equals(lib_cache._key('ArgLib', [{'moi': 'hoi'}]),
+                      ('ArgLib', (repr({'moi': 'hoi'}),), None))
+
     def _assert_keyword_in_keywords(self, keywords, name):
         for kw in keywords:
             if kw.name == name:
@@ -30,5 +51,50 @@ class TestLibraryCache(unittest.TestCase):
         raise AssertionError('Keyword %s not found in default keywords' % name)
 
 
+class _Keyword(object):
+    source = 'Lib'
+    doc = ''
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestLRULibraryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.libs = cache._LibraryCache(max_size=10)
+
+    def test_hits_and_misses(self):
+        self.libs['a'] = [_Keyword('kw')]
+        assert_equals(self.libs.get('a')[0].name, 'kw')
+        assert_equals(self.libs.get('b'), None)
+        assert_equals((self.libs.hits, self.libs.misses), (1, 1))
+
+    def test_empty_library_is_cached(self):
+        self.libs['a'] = []
+        assert_equals(self.libs.get('a'), [])
+        assert_equals(self.libs.has_key('a'), True)
+
+    def test_least_recently_used_is_evicted_when_over_budget(self):
+        self.libs['a'] = [_Keyword('1')]
+        self.libs['b'] = [_Keyword('12')]
+        self.libs.get('a')
+        self.libs['c'] = [_Keyword('12')]
+        assert_equals(self.libs.has_key('b'), False)
+        assert_equals(self.libs.has_key('a'), True)
+        assert_equals(self.libs.has_key('c'), True)
+        assert_equals(self.libs.evictions, 1)
+        assert_equals(self.libs.size, 9)
+
+    def test_library_larger_than_budget_is_kept(self):
+        self.libs['a'] = [_Keyword('x' * 20)]
+        assert_equals(len(self.libs), 1)
+
+    def test_replacing_library_updates_size(self):
+        self.libs['a'] = [_Keyword('12345')]
+        self.libs['a'] = [_Keyword('1')]
+        assert_equals(self.libs.size, 4)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,8 @@
 import unittest
 from robot.utils.asserts import assert_equals, assert_false, assert_true
 import datafilereader
+from robotide.controller.commands import ChangeCellValue
+from robotide.namespace.local_namespace import LocalAssignments
 
 
 class TestLocalNamespace(unittest.TestCase):
@@ -20,6 +22,10 @@ class TestLocalNamespace(unittest.TestCase):
     def test_keyword_argument_is_not_visible_in_test_cases_local_namespace(self):
         assert_false(self._test.get_local_namespace().has_name('${argument}'))
 
+    def test_variables_are_matched_normalized(self):
+        assert_true(self._keyword.get_local_namespace().has_name('${ARGU MENT}'))
+        assert_true(self._test.get_local_namespace().has_name('${space}'))
+
     def test_keyword_steps_local_namespace_does_not_contain_local_variables_before_definition(self):
         for i in range(8):
             local_namespace = self._keyword.get_local_namespace_for_row(i)
@@ -41,6 +47,11 @@ class TestLocalNamespace(unittest.TestCase):
             if i >= 7:
                 assert_true(local_namespace.has_name('${i}'))
 
+    def test_local_assignments_are_updated_when_steps_change(self):
+        assert_false(self._keyword.get_local_namespace_for_row(2).has_name('${new}'))
+        self._keyword.execute(ChangeCellValue(1, 0, '${new}='))
+        assert_true(self._keyword.get_local_namespace_for_row(2).has_name('${new}'))
+
     def test_keyword_steps_suggestions_with_local_variables(self):
         self._verify_suggestions_on_row(0, contains=['${argument}'], does_not_contain=['${foo}', '${bar}', '${i}'])
         self._verify_suggestions_on_row(3, contains=['${argument}', '${foo}'], does_not_contain=['${bar}', '${i}'])
@@ -70,6 +81,36 @@ class TestLocalNamespace(unittest.TestCase):
 
 
 
+class _StepMock(object):
+
+    def __init__(self, *assignments):
+        self.assignments = assignments
+
+
+class TestLocalAssignments(unittest.TestCase):
+
+    def setUp(self):
+        self._assignments = LocalAssignments([_StepMock('${foo}='),
+                                              _StepMock(),
+                                              _StepMock('${bar}', '${f_x} ='),
+                                              _StepMock('${foo}')])
+
+    def test_is_assigned_before(self):
+        assert_false(self._assignments.is_assigned_before('${foo}', 0))
+        assert_true(self._assignments.is_assigned_before('${foo}', 1))
+        assert_true(self._assignments.is_assigned_before('${F OO}', 1))
+        assert_false(self._assignments.is_assigned_before('${bar}', 2))
+        assert_true(self._assignments.is_assigned_before('${fx}=', 3))
+        assert_false(self._assignments.is_assigned_before('${other}', 4))
+
+    def test_get_names_assigned_before(self):
+        assert_equals(self._assignments.get_names_assigned_before(3, '${f'),
+                      set(['${foo}', '${f_x}']))
+        assert_equals(self._assignments.get_names_assigned_before(2, '${'),
+                      set(['${foo}']))
+        assert_equals(self._assignments.get_names_assigned_before(4, '${x'),
+                      set())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -271,9 +271,11 @@ class TestKeywordSuggestions(_DataFileTest):
         sugs  = self.ns.get_suggestions_for(self.kw, 'generate random')
         sugs2 = self.ns.get_suggestions_for(self.kw, 'generate random')
         assert_true(sugs[0] is sugs2[0])
+        lib_cache = self.ns._lib_cache
         self.ns.reset_resource_and_library_cache()
+        assert_false(self.ns._lib_cache is lib_cache)
         sugs3 = self.ns.get_suggestions_for(self.kw, 'generate random')
-        assert_false(sugs[0] is sugs3[0])
+        assert_equals(sugs, sugs3)
 
 
 class TestKeywordSearch(_DataFileTest):
@@ -350,6 +352,58 @@ class TestKeywordSearch(_DataFileTest):
         return any([kw_name.lower() == kw.name.lower() for kw in keywords])
 
 
+class TestDependencyTrackedUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.chief = construct_chief_controller(OCCURRENCES_PATH)
+        self.ns = self.chief._namespace
+        self.suite1 = self._datafile('TestSuite1')
+        self.suite2 = self._datafile('TestSuite2')
+        self.resource = self._datafile('Testdata Resource')
+        self.inner = self._datafile('Inner Resource')
+        for datafile in self.suite1, self.suite2, self.resource:
+            self.ns.find_user_keyword(datafile.data, 'My Keyword')
+
+    def _datafile(self, name):
+        return get_ctrl_by_name(name, self.chief.datafiles)
+
+    def test_dependents_of_resource(self):
+        assert_equals(self.ns._retriever.get_dependents_of(self.inner.source),
+                      set(df.source for df in (self.inner, self.resource,
+                                               self.suite1, self.suite2)))
+
+    def test_dependents_of_suite(self):
+        assert_equals(self.ns._retriever.get_dependents_of(self.suite1.source),
+                      set([self.suite1.source]))
+
+    def test_update_expires_only_dependents(self):
+        self.suite1.keywords.new('New Keyword')
+        assert_true(self.ns.is_user_keyword(self.suite1.data, 'New Keyword'))
+        assert_true(self.ns._retriever.keyword_cache.get(self.suite2.source))
+
+    def test_keywords_are_not_recomputed_without_changes(self):
+        cache = self.ns._retriever.keyword_cache
+        misses = cache.misses
+        for _ in range(3):
+            self.ns.find_user_keyword(self.suite1.data, 'My Keyword')
+        assert_equals(cache.misses, misses)
+
+    def test_update_of_resource_expires_importers(self):
+        self.inner.keywords.new('New Inner Keyword')
+        assert_true(self.ns.is_user_keyword(self.suite2.data, 'New Inner Keyword'))
+
+    def test_resource_keyword_infos_are_shared_by_importers(self):
+        kw1, kw2 = [self._inner_keyword_info(suite)
+                    for suite in (self.suite1, self.suite2)]
+        assert_true(kw1 is kw2)
+        self.inner.keywords.new('New Inner Keyword')
+        assert_false(self._inner_keyword_info(self.suite1) is kw1)
+
+    def _inner_keyword_info(self, suite):
+        return [kw for kw in self.ns.get_all_keywords([suite.data])
+                if kw.source == 'inner_resource.txt'][0]
+
+
 class TestVariableStash(unittest.TestCase):
 
     def test_variable_resolving(self):
@@ -375,6 +429,16 @@ class TestVariableStash(unittest.TestCase):
         assert_true('${SPACE}' in [v.name for v in vars])
         assert_true('${PREV_TEST_MESSAGE}' in [v.name for v in vars])
 
+    def test_has_variable(self):
+        vars = _VariableStash()
+        var_table = VariableTable(ParentMock())
+        var_table.add('${My Var}', 'foo')
+        vars.set_from_variable_table(var_table)
+        assert_true(vars.has_variable('${My Var}'))
+        assert_true(vars.has_variable('${my_var}'))
+        assert_true(vars.has_variable('${space}'))
+        assert_false(vars.has_variable('${other}'))
+
     def test_global_variable_trues_value_is_replaced_with_true(self):
         assert_equals(_VariableStash().replace_variables('${True}'), True)
 
@@ -22,7 +22,7 @@ class MessageRecordingLoadObserver(object):
         self.finished = False
         self.notified = False
 
-    def notify(self):
+    def notify(self, message=None):
         if self.finished:
             raise RuntimeError('Notified after finished')
         self.notified = True
@@ -14,6 +14,7 @@
 
 import unittest
 import os
+import time
 
 from robotide.context.settings import Settings, SectionError,\
     ConfigurationError, _merge_settings, initialize_settings
@@ -204,6 +205,70 @@ class TestSettingsFileContent(TestSettingsHelper):
         self.assertEquals(self._read_settings_file_content(), expected)
 
 
+class TestWriteBehind(TestSettingsHelper):
+
+    def setUp(self):
+        TestSettingsHelper.setUp(self, lambda path: Settings(path, 60))
+
+    def test_saves_are_coalesced_until_flush(self):
+        self.settings['foo'] = 'bar'
+        self.settings.set_values({'zip': 1, 'zap': 2})
+        self.settings.add_section('Plugin').set('key', 'value')
+        self.assertFalse(os.path.exists(self.user_settings_path))
+        self.settings.flush()
+        self._check_content({'foo': 'bar', 'zip': 1, 'zap': 2,
+                             'Plugin': {'key': 'value'}})
+        self.assertEquals(self.settings.write_stats, (3, 1))
+        self.settings.flush()
+        self.assertEquals(self.settings.write_stats, (3, 1))
+
+    def test_changes_are_written_after_delay(self):
+        settings = Settings(self.user_settings_path, write_delay=0.05)
+        settings['foo'] = 'bar'
+        settings['foo'] = 'baz'
+        for _ in range(100):
+            if settings.write_stats[1]:
+                break
+            time.sleep(0.01)
+        self.assertEquals(settings.write_stats, (2, 1))
+        self.assertEquals(self._read_settings()['foo'], 'baz')
+
+    def test_immediate_writes_leave_no_temporary_files(self):
+        settings = Settings(self.user_settings_path)
+        settings['foo'] = 'bar'
+        settings['zip'] = 'zap'
+        self.assertEquals(settings.write_stats, (2, 2))
+        directory, name = os.path.split(self.user_settings_path)
+        self.assertEquals([temp for temp in os.listdir(directory)
+                           if temp.startswith('.' + name)], [])
+
+    def test_writes_preserve_file_permissions(self):
+        settings = Settings(self.user_settings_path)
+        settings['foo'] = 'bar'
+        os.chmod(self.user_settings_path, 0640)
+        settings['foo'] = 'baz'
+        self.assertEquals(os.stat(self.user_settings_path).st_mode & 0777, 0640)
+
+    def test_failed_delayed_write_is_retried(self):
+        settings = Settings(self.user_settings_path, write_delay=0.05)
+        write = settings._writer._write
+        failures = []
+        def fail_once():
+            if not failures:
+                failures.append(True)
+                raise IOError('Disk full')
+            write()
+        settings._writer._write = fail_once
+        settings['foo'] = 'bar'
+        for _ in range(100):
+            if settings.write_stats[1]:
+                break
+            time.sleep(0.01)
+        self.assertEquals(failures, [True])
+        self.assertEquals(settings.write_stats, (1, 1))
+        self.assertEquals(self._read_settings()['foo'], 'bar')
+
+
 class TestSections(TestSettingsHelper):
 
     def test_add_section(self):
@@ -3,9 +3,11 @@ import os
 import unittest
 from robot.running import TestLibrary
 from robot.parsing.model import UserKeyword, KeywordTable
-from robot.utils.asserts import assert_true, assert_equals
+from robot.utils.asserts import assert_true, assert_false, assert_equals,\
+    assert_raises
 
-from robotide.spec.iteminfo import LibraryKeywordInfo, TestCaseUserKeywordInfo, VariableInfo, ResourceUserKeywordInfo
+from robotide.spec.iteminfo import LibraryKeywordInfo, TestCaseUserKeywordInfo, VariableInfo, ResourceUserKeywordInfo,\
+    ArgumentSignature
 
 
 testlibpath = os.path.join(os.path.dirname(__file__), '..', 'resources', 'robotdata', 'libs')
@@ -30,7 +32,8 @@ class TestKeywordInfo(unittest.TestCase):
     def test_libkw_arguments_parsing(self):
         libname = 'TestLib'
         lib = TestLibrary(libname)
-        kw_info = LibraryKeywordInfo(lib.handlers['testlib_keyword_with_args'])
+        kw_info = LibraryKeywordInfo.from_handler(
+            lib.handlers['testlib_keyword_with_args'])
         assert_in_details(kw_info, 'Testlib',
                           '[ arg1 | arg2=default value | *args ]')
 
@@ -48,6 +51,68 @@ class TestKeywordInfo(unittest.TestCase):
         self.assertEquals(kw_info.longname, 'resource.UK')
 
 
+class TestArgumentSignature(unittest.TestCase):
+
+    def test_signature(self):
+        signature = ArgumentSignature(['a', 'b=1', 'c=2', '*rest'])
+        assert_equals(signature.arguments, ('a', 'b=1', 'c=2', '*rest'))
+        assert_equals(signature.mandatory, 1)
+        assert_equals(signature.optional, ('b', 'c'))
+        assert_true(signature.varargs)
+        assert_equals(len(signature), 4)
+
+    def test_signature_without_arguments(self):
+        signature = ArgumentSignature([])
+        assert_equals(signature.arguments, ())
+        assert_equals(signature.mandatory, 0)
+        assert_false(signature.varargs)
+
+    def test_signature_is_immutable(self):
+        signature = ArgumentSignature(['a'])
+        assert_raises(AttributeError, setattr, signature, 'mandatory', 0)
+
+    def test_library_keyword_signature_is_parsed_once(self):
+        lib = TestLibrary('TestLib')
+        kw_info = LibraryKeywordInfo.from_handler(
+            lib.handlers['testlib_keyword_with_args'])
+        assert_true(kw_info.signature is kw_info.signature)
+        assert_equals(kw_info.signature.mandatory, 1)
+        assert_equals(kw_info.arguments,
+                      ['arg1', 'arg2=default value', '*args'])
+
+    def test_library_keyword_infos_are_compact_and_interned(self):
+        handler = TestLibrary('TestLib').handlers['testlib_keyword_with_args']
+        kw_info = LibraryKeywordInfo.from_handler(handler)
+        assert_true(LibraryKeywordInfo.from_handler(handler) is kw_info)
+        assert_false(hasattr(kw_info, '__dict__'))
+        assert_raises(AttributeError, setattr, kw_info, 'name', 'Other')
+        assert_equals(kw_info.shortdoc, 'This keyword requires one argument, '
+                      'has one optional argument and varargs.')
+
+    def test_library_keyword_info_strings_are_shared(self):
+        first = LibraryKeywordInfo(u'Keyword', ''.join(['Lib', 'rary']),
+                                   [u'arg'], 'Doc.', 'test library')
+        second = LibraryKeywordInfo('Keyword', u'Library', ['arg'],
+                                    'Other doc.', 'test library')
+        assert_true(first.name is second.name)
+        assert_true(first.source is second.source)
+        assert_true(first.signature.arguments[0] is
+                    second.signature.arguments[0])
+        assert_equals(LibraryKeywordInfo(u'K\xe4', 'Lib', [], '', 'test library').name,
+                      u'K\xe4')
+
+    def test_user_keyword_signature_follows_argument_changes(self):
+        uk = UserKeyword(_FakeTestCaseFile(), 'My User keyword')
+        uk.args.value = ['${arg1}', '${arg2}=def']
+        kw_info = TestCaseUserKeywordInfo(uk)
+        signature = kw_info.signature
+        assert_true(kw_info.signature is signature)
+        assert_equals(signature.optional, ('arg2',))
+        uk.args.value = ['${arg1}', '${arg2}', '@{varargs}']
+        assert_equals(kw_info.signature.mandatory, 2)
+        assert_true(kw_info.signature.varargs)
+
+
 class TestVariableInfo(unittest.TestCase):
 
     def test_variable_item_info(self):
@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+from robot.utils.asserts import assert_equals, assert_none, assert_true
+
+from robotide.spec import LibrarySpec
+from robotide.spec.librarydatabase import LibraryDatabase
+from robotide.namespace.cache import LibraryCache
+
+from resources import DATAPATH
+sys.path.append(os.path.join(DATAPATH, 'libs'))
+
+
+class _FakeKeyword(object):
+    doc = 'Some doc'
+    arguments = ['arg', 'default=value', '*varargs']
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+
+
+class _FakeSpec(object):
+    doc = 'Library doc'
+
+    def __init__(self, source, *names):
+        self.source = source
+        self.keywords = [_FakeKeyword(name, 'FakeLib') for name in names]
+
+
+class TestLibraryDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._source = os.path.join(self._dir, 'FakeLib.py')
+        open(self._source, 'w').close()
+        self._db = LibraryDatabase(os.path.join(self._dir, 'specs'),
+                                   max_entries=2)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_fetching_not_stored_library(self):
+        assert_none(self._db.fetch('FakeLib'))
+
+    def test_storing_and_fetching(self):
+        self._db.store('FakeLib', ['arg'], _FakeSpec(self._source, 'Kw 1', 'Kw 2'))
+        kws = self._db.fetch('FakeLib', ['arg'])
+        assert_equals([kw.name for kw in kws], ['Kw 1', 'Kw 2'])
+        assert_equals(kws[0].source, 'FakeLib')
+        assert_equals(kws[0].doc, 'Some doc')
+        assert_equals(kws[0].arguments, ['arg', 'default=value', '*varargs'])
+        assert_true(kws[0].is_library_keyword())
+
+    def test_arguments_are_part_of_key(self):
+        self._db.store('FakeLib', ['arg'], _FakeSpec(self._source, 'Kw'))
+        assert_none(self._db.fetch('FakeLib'))
+        assert_none(self._db.fetch('FakeLib', ['other']))
+
+    def test_pythonpath_is_part_of_key(self):
+        self._db.store('FakeLib', None, _FakeSpec(self._source, 'Kw'))
+        sys.path.insert(0, self._dir)
+        try:
+            assert_none(self._db.fetch('FakeLib'))
+        finally:
+            sys.path.remove(self._dir)
+        assert_equals([kw.name for kw in self._db.fetch('FakeLib')], ['Kw'])
+
+    def test_spec_without_source_is_not_stored(self):
+        self._db.store('FakeLib', None, _FakeSpec(None, 'Kw'))
+        assert_none(self._db.fetch('FakeLib'))
+
+    def test_modifying_library_source_invalidates_entry(self):
+        self._db.store('FakeLib', None, _FakeSpec(self._source, 'Kw'))
+        mtime = os.path.getmtime(self._source) + 10
+        os.utime(self._source, (mtime, mtime))
+        assert_none(self._db.fetch('FakeLib'))
+
+    def test_invalidate(self):
+        self._db.store('FakeLib', None, _FakeSpec(self._source, 'Kw'))
+        self._db.invalidate('FakeLib')
+        assert_none(self._db.fetch('FakeLib'))
+
+    def test_least_recently_used_entries_are_removed(self):
+        self._db.store('Lib1', None, _FakeSpec(self._source, 'Kw'))
+        self._db.store('Lib2', None, _FakeSpec(self._source, 'Kw'))
+        self._set_entry_age('Lib1', 10)
+        self._set_entry_age('Lib2', 20)
+        self._db.fetch('Lib2')
+        self._db.store('Lib3', None, _FakeSpec(self._source, 'Kw'))
+        assert_none(self._db.fetch('Lib1'))
+        assert_true(self._db.fetch('Lib2'))
+        assert_true(self._db.fetch('Lib3'))
+
+    def _set_entry_age(self, name, age):
+        mtime = time.time() - age
+        os.utime(self._db._path(name, None), (mtime, mtime))
+
+    def test_real_library_spec(self):
+        spec = LibrarySpec('TestLib')
+        self._db.store('TestLib', None, spec)
+        kws = self._db.fetch('TestLib')
+        assert_equals(sorted(kw.name for kw in kws),
+                      sorted(kw.name for kw in spec.keywords))
+
+    def test_library_cache_uses_database(self):
+        LibraryCache(self._db).get_library_keywords('TestLib')
+        assert_true(self._db.fetch('TestLib'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+from threading import Thread
+
+from robot.errors import DataError
+from robot.utils.asserts import assert_equals, assert_raises
+
+from robotide.spec import libraryfetcher
+from robotide.spec.libraryfetcher import LibraryFetcher
+
+from resources import DATAPATH
+sys.path.append(os.path.join(DATAPATH, 'libs'))
+
+
+class TestLibraryFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self._fetcher = LibraryFetcher(workers=2, timeout=5)
+
+    def tearDown(self):
+        self._fetcher.close()
+
+    def test_fetching_library(self):
+        spec = self._fetcher.fetch('TestLib')
+        assert_equals(spec.get('name'), 'TestLib')
+        assert_equals(spec.get('source'),
+                      os.path.join(DATAPATH, 'libs', 'TestLib.py'))
+        kw = spec.findall('kw')[1]
+        assert_equals(kw.get('name'), 'Testlib Keyword With Args')
+        assert_equals([arg.text for arg in kw.findall('arguments/arg')],
+                      ['arg1', 'arg2=default value', '*args'])
+
+    def test_library_is_not_imported_into_calling_process(self):
+        sys.modules.pop('AnotherArgLib', None)
+        self._fetcher.fetch('AnotherArgLib', ['arg'])
+        assert_equals('AnotherArgLib' in sys.modules, False)
+
+    def test_library_with_arguments_not_serializable_is_imported_in_process(self):
+        spec = self._fetcher.fetch('ArgLib', [set(['value'])])
+        assert_equals(len(spec.findall('kw')), 2)
+
+    def test_library_is_imported_in_process_when_workers_are_not_supported(self):
+        sys.modules.pop('AnotherArgLib', None)
+        libraryfetcher._WORKERS_SUPPORTED = False
+        try:
+            spec = self._fetcher.fetch('AnotherArgLib', ['arg'])
+        finally:
+            libraryfetcher._WORKERS_SUPPORTED = True
+        assert_equals(spec.get('name'), 'AnotherArgLib')
+        assert_equals('AnotherArgLib' in sys.modules, True)
+
+    def test_failing_import(self):
+        assert_raises(DataError, self._fetcher.fetch, 'NonExistingLib')
+
+    def test_import_timeout(self):
+        fetcher = LibraryFetcher(workers=1, timeout=0.5)
+        try:
+            assert_raises(DataError, fetcher.fetch, 'SlowLib')
+            assert_equals(fetcher.fetch('TestLib').get('name'), 'TestLib')
+        finally:
+            fetcher.close()
+
+    def test_fetching_in_parallel(self):
+        results = []
+        threads = [Thread(target=lambda: results.append(
+                            self._fetcher.fetch('ArgLib', ['arg'])))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_equals([len(spec.findall('kw')) for spec in results], [2] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,5 +16,24 @@ class ArgumentParsingTestCase(unittest.TestCase):
     def test_noupdatecheck_and_path(self):
         self.assertEqual((True, 'path'), robotide._parse_args(['--noupdatecheck', 'path']))
 
+
+class StartupOptionParsingTestCase(unittest.TestCase):
+
+    def test_no_startup_options(self):
+        self.assertEqual((['--noupdatecheck', 'path'], None, False),
+                         robotide._parse_startup_options(['--noupdatecheck', 'path']))
+
+    def test_profile_startup(self):
+        self.assertEqual((['path'], '-', False),
+                         robotide._parse_startup_options(['--profilestartup', 'path']))
+
+    def test_profile_startup_to_file(self):
+        self.assertEqual(([], 'out.txt', False),
+                         robotide._parse_startup_options(['--profilestartup=out.txt']))
+
+    def test_lazy_init(self):
+        self.assertEqual((['path'], None, True),
+                         robotide._parse_startup_options(['--lazyinit', 'path']))
+
 if __name__ == '__main__':
     unittest.main()
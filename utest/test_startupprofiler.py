@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+from robot.utils.asserts import assert_equals, assert_raises
+
+from robotide.startupprofiler import StartupProfiler
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        self.time += 0.5
+        return self.time
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = StartupProfiler(clock=_Clock())
+
+    def test_phases_are_measured(self):
+        with self.profiler.phase('Plugins'):
+            pass
+        with self.profiler.phase('Data'):
+            pass
+        assert_equals(self.profiler.phases, [('Plugins', 0.5), ('Data', 0.5)])
+
+    def test_failing_phase_is_measured(self):
+        def fail():
+            with self.profiler.phase('Failing'):
+                raise RuntimeError()
+        assert_raises(RuntimeError, fail)
+        assert_equals(self.profiler.phases, [('Failing', 0.5)])
+
+    def test_report(self):
+        with self.profiler.phase('Main frame'):
+            pass
+        assert_equals(self.profiler.report(),
+                      'RIDE startup phases:\n'
+                      '  Main frame    0.500 s\n'
+                      '  Total         1.500 s\n')
+
+    def test_report_is_written_to_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'startup.txt')
+            profiler = StartupProfiler(path)
+            with profiler.phase('Plugins'):
+                pass
+            profiler.finish()
+            assert_equals(open(path).read().splitlines()[1].split()[0],
+                          'Plugins')
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
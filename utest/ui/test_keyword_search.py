@@ -16,7 +16,8 @@ import unittest
 from robot.utils.asserts import assert_equals, assert_true
 
 from robotide.ui.keywordsearch import _KeywordData, _SearchCriteria,\
-    ALL_KEYWORDS, ALL_USER_KEYWORDS, ALL_LIBRARY_KEYWORDS, _SortOrder
+    ALL_KEYWORDS, ALL_USER_KEYWORDS, ALL_LIBRARY_KEYWORDS, _SortOrder,\
+    _KeywordIndex
 from robotide.spec.iteminfo import ItemInfo
 
 test_kws = [ItemInfo(name, source, desc) for name, source, desc in
@@ -88,6 +89,54 @@ class TestSearchCriteria(unittest.TestCase):
         assert_equals(criteria.matches(keyword), expected)
 
 
+class TestKeywordIndex(unittest.TestCase):
+    keywords = [Keyword('start Da ta end', 'source.txt', 'some dO c here'),
+                Keyword('Get Data', 'library', 'Returns data'),
+                Keyword('Log', 'library', 'Logs the given message'),
+                Keyword('No Operation', 'BuiltIn', ''),
+                Keyword('User Keyword', 'resource.txt', 'Quuz')]
+
+    def setUp(self):
+        self.index = _KeywordIndex()
+        self.index.update(self.keywords)
+
+    def test_search_finds_same_keywords_as_criteria(self):
+        for pattern in ['', 'a', 'da', 'data', 'DA TA', 'log', 'quuz',
+                        'no match', 'taend']:
+            for search_docs in True, False:
+                for source_filter in [ALL_KEYWORDS, ALL_USER_KEYWORDS,
+                                      ALL_LIBRARY_KEYWORDS, 'library',
+                                      'unknown']:
+                    self._verify_search(pattern, search_docs, source_filter)
+
+    def _verify_search(self, pattern, search_docs, source_filter):
+        criteria = _SearchCriteria(pattern, search_docs, source_filter)
+        expected = [kw for kw in self.keywords if criteria.matches(kw)]
+        assert_equals(sorted(self.index.search(criteria)), sorted(expected))
+
+    def test_sources(self):
+        assert_equals(self.index.sources,
+                      ['BuiltIn', 'library', 'resource.txt', 'source.txt'])
+
+    def test_update_adds_changed_and_removes_missing_keywords(self):
+        changed = Keyword('User Keyword', 'resource.txt', 'New doc')
+        added = Keyword('Other', 'other.txt', '')
+        self.index.update(self.keywords[1:-1] + [changed, added])
+        search = lambda pattern: self.index.search(_SearchCriteria(pattern))
+        assert_equals(search('quuz'), [])
+        assert_equals(search('new doc'), [changed])
+        assert_equals(search('other'), [added])
+        assert_equals(search('start'), [])
+        assert_equals(len(self.index), 5)
+        assert_equals(self.index.sources,
+                      ['BuiltIn', 'library', 'other.txt', 'resource.txt'])
+
+    def test_update_replaces_unchanged_keyword_objects(self):
+        same = Keyword('Log', 'library', 'Logs the given message')
+        self.index.update(self.keywords[:2] + [same] + self.keywords[3:])
+        assert_true(self.index.search(_SearchCriteria('log'))[0] is same)
+
+
 class TestKeyWordData(unittest.TestCase):
 
     def test_sort_by_search(self):
@@ -0,0 +1,64 @@
+import unittest
+from robot.utils.asserts import assert_equals, assert_false, assert_true
+
+from robotide.usages.commands import FindUsages
+from robotide.usages.references import ReferenceCounter
+
+import datafilereader
+
+
+class TestReferenceCounter(unittest.TestCase):
+
+    def _count(self, path):
+        chief = datafilereader.construct_chief_controller(path)
+        keywords = [kw for df in chief.datafiles for kw in df.keywords]
+        return chief, keywords, ReferenceCounter(chief).count(keywords)
+
+    def _usages(self, chief, keyword):
+        return list(chief.execute(FindUsages(keyword.name,
+                                             keyword_info=keyword.info)))
+
+    def _assert_counts_equal_usages(self, path):
+        chief, keywords, table = self._count(path)
+        assert_true(table.complete)
+        for kw in keywords:
+            assert_equals(table.count_of(kw),
+                          sum(usage.count for usage in self._usages(chief, kw)),
+                          kw.name)
+
+    def test_counts_equal_find_usages(self):
+        self._assert_counts_equal_usages(datafilereader.UNUSED_KEYWORDS_PATH)
+        self._assert_counts_equal_usages(datafilereader.OCCURRENCES_PATH)
+
+    def test_unused_keywords(self):
+        chief, keywords, table = self._count(datafilereader.UNUSED_KEYWORDS_PATH)
+        assert_equals(table.unused_keywords(),
+                      [kw for kw in keywords if not self._usages(chief, kw)])
+        assert_true(table.unused_keywords())
+
+    def test_most_used_keywords(self):
+        _, keywords, table = self._count(datafilereader.OCCURRENCES_PATH)
+        counts = [count for _, count in table.most_used_keywords()]
+        assert_equals(counts, sorted(counts, reverse=True))
+        assert_equals(len(counts), len(keywords))
+        assert_equals(len(table.most_used_keywords(2)), 2)
+
+    def test_dead_datafiles(self):
+        _, keywords, table = self._count(datafilereader.UNUSED_KEYWORDS_PATH)
+        for df in table.dead_datafiles():
+            assert_false(any(table.count_of(kw) for kw in df.keywords))
+
+    def test_progress_and_stopping(self):
+        chief = datafilereader.construct_chief_controller(
+                    datafilereader.OCCURRENCES_PATH)
+        keywords = [kw for df in chief.datafiles for kw in df.keywords]
+        statuses = []
+        table = ReferenceCounter(chief).count(keywords, statuses.append,
+                                              lambda: len(statuses) == 2)
+        assert_false(table.complete)
+        assert_equals(len(statuses), 2)
+        assert_true(statuses[0].startswith('counting references in '))
+
+
+if __name__ == '__main__':
+    unittest.main()
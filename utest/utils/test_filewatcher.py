@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from robot.utils.asserts import assert_equals, assert_false, assert_true
+
+from robotide.utils.filewatcher import FileWatcher, _PollingBackend,\
+    _create_backend
+
+
+class _FileWatcherTests(object):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'suite.txt')
+        self._write('*** Test Cases ***\n')
+        self.changes = []
+        self.watcher = FileWatcher()
+        self.watcher.watch(self.path)
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+    def _start(self):
+        self.watcher.start(self.changes.append, self._create_backend())
+
+    def _wait_for_change(self):
+        for _ in range(200):
+            if self.changes:
+                return
+            time.sleep(0.01)
+
+    def test_modification_is_noticed(self):
+        self._start()
+        self._write('*** Test Cases ***\nTest\n')
+        self._wait_for_change()
+        assert_equals(self.changes, [os.path.normcase(self.path)])
+        assert_true(self.watcher.is_changed(self.path))
+
+    def test_removal_is_noticed(self):
+        self._start()
+        os.remove(self.path)
+        self._wait_for_change()
+        assert_true(self.watcher.is_changed(self.path))
+
+    def test_watching_again_clears_change(self):
+        self._start()
+        self._write('changed')
+        self._wait_for_change()
+        self.watcher.watch(self.path)
+        assert_false(self.watcher.is_changed(self.path))
+
+    def test_unwatched_files_are_not_reported(self):
+        self._start()
+        self.watcher.unwatch(self.path)
+        os.remove(self.path)
+        time.sleep(0.2)
+        assert_equals(self.changes, [])
+        assert_false(self.watcher.is_watched(self.path))
+
+    def test_cleared_files_are_not_reported(self):
+        self._start()
+        self.watcher.clear()
+        os.remove(self.path)
+        time.sleep(0.2)
+        assert_equals(self.changes, [])
+        assert_false(self.watcher.is_changed(self.path))
+
+    def test_other_files_are_not_reported(self):
+        self._start()
+        with open(os.path.join(self.tmpdir, 'other.txt'), 'w') as f:
+            f.write('other')
+        time.sleep(0.2)
+        assert_equals(self.changes, [])
+
+
+class TestPollingFileWatcher(_FileWatcherTests, unittest.TestCase):
+
+    def _create_backend(self):
+        return _PollingBackend(0.01)
+
+    def test_changes_are_not_noticed_before_start(self):
+        self._write('changed')
+        assert_false(self.watcher.is_changed(self.path))
+
+
+if sys.platform.startswith('linux'):
+
+    class TestInotifyFileWatcher(_FileWatcherTests, unittest.TestCase):
+
+        def _create_backend(self):
+            return _create_backend(60)
+
+
+if __name__ == '__main__':
+    unittest.main()
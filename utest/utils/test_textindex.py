@@ -0,0 +1,57 @@
+import unittest
+from robot.utils import normalize
+from robot.utils.asserts import assert_equals, assert_false, assert_true
+
+from robotide.utils.textindex import TextIndex
+
+
+class TestTextIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TextIndex()
+        for key, text in enumerate(['Run Keyword', 'Run Keyword If',
+                                    'Should Be Equal', 'Log', '']):
+            self.index.add(key, text)
+
+    def test_find_substring(self):
+        assert_equals(self.index.find('keyword'), set([0, 1]))
+        assert_equals(self.index.find('WORD IF'), set([1]))
+        assert_equals(self.index.find('be eq'), set([2]))
+        assert_equals(self.index.find('no match'), set())
+
+    def test_find_short_pattern(self):
+        assert_equals(self.index.find('lo'), set([3]))
+        assert_equals(self.index.find('l'), set([2, 3]))
+        assert_equals(self.index.find(''), set([0, 1, 2, 3, 4]))
+
+    def test_find_prefix(self):
+        assert_equals(self.index.find_prefix('run key'), set([0, 1]))
+        assert_equals(self.index.find_prefix('keyword'), set())
+        assert_equals(self.index.find_prefix('lo'), set([3]))
+
+    def test_replace_text(self):
+        self.index.add(0, 'Run Something')
+        assert_equals(self.index.find('keyword'), set([1]))
+        assert_equals(self.index.find('something'), set([0]))
+        assert_equals(len(self.index), 5)
+
+    def test_remove(self):
+        self.index.remove(1)
+        self.index.remove('not in index')
+        assert_equals(self.index.find('keyword'), set([0]))
+        assert_false(1 in self.index)
+        assert_true(0 in self.index)
+        for key in self.index.keys():
+            self.index.remove(key)
+        assert_equals(self.index._grams, {})
+
+    def test_custom_normalization(self):
+        index = TextIndex(normalize)
+        index.add('kw', 'Start Da ta End')
+        assert_equals(index.find('data'), set(['kw']))
+        assert_equals(index.find('taen'), set(['kw']))
+        assert_equals(index.find('start da ta'), set(['kw']))
+
+
+if __name__ == '__main__':
+    unittest.main()